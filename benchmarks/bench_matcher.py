@@ -0,0 +1,72 @@
+"""Benchmark: per-keyword substring scans vs the compiled PhraseMatcher.
+
+Grows the issue/urgent rule lists from today's ~60 phrases to a few thousand
+(padding with synthetic two-word phrases) and times tagging the sample
+reviews both ways.
+
+    python benchmarks/bench_matcher.py
+"""
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+import pandas as pd  # noqa: E402
+
+from analyzer import ReviewAnalyzer  # noqa: E402
+from matcher import PhraseMatcher  # noqa: E402
+
+SAMPLE_CSV = os.path.join(ROOT, "data", "sample", "sample_reviews.csv")
+VOCAB = ["battery", "screen", "strap", "lid", "seal", "zipper", "charger",
+         "cracked", "leaking", "peeling", "loose", "missing", "noisy", "sticky",
+         "blurry", "slow", "scratched", "bent", "dead", "warped"]
+
+
+def rule_groups(n_phrases, seed=0):
+    """Today's rules padded with synthetic phrases up to ``n_phrases``."""
+    analyzer = ReviewAnalyzer()
+    groups = {k: list(v) for k, (v, _) in analyzer.ISSUE_RULES.items()}
+    groups["urgent"] = list(analyzer.URGENT_KEYWORDS)
+    rng = random.Random(seed)
+    labels = list(groups)
+    total = sum(len(v) for v in groups.values())
+    while total < n_phrases:
+        phrase = f"{rng.choice(VOCAB)} {rng.choice(VOCAB)} {rng.randint(0, 999)}"
+        groups[rng.choice(labels)].append(phrase)
+        total += 1
+    return groups
+
+
+def naive(groups, texts):
+    out = []
+    for text in texts:
+        text_lower = text.lower()
+        out.append([g for g, kws in groups.items()
+                    if any(kw in text_lower for kw in kws)])
+    return out
+
+
+def main(repeat=20):
+    texts = pd.read_csv(SAMPLE_CSV)["review_text"].astype(str).tolist() * repeat
+    print(f"{len(texts):,} reviews")
+    print(f"{'phrases':>8} {'naive ms':>10} {'matcher ms':>11} {'speedup':>8}")
+    for n in (60, 200, 500, 1000, 2000):
+        groups = rule_groups(n)
+        t0 = time.perf_counter()
+        expected = naive(groups, texts)
+        t_naive = time.perf_counter() - t0
+
+        matcher = PhraseMatcher(groups)
+        t0 = time.perf_counter()
+        got = [matcher.decode(m) for m in matcher.scan_many(texts)]
+        t_matcher = time.perf_counter() - t0
+        assert got == expected, "matcher disagrees with substring semantics"
+        print(f"{n:>8} {t_naive * 1e3:>10.1f} {t_matcher * 1e3:>11.1f} "
+              f"{t_naive / t_matcher:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Benchmark: per-row VADER `polarity_scores` vs the batch scorer.
+
+Scores the sample reviews and a synthetic corpus both ways, checks the
+compound scores are identical and reports the speedup.
+
+    python benchmarks/bench_vader.py
+    python benchmarks/bench_vader.py --rows 200000
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer  # noqa: E402
+
+from synthetic import synthetic_reviews  # noqa: E402
+from vader_batch import BatchVader  # noqa: E402
+
+SAMPLE_CSV = os.path.join(ROOT, "data", "sample", "sample_reviews.csv")
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--rows", type=int, default=50_000)
+    args = p.parse_args(argv)
+
+    reference = SentimentIntensityAnalyzer()
+    batch = BatchVader(reference)
+    corpora = {
+        "sample x100": pd.read_csv(SAMPLE_CSV)["review_text"].astype(str).tolist() * 100,
+        "synthetic": synthetic_reviews(args.rows)["review_text"].tolist(),
+    }
+    print(f"{'corpus':<14}{'rows':>9}{'per-row s':>11}{'batch s':>9}{'speedup':>9}")
+    for name, texts in corpora.items():
+        t0 = time.perf_counter()
+        expected = [reference.polarity_scores(t)["compound"] for t in texts]
+        t_rows = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        got = batch.score_batch(texts)
+        t_batch = time.perf_counter() - t0
+        assert np.array_equal(got, expected), "batch scores differ from VADER"
+        print(f"{name:<14}{len(texts):>9,}{t_rows:>11.2f}{t_batch:>9.2f}"
+              f"{t_rows / t_batch:>8.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,223 @@
+"""Benchmark suite: time each analysis stage on synthetic data at growing sizes.
+
+For every size it generates a seeded synthetic export (see src/synthetic.py)
+and records wall time, rows/s and peak traced memory for each stage:
+
+    read_csv_robust        parse the CSV bytes of an upload
+    analyze_text           sentiment + issues + priority, cold score cache
+    analyze_text (cached)  the same frame again with a warm score cache
+    get_word_frequency
+    get_priority_reviews
+
+Usage::
+
+    python benchmarks/run.py                          # 1k, 10k, 100k rows
+    python benchmarks/run.py --sizes 1000000          # the 1M-row run
+    python benchmarks/run.py --save-baseline          # record baseline.json
+    python benchmarks/run.py --check --threshold 0.3  # fail on >30% slowdown
+
+Each stage is run once to warm up, then timed ``--repeat`` times and the
+best time kept. Every timed call is followed by a timed call of a fixed
+reference workload (plain-Python word counting and a NumPy sort, none of it
+this repo's code, ~0.25s), and the stage's time relative to the reference is
+the median of those pairs: a slower machine, interpreter or a noisy moment
+moves both sides of a pair alike.
+
+``--check`` compares those relative times against benchmarks/baseline.json
+and exits 1 if any gated stage is slower than the baseline by more than the
+threshold. Only stages of at least ``--min-rows`` rows whose baseline takes
+at least ``--min-seconds`` are gated; shorter ones are reported only.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from collections import Counter
+
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "src"))
+
+from analyzer import ReviewAnalyzer  # noqa: E402
+from ingest import read_csv_robust  # noqa: E402
+from synthetic import synthetic_reviews  # noqa: E402
+
+BASELINE = os.path.join(HERE, "baseline.json")
+TEXT_COL = "review_text"
+
+
+class _Upload:
+    """Stand-in for Streamlit's UploadedFile."""
+
+    def __init__(self, raw):
+        self._raw = raw
+
+    def getvalue(self):
+        return self._raw
+
+
+def stages(df):
+    """(name, callable) pairs; each callable runs one stage on ``df``."""
+    raw = df.to_csv(index=False).encode()
+    cold = ReviewAnalyzer(cache_size=0)
+    warm = ReviewAnalyzer(cache_size=len(df) + 1)
+    results = cold.analyze_text(df, TEXT_COL)
+    warm.analyze_text(df, TEXT_COL)
+    return [
+        ("read_csv_robust", lambda: read_csv_robust(_Upload(raw))),
+        ("analyze_text", lambda: cold.analyze_text(df, TEXT_COL)),
+        ("analyze_text (cached)", lambda: warm.analyze_text(df, TEXT_COL)),
+        ("get_word_frequency", lambda: cold.get_word_frequency(df, TEXT_COL)),
+        ("get_priority_reviews",
+         lambda: cold.get_priority_reviews(df, results, TEXT_COL, top_n=25)),
+    ]
+
+
+def reference_workload(seed=42):
+    """Fixed machine-speed yardstick, independent of the code under test."""
+    texts = synthetic_reviews(80_000, seed=seed)[TEXT_COL].tolist()
+    values = np.random.default_rng(seed).random(4_000_000)
+
+    def work():
+        counts = Counter()
+        for text in texts:
+            counts.update(text.lower().split())
+        np.sort(values)
+
+    return work
+
+
+def _timed(fn):
+    gc.collect()
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def measure(fn, memory, repeat=3, reference=None):
+    """Time ``fn`` -> (best seconds, time relative to ``reference``, peak MiB).
+
+    After a warm-up call ``fn`` is timed ``repeat`` times, each call followed
+    by a timed ``reference`` call; the relative time is the median ratio of
+    those pairs (None without a reference). The peak traced memory of one
+    more call is measured if asked (else None).
+    """
+    fn()
+    times, ratios = [], []
+    for _ in range(max(repeat, 1)):
+        times.append(_timed(fn))
+        if reference is not None:
+            ratios.append(times[-1] / _timed(reference))
+    seconds = min(times)
+    relative = float(np.median(ratios)) if ratios else None
+    peak = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        fn()
+        peak = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+    return seconds, relative, peak
+
+
+def run(sizes, memory=True, seed=42, repeat=3, out=sys.stdout):
+    reference = reference_workload(seed)
+    ref_seconds, _, _ = measure(reference, False, repeat)
+    print(f"reference workload {ref_seconds:.3f}s", file=out)
+    report = {}
+    print(f"{'stage':<24}{'rows':>10}{'seconds':>10}{'rows/s':>12}"
+          f"{'x ref':>8}{'peak MiB':>10}", file=out)
+    for n in sizes:
+        df = synthetic_reviews(n, seed=seed)
+        for name, fn in stages(df):
+            seconds, relative, peak = measure(fn, memory, repeat, reference)
+            rate = n / seconds if seconds else float("inf")
+            report[f"{name}@{n}"] = {"stage": name, "rows": n,
+                                     "seconds": round(seconds, 4),
+                                     "rows_per_s": round(rate, 1),
+                                     "relative": round(relative, 4),
+                                     "peak_mib": None if peak is None else round(peak, 2)}
+            peak_txt = "-" if peak is None else f"{peak:.1f}"
+            print(f"{name:<24}{n:>10,}{seconds:>10.3f}{rate:>12,.0f}"
+                  f"{relative:>8.3f}{peak_txt:>10}", file=out)
+    return report
+
+
+def check(report, baseline, threshold, min_rows=10_000, min_seconds=0.05):
+    """Gated stages whose time relative to the reference workload is slower
+    than baseline by more than ``threshold`` (a fraction of rows/s).
+
+    Stages under ``min_rows`` rows, or whose baseline run took under
+    ``min_seconds``, are too short to time reliably and are skipped.
+    """
+    slow = []
+    for key, cur in report.items():
+        base = baseline.get(key)
+        if (not base or "relative" not in base or cur["rows"] < min_rows
+                or base["seconds"] < min_seconds):
+            continue
+        if cur["relative"] * (1 - threshold) > base["relative"]:
+            slow.append((key, base["relative"], cur["relative"]))
+    return slow
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--repeat", type=int, default=3,
+                   help="timed runs per stage after a warm-up; best is kept")
+    p.add_argument("--no-memory", action="store_true",
+                   help="skip the (slower) peak-memory pass")
+    p.add_argument("--json", help="also write the report to this file")
+    p.add_argument("--save-baseline", action="store_true",
+                   help=f"merge this run into {os.path.relpath(BASELINE)}")
+    p.add_argument("--check", action="store_true",
+                   help="exit 1 if a stage regressed against the baseline")
+    p.add_argument("--threshold", type=float, default=0.25,
+                   help="allowed slowdown for --check (default: 0.25 = 25%%)")
+    p.add_argument("--min-rows", type=int, default=10_000,
+                   help="only gate sizes of at least this many rows")
+    p.add_argument("--min-seconds", type=float, default=0.05,
+                   help="only gate stages whose baseline takes this long")
+    args = p.parse_args(argv)
+
+    report = run(args.sizes, memory=not args.no_memory, seed=args.seed,
+                 repeat=args.repeat)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        try:
+            with open(BASELINE) as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            stored = {"results": {}}
+        stored["machine"] = f"{platform.machine()} · Python {platform.python_version()}"
+        stored["results"].update(report)
+        with open(BASELINE, "w") as f:
+            json.dump(stored, f, indent=2, sort_keys=True)
+        print(f"baseline saved to {BASELINE}")
+
+    if args.check:
+        with open(BASELINE) as f:
+            baseline = json.load(f)["results"]
+        slow = check(report, baseline, args.threshold, args.min_rows,
+                     args.min_seconds)
+        for key, base, cur in slow:
+            print(f"REGRESSION {key}: {cur:.3f}x reference vs baseline "
+                  f"{base:.3f}x")
+        if slow:
+            return 1
+        print(f"no stage slower than baseline by more than {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""Startup benchmark: how long a fresh process takes to become useful.
+
+Each measurement runs in a new interpreter, so nothing is warm:
+
+    import analyzer        import the analysis engine
+    first score            ReviewAnalyzer() + the first sentiment score
+                           (backend selection and lexicon loading)
+    Welcome first render   one headless run of src/app.py on the sample data,
+                           as the first visitor of a new instance sees it
+
+Usage::
+
+    python benchmarks/startup.py               # median of 5 runs
+    python benchmarks/startup.py --repeat 9 --json startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SRC = os.path.join(HERE, "..", "src")
+APP = os.path.join(SRC, "app.py")
+
+# name -> (setup, timed statement); each prints its elapsed seconds.
+PROBES = {
+    "import analyzer": ("", "import analyzer"),
+    "first score": ("import analyzer",
+                    "analyzer.ReviewAnalyzer().analyze_sentiment('Works great!')"),
+    "Welcome first render": (
+        "from streamlit.testing.v1 import AppTest",
+        f"AppTest.from_file({APP!r}, default_timeout=120).run()"),
+}
+
+TEMPLATE = """
+import time
+{setup}
+start = time.perf_counter()
+{stmt}
+print(time.perf_counter() - start)
+"""
+
+
+def probe(setup, stmt):
+    """Seconds ``stmt`` takes in a fresh interpreter (with a fresh store)."""
+    with tempfile.TemporaryDirectory() as store:
+        env = dict(os.environ, PYTHONPATH=SRC, SMARTREVIEW_STORE=store)
+        out = subprocess.run(
+            [sys.executable, "-c", TEMPLATE.format(setup=setup, stmt=stmt)],
+            env=env, capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def run(repeat=5, out=sys.stdout):
+    report = {}
+    print(f"{'stage':<24}{'median s':>10}{'min s':>10}", file=out)
+    for name, (setup, stmt) in PROBES.items():
+        times = [probe(setup, stmt) for _ in range(repeat)]
+        report[name] = {"median_s": round(statistics.median(times), 4),
+                        "min_s": round(min(times), 4), "runs": repeat}
+        print(f"{name:<24}{statistics.median(times):>10.3f}{min(times):>10.3f}",
+              file=out)
+    return report
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--repeat", type=int, default=5)
+    p.add_argument("--json", help="also write the report to this file")
+    args = p.parse_args(argv)
+    report = run(args.repeat)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
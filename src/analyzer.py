@@ -6,25 +6,67 @@ actionable business insights.
 Sentiment uses VADER (purpose-built for short, informal review text: it handles
 negation, intensifiers, capitalisation and punctuation emphasis). It falls back
 to TextBlob and finally to a tiny built-in lexicon so the app never crashes if a
-dependency is missing.
+dependency is missing. The backend is picked, and VADER's lexicon parsed,
+on first use rather than at import, to keep cold starts fast.
 """
 
-import pandas as pd
+import threading
+from collections import Counter
+from contextlib import contextmanager
 from datetime import datetime
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+
+import profiling
+from cube import AnalysisCube
+from dedupe import DuplicateGroups, find_duplicates
+from encoded_results import (EncodedResults, issue_counts, join_issues,
+                             priority_rows)
+from heavy_hitters import MisraGries, top_counts
+from matcher import PhraseMatcher
+from score_cache import ScoreCache
+from streaming import AnalysisAggregate
+from topk import top_k
+
+# --- Sentiment backend (selected and loaded once, on first use) --------------
+_BACKEND = None        # "vader", "textblob" or "lexicon"
+_VADER = None          # BatchVader (compiled VADER tables), built on first score
+TextBlob = None
+_BACKEND_LOCK = threading.Lock()
+
+
+def sentiment_backend():
+    """Name of the best available sentiment backend, chosen once per process."""
+    global _BACKEND, TextBlob
+    if _BACKEND is None:
+        with _BACKEND_LOCK:
+            if _BACKEND is None:
+                try:
+                    import vaderSentiment.vaderSentiment  # noqa: F401
+                    _BACKEND = "vader"
+                except Exception:  # pragma: no cover - dependency fallback
+                    try:
+                        from textblob import TextBlob
+                        _BACKEND = "textblob"
+                    except Exception:  # pragma: no cover - last resort
+                        _BACKEND = "lexicon"
+    return _BACKEND
+
+
+def _vader():
+    """The shared VADER scorer; its lexicon files are parsed on first call."""
+    global _VADER
+    if _VADER is None:
+        with _BACKEND_LOCK:
+            if _VADER is None:
+                from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+                from vader_batch import BatchVader
+                _VADER = BatchVader(SentimentIntensityAnalyzer())
+    return _VADER
 
-# --- Sentiment backend selection (done once at import) -----------------------
-_VADER = None
-_BACKEND = "lexicon"
-try:
-    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-    _VADER = SentimentIntensityAnalyzer()
-    _BACKEND = "vader"
-except Exception:  # pragma: no cover - dependency fallback
-    try:
-        from textblob import TextBlob
-        _BACKEND = "textblob"
-    except Exception:  # pragma: no cover - last-resort fallback
-        _BACKEND = "lexicon"
 
 # Sentiment thresholds tuned per backend (compound/polarity in [-1, 1]).
 _THRESHOLDS = {"vader": 0.05, "textblob": 0.10, "lexicon": 0.0}
@@ -73,17 +115,122 @@ class ReviewAnalyzer:
                        "legal action", "sue", "dangerous", "unsafe",
                        "injured", "got hurt", "recall", "hazard"]
 
-    def __init__(self):
-        self.backend = _BACKEND
-        self.pos_threshold = _THRESHOLDS[_BACKEND]
-        self.neg_threshold = -_THRESHOLDS[_BACKEND]
+    # Matcher label for URGENT_KEYWORDS (issue labels are the ISSUE_RULES keys).
+    _URGENT_LABEL = "__urgent__"
+
+    # Below this many texts to score, process start-up and pickling cost more
+    # than they save, so `workers` is ignored.
+    PARALLEL_MIN_ROWS = 2000
+
+    def __init__(self, cache_size=100_000, cache_path=None, workers=1,
+                 on_stage=None, track_allocations=False, dedupe="exact",
+                 dedupe_threshold=0.8):
+        """``cache_size`` bounds the in-memory score cache (0 disables it);
+        ``cache_path`` adds a persistent SQLite tier at that file; ``workers``
+        > 1 scores large batches in that many processes.
+
+        ``on_stage`` is called with a timing record after every pipeline
+        stage (see `profiling`); ``track_allocations`` adds each stage's peak
+        traced memory to the records.
+
+        ``dedupe`` picks how rows are grouped before scoring (see `dedupe`):
+        one representative per group is scored and its results copied to the
+        rest. ``"exact"`` only collapses identical texts and never changes a
+        result; ``"normalized"`` and ``"near"`` (MinHash similarity of at
+        least ``dedupe_threshold``) trade exactness for less work.
+        """
+        self.workers = max(1, int(workers or 1))
+        self._pool = None
+        self.cache = (ScoreCache(cache_size, cache_path)
+                      if cache_size or cache_path else None)
+        self._matcher = None
+        self._issue_lists = {}
+        self.stage_hooks = [on_stage] if on_stage else []
+        self.track_allocations = track_allocations
+        self._recorders = threading.local()
+        find_duplicates([], dedupe)  # reject unknown modes up front
+        self.dedupe = dedupe
+        self.dedupe_threshold = dedupe_threshold
+
+    @property
+    def backend(self):
+        """Active sentiment backend (selected on first access)."""
+        return sentiment_backend()
+
+    @property
+    def pos_threshold(self):
+        return _THRESHOLDS[self.backend]
+
+    @property
+    def neg_threshold(self):
+        return -_THRESHOLDS[self.backend]
+
+    # --- Profiling -----------------------------------------------------------
+    @contextmanager
+    def profile(self):
+        """Collect the stage records of this thread's calls made in the block.
+
+        Yields a `profiling.StageRecorder`; blocks may nest (each recorder
+        sees every stage run inside it). Other threads sharing this analyzer
+        are not recorded.
+        """
+        recorder = profiling.StageRecorder()
+        active = self._recorders.__dict__.setdefault("active", [])
+        active.append(recorder)
+        try:
+            yield recorder
+        finally:
+            active.remove(recorder)
+
+    def _stage(self, name, rows=None):
+        """Context manager timing one stage and reporting it to the hooks."""
+        hooks = self.stage_hooks + getattr(self._recorders, "active", [])
+        return profiling.stage(name, rows, self.track_allocations, hooks)
+
+    # --- Keyword rules -------------------------------------------------------
+    @property
+    def matcher(self):
+        """`PhraseMatcher` compiled once from ISSUE_RULES and URGENT_KEYWORDS.
+
+        Bit ``i`` of a scan is the i-th ISSUE_RULES category; the bit after
+        the last category is the urgent flag.
+        """
+        if self._matcher is None:
+            groups = {issue: keywords
+                      for issue, (keywords, _) in self.ISSUE_RULES.items()}
+            groups[self._URGENT_LABEL] = self.URGENT_KEYWORDS
+            self._matcher = PhraseMatcher(groups)
+        return self._matcher
+
+    def rule_masks(self, texts):
+        """Scan reviews once each -> int64 array of issue/urgent bitmasks."""
+        return np.array(self.matcher.scan_many(texts), dtype=np.int64)
+
+    def _issues_for(self, mask):
+        """Issue categories (ISSUE_RULES order) for a rule mask."""
+        mask &= (1 << len(self.ISSUE_RULES)) - 1
+        issues = self._issue_lists.get(mask)
+        if issues is None:
+            issues = self._issue_lists[mask] = tuple(self.matcher.decode(mask))
+        return list(issues)
+
+    def detect_issues(self, text):
+        """Issue categories and urgent flag for one review -> (issues, urgent)."""
+        mask = self.matcher.scan(text)
+        return self._issues_for(mask), bool(mask >> len(self.ISSUE_RULES) & 1)
+
+    # --- Duplicates ----------------------------------------------------------
+    def duplicate_groups(self, texts):
+        """`dedupe.DuplicateGroups` of ``texts`` under this analyzer's mode."""
+        with self._stage("deduplication", len(texts)):
+            return find_duplicates(texts, self.dedupe, self.dedupe_threshold)
 
     # --- Sentiment -----------------------------------------------------------
-    def _raw_score(self, text):
-        """Return a sentiment score in [-1, 1] using the active backend."""
+    def _compute_score(self, text):
+        """Score ``text`` in [-1, 1] with the active backend (uncached)."""
         text = str(text)
         if self.backend == "vader":
-            return _VADER.polarity_scores(text)["compound"]
+            return (_VADER or _vader()).compound(text)
         if self.backend == "textblob":
             return TextBlob(text).sentiment.polarity
         words = text.lower().split()
@@ -92,6 +239,57 @@ class ReviewAnalyzer:
         total = pos + neg
         return 0.0 if total == 0 else (pos - neg) / total
 
+    def _raw_score(self, text):
+        """Return a sentiment score in [-1, 1] using the active backend."""
+        return float(self._score_texts([text])[0])
+
+    def _score_texts(self, texts):
+        """Scores for a list of texts as a float array, via the score cache."""
+        if self.cache is None:
+            return np.array(self._compute_many(texts), dtype=float)
+        keys = [ScoreCache.key(self.backend, t) for t in texts]
+        scores = self.cache.get_many(keys)
+        todo = {k: t for k, t in zip(keys, texts) if k not in scores}
+        computed = dict(zip(todo, self._compute_many(list(todo.values()))))
+        self.cache.put_many(computed.items())
+        scores.update(computed)
+        return np.fromiter((scores[k] for k in keys), dtype=float,
+                           count=len(keys))
+
+    def _compute_many(self, texts):
+        """Uncached scores for ``texts`` (a list), in order.
+
+        With ``workers`` > 1 and enough texts, the list is cut into contiguous
+        chunks of roughly equal character count and scored in a process pool;
+        each worker runs the same backend code, so scores are bit-identical to
+        the serial path.
+        """
+        if self.workers <= 1 or len(texts) < self.PARALLEL_MIN_ROWS:
+            return self._score_serial(texts)
+        if self._pool is None:
+            from concurrent.futures import ProcessPoolExecutor
+            self._pool = ProcessPoolExecutor(self.workers,
+                                             initializer=_init_worker)
+        chunks = _balanced_chunks(texts, self.workers * 4)
+        return [score for part in self._pool.map(_score_chunk, chunks)
+                for score in part]
+
+    def _score_serial(self, texts):
+        """Uncached scores for ``texts`` in this process."""
+        if self.backend == "vader":
+            return (_VADER or _vader()).score_batch(texts).tolist()
+        return [self._compute_score(t) for t in texts]
+
+    def close(self):
+        """Shut down the scoring process pool, if one was started."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def cache_stats(self):
+        """Score-cache hit/miss counters (None when caching is disabled)."""
+        return self.cache.stats() if self.cache is not None else None
+
     def _label(self, score):
         """Map a score to (label, confidence)."""
         if score >= self.pos_threshold:
@@ -110,116 +308,390 @@ class ReviewAnalyzer:
         return label, confidence, score
 
     # --- Main analysis -------------------------------------------------------
-    def analyze_text(self, df, text_column):
-        """Analyze every review and return a results dict."""
+    # Label order used by the vectorised sentiment codes below.
+    SENTIMENT_LABELS = ("Positive", "Negative", "Neutral")
+    # Base priority per sentiment code (Positive, Negative, Neutral).
+    _BASE_PRIORITY = np.array([0, 50, 25])
+
+    @staticmethod
+    def _rating_column(df, rating_column):
+        """The rating column to use: the given one, else ``rating`` if present."""
+        if rating_column is None and "rating" in df.columns:
+            rating_column = "rating"
+        return rating_column if rating_column in df.columns else None
+
+    def _rating_values(self, df, rating_column):
+        """Star ratings as a float array (NaN where missing or non-numeric)."""
+        rating_column = self._rating_column(df, rating_column)
+        if rating_column is None:
+            return np.full(len(df), np.nan)
+        return pd.to_numeric(df[rating_column], errors="coerce").to_numpy(
+            dtype=float, na_value=np.nan)
+
+    def _sentiment_codes(self, scores):
+        """Vectorised `_label`: scores -> codes into SENTIMENT_LABELS."""
+        return np.where(scores >= self.pos_threshold, 0,
+                        np.where(scores <= self.neg_threshold, 1, 2))
+
+    def analyze_text(self, df, text_column, rating_column=None):
+        """Analyze every review and return a results dict.
+
+        `rating_column` is the star-rating column (as found by the app's
+        column detection); when omitted a column named ``rating`` is used if
+        present. The ``timings`` entry lists the wall time (and rows) of each
+        stage: deduplication, sentiment, keyword matching, priority and
+        aggregation. Each row's duplicate-group size is kept as the
+        ``duplicates`` column, with ``duplicate_groups``/``duplicate_rows``
+        totals in the summary.
+        """
         if text_column not in df.columns:
             return None
+        with self.profile() as recorder:
+            texts = df[text_column].astype(str).tolist()
+            groups = self.duplicate_groups(texts)
+            outputs = self._score_values(
+                texts, self._rating_values(df, rating_column), groups)
+            analysis = self._assemble(df, text_column, *outputs,
+                                      duplicates=groups.row_sizes())
+        analysis["timings"] = recorder.records
+        return analysis
 
-        lengths = df[text_column].astype(str).str.len()
-        analysis = {
-            "backend": self.backend,
-            "total_reviews": len(df),
-            "avg_length": lengths.mean(),
-            "shortest_review": lengths.min(),
-            "longest_review": lengths.max(),
-            "empty_reviews": int(df[text_column].isna().sum()),
+    def _score_values(self, texts, ratings, groups=None):
+        """Per-row outputs for a list of texts and a float array of ratings
+        -> (codes, scores, issue masks, priority, urgent).
+
+        Text-derived outputs are computed once per duplicate group
+        (``groups``, found here when not given) and copied to its members;
+        the rating adjustments still apply row by row.
+        """
+        has_rating = ~np.isnan(ratings)
+        n = len(texts)
+        if groups is None:
+            groups = self.duplicate_groups(texts)
+        unique_texts = [texts[i] for i in groups.first.tolist()]
+
+        # Sentiment from text, blended with the star rating when available so
+        # a 1-star "it's fine" still reads as dissatisfied.
+        with self._stage("sentiment", n):
+            text_scores = self._score_texts(unique_texts)[groups.labels]
+            rating_scores = (ratings - 3) / 2.0  # 1->-1 ... 5->+1
+            scores = np.where(has_rating,
+                              0.65 * text_scores + 0.35 * rating_scores,
+                              text_scores)
+            codes = self._sentiment_codes(scores)
+
+        # Detect issues and urgent phrases in a single pass over each review.
+        with self._stage("keyword_matching", n):
+            masks = self.rule_masks(unique_texts)[groups.labels]
+
+        # Base priority from sentiment, plus issue weights, urgent escalation
+        # and low-rating bumps, capped at 100.
+        with self._stage("priority", n):
+            issue_weights = np.zeros(n, dtype=int)
+            for bit, (_, weight) in enumerate(self.ISSUE_RULES.values()):
+                issue_weights += (masks >> bit & 1) * weight
+            urgent = (masks >> len(self.ISSUE_RULES) & 1).astype(bool)
+            priority = (self._BASE_PRIORITY[codes]
+                        + issue_weights
+                        + np.where(urgent, 30, 0)
+                        + np.where(ratings <= 2, 20, np.where(ratings == 3, 10, 0)))
+            priority = np.minimum(priority, 100)
+        issue_masks = masks & ((1 << len(self.ISSUE_RULES)) - 1)
+        return codes, scores, issue_masks, priority, urgent
+
+    def triage(self, reviews):
+        """Score review dicts without building a DataFrame (low-latency path).
+
+        Each review has ``text`` and optionally ``rating``, ``product`` and
+        ``name``. Returns one dict per review with sentiment, score, issues,
+        priority, urgent and a ``draft_response``.
+        """
+        texts = ["" if r.get("text") is None else str(r["text"])
+                 for r in reviews]
+        ratings = np.array([np.nan if r.get("rating") is None else r["rating"]
+                            for r in reviews], dtype=float)
+        codes, scores, masks, priority, urgent = self._score_values(texts,
+                                                                     ratings)
+        issues_found = [self._issues_for(m) for m in masks.tolist()]
+        drafts = self.draft_replies(codes, masks,
+                                    [r.get("product") for r in reviews],
+                                    [r.get("name") for r in reviews])
+        out = []
+        for i in range(len(reviews)):
+            out.append({
+                "sentiment": self.SENTIMENT_LABELS[codes[i]],
+                "score": float(scores[i]),
+                "issues": issues_found[i],
+                "priority": int(priority[i]),
+                "urgent": bool(urgent[i]),
+                "draft_response": drafts[i],
+            })
+        return out
+
+    def _assemble(self, df, text_column, codes, scores, issue_masks, priority,
+                  urgent, duplicates=None):
+        """Build the `EncodedResults` from per-row outputs aligned with ``df``.
+
+        ``duplicates`` (each row's duplicate-group size) is optional so
+        results saved before it existed can still be rebuilt.
+        """
+        with self._stage("aggregation", len(df)):
+            lengths = df[text_column].astype(str).str.len()
+            counts = np.bincount(codes, minlength=3)
+            issue_masks = np.asarray(issue_masks, dtype=np.uint16)
+            summary = {
+                "backend": self.backend,
+                "total_reviews": len(df),
+                "avg_length": lengths.mean(),
+                "shortest_review": lengths.min(),
+                "longest_review": lengths.max(),
+                "empty_reviews": int(df[text_column].isna().sum()),
+                "positive_count": int(counts[0]),
+                "negative_count": int(counts[1]),
+                "neutral_count": int(counts[2]),
+                # Most-common first; ties keep first-seen order.
+                "issue_summary": dict(sorted(
+                    issue_counts(issue_masks, self.ISSUE_RULES).items(),
+                    key=lambda kv: kv[1], reverse=True)),
+            }
+            columns = {
+                "sentiment": np.asarray(codes, dtype=np.int8),
+                "score": np.asarray(scores, dtype=float),
+                "priority": np.asarray(priority, dtype=np.uint8),
+                "issues": issue_masks,
+                "urgent": np.asarray(urgent, dtype=bool),
+            }
+            if duplicates is not None:
+                duplicates = np.asarray(duplicates, dtype=np.uint32)
+                columns["duplicates"] = duplicates
+                # Rows per group size // size = groups of that size.
+                rows_by_size = np.bincount(duplicates)[2:]
+                sizes = np.arange(2, len(rows_by_size) + 2)
+                summary["duplicate_groups"] = int((rows_by_size // sizes).sum())
+                summary["duplicate_rows"] = int(rows_by_size.sum())
+            return EncodedResults(summary, columns, df.index,
+                                  self.SENTIMENT_LABELS, self.ISSUE_RULES)
+
+    # --- Columnar per-row results ------------------------------------------
+    def result_columns(self, df, results):
+        """Per-row results as compact arrays aligned with ``df``.
+
+        Returns sentiment codes (int8, into SENTIMENT_LABELS), blended scores,
+        priority (uint8), an issue bitmask (uint16, bit i = i-th ISSUE_RULES
+        category) and urgent flags (bool). For `EncodedResults` these are
+        its own columns; a plain results dict is encoded.
+        """
+        if isinstance(results, EncodedResults):
+            return results.columns
+        label_codes = {label: i for i, label in enumerate(self.SENTIMENT_LABELS)}
+        bits = {issue: 1 << i for i, issue in enumerate(self.ISSUE_RULES)}
+        return {
+            "sentiment": np.array([label_codes[s] for s in results["sentiments"]],
+                                  dtype=np.int8),
+            "score": np.asarray(results["sentiment_scores"], dtype=float),
+            "priority": np.asarray(results["priority_scores"], dtype=np.uint8),
+            "issues": np.array([sum(bits[i] for i in issues)
+                                for issues in results["issues_found"]],
+                               dtype=np.uint16),
+            "urgent": df.index.isin(results["urgent_indices"]),
         }
 
-        sentiments, issues_found, urgent_reviews, review_priorities = [], [], [], []
-
-        for idx, row in df.iterrows():
-            text = str(row[text_column])
-            text_lower = text.lower()
-
-            # Sentiment from text, blended with the star rating when available so
-            # a 1-star "it's fine" still reads as dissatisfied.
-            text_score = self._raw_score(text)
-            score = text_score
-            rating = row.get("rating") if "rating" in row else None
-            if rating is not None and pd.notna(rating):
-                rating_score = (float(rating) - 3) / 2.0  # 1->-1 ... 5->+1
-                score = 0.65 * text_score + 0.35 * rating_score
-            sentiment, _ = self._label(score)
-            sentiments.append(sentiment)
-
-            # Base priority from sentiment.
-            priority_score = 50 if sentiment == "Negative" else (
-                25 if sentiment == "Neutral" else 0)
-
-            # Detect issues and add their weights.
-            review_issues = []
-            for issue, (keywords, weight) in self.ISSUE_RULES.items():
-                if any(kw in text_lower for kw in keywords):
-                    review_issues.append(issue)
-                    priority_score += weight
-            issues_found.append(review_issues)
-
-            # Urgent escalation.
-            if any(kw in text_lower for kw in self.URGENT_KEYWORDS):
-                urgent_reviews.append(idx)
-                priority_score += 30
-
-            # Low ratings raise priority further.
-            if rating is not None and pd.notna(rating):
-                if float(rating) <= 2:
-                    priority_score += 20
-                elif float(rating) == 3:
-                    priority_score += 10
-
-            review_priorities.append(min(priority_score, 100))
-
-        analysis["sentiments"] = sentiments
-        analysis["positive_count"] = sentiments.count("Positive")
-        analysis["negative_count"] = sentiments.count("Negative")
-        analysis["neutral_count"] = sentiments.count("Neutral")
-        analysis["issues_found"] = issues_found
-        analysis["urgent_indices"] = urgent_reviews
-        analysis["priority_scores"] = review_priorities
-
-        issue_summary = {}
-        for issues_list in issues_found:
-            for issue in issues_list:
-                issue_summary[issue] = issue_summary.get(issue, 0) + 1
-        # Keep the summary ordered most-common first.
-        analysis["issue_summary"] = dict(
-            sorted(issue_summary.items(), key=lambda kv: kv[1], reverse=True))
+    def results_from_columns(self, df, text_column, columns):
+        """Rebuild the `analyze_text` results from `result_columns` arrays."""
+        return self._assemble(
+            df, text_column, np.asarray(columns["sentiment"], dtype=int),
+            columns["score"], columns["issues"], columns["priority"],
+            columns["urgent"], columns.get("duplicates"))
+
+    def _row_hashes(self, df, text_column, rating_column):
+        """uint64 hash per row of the inputs that determine its results."""
+        cols = [text_column]
+        rating_column = self._rating_column(df, rating_column)
+        if rating_column is not None and rating_column != text_column:
+            cols.append(rating_column)
+        return pd.util.hash_pandas_object(df[cols], index=False).to_numpy()
+
+    def track_rows(self, df, results, text_column, key_column,
+                   rating_column=None):
+        """Add the ``row_keys``/``row_hashes`` that let ``results`` (of any
+        full analysis of ``df``) serve as ``previous`` in `analyze_incremental`.
+
+        Returns ``results``; unchanged if ``key_column`` is missing.
+        """
+        if key_column in df.columns:
+            results["row_keys"] = df[key_column].tolist()
+            results["row_hashes"] = self._row_hashes(df, text_column,
+                                                     rating_column)
+        return results
+
+    def analyze_incremental(self, df, text_column, previous=None,
+                            key_column="review_id", rating_column=None):
+        """Analyze ``df``, reusing rows unchanged since a previous run.
+
+        ``previous`` is an earlier result of this method (or None). Rows whose
+        ``key_column`` value was seen before with the same text and rating
+        (compared by hash) keep their stored results; only new or changed rows
+        are scored. Returns the `analyze_text` results plus the per-row
+        ``row_keys``/``row_hashes``/``urgent_flags`` needed for the next run
+        and ``reused_rows``/``recomputed_rows`` counts; None if a column is
+        missing.
+        """
+        if text_column not in df.columns or key_column not in df.columns:
+            return None
+        with self.profile() as recorder:
+            analysis = self._analyze_changed(df, text_column, previous,
+                                             key_column, rating_column)
+        analysis["timings"] = recorder.records
+        return analysis
 
+    def _analyze_changed(self, df, text_column, previous, key_column,
+                         rating_column):
+        """`analyze_incremental` once its columns have been checked."""
+        n = len(df)
+        texts = df[text_column].astype(str).tolist()
+        groups = self.duplicate_groups(texts)
+        with self._stage("change_detection", n):
+            keys = df[key_column].tolist()
+            hashes = self._row_hashes(df, text_column, rating_column)
+            reuse = np.zeros(n, dtype=bool)
+            src = np.zeros(n, dtype=int)
+            if (previous and previous.get("backend") == self.backend
+                    and previous.get("row_keys")):
+                prev = pd.Series(np.arange(len(previous["row_keys"])),
+                                 index=previous["row_keys"])
+                prev = prev[~prev.index.duplicated(keep="last")]
+                matched = prev.reindex(keys).to_numpy()
+                found = ~np.isnan(matched)
+                src = np.where(found, matched, 0).astype(int)
+                prev_hashes = np.asarray(previous["row_hashes"], dtype=np.uint64)
+                reuse = found & (prev_hashes[src] == hashes)
+
+        # codes, scores, issue masks, priority, urgent
+        outputs = [np.zeros(n, dtype=int), np.zeros(n, dtype=float),
+                   np.zeros(n, dtype=np.uint16), np.zeros(n, dtype=int),
+                   np.zeros(n, dtype=bool)]
+
+        old = np.flatnonzero(reuse)
+        if len(old):
+            prev_cols = previous.columns
+            prev_src = src[old]
+            for out, name in zip(outputs, ("sentiment", "score", "issues",
+                                           "priority", "urgent")):
+                out[old] = np.asarray(prev_cols[name])[prev_src]
+
+        new = np.flatnonzero(~reuse)
+        if len(new):
+            # The changed rows' groups, as found over the whole frame.
+            fresh = self._score_values(
+                [texts[i] for i in new.tolist()],
+                self._rating_values(df, rating_column)[new],
+                DuplicateGroups(pd.factorize(groups.labels[new])[0]))
+            for out, values in zip(outputs, fresh):
+                out[new] = values
+
+        analysis = self._assemble(df, text_column, *outputs,
+                                  duplicates=groups.row_sizes())
+        analysis["row_keys"] = keys
+        analysis["row_hashes"] = hashes
+        analysis["reused_rows"] = len(old)
+        analysis["recomputed_rows"] = len(new)
         return analysis
 
+    def analyze_stream(self, chunks, text_column, rating_column=None,
+                       top_n=25, id_column=None, max_words=None):
+        """Analyze an iterable of DataFrame chunks with bounded memory.
+
+        Returns an `AnalysisAggregate` (exact totals for every chunk, top-n
+        priority rows, urgent IDs), or None if a chunk lacks ``text_column``.
+        ``max_words`` caps the word counts kept (see `word_counts`).
+        """
+        agg = AnalysisAggregate(top_n=top_n, backend=self.backend,
+                                max_words=max_words)
+        for chunk in chunks:
+            results = self.analyze_text(chunk, text_column, rating_column)
+            if results is None:
+                return None
+            words = self.word_counts(chunk[text_column].fillna(""), max_words)
+            agg.update(chunk, results, words, text_column, id_column)
+        return agg
+
     # --- Supporting analytics ------------------------------------------------
-    def get_word_frequency(self, df, text_column, top_n=10):
-        """Most common meaningful words across all reviews."""
+    # Words too common to say anything about a review.
+    STOP_WORDS = frozenset({
+        "the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for",
+        "of", "with", "by", "from", "is", "was", "are", "were", "be", "been",
+        "have", "has", "had", "do", "does", "did", "will", "would", "could",
+        "should", "may", "might", "must", "can", "this", "that", "these",
+        "those", "i", "you", "he", "she", "it", "we", "they", "them", "their",
+        "what", "which", "who", "when", "where", "why", "how", "all", "each",
+        "every", "both", "few", "more", "most", "other", "some", "such",
+        "only", "own", "same", "so", "than", "too", "very", "just", "your",
+        "my", "product", "item", "one", "get", "got", "also", "even", "still",
+    })
+
+    def _tokens(self, texts):
+        """Meaningful words (lower-cased, punctuation-stripped) in ``texts``."""
+        stop_words = self.STOP_WORDS
+        for text in texts:
+            for w in str(text).lower().split():
+                w = w.strip('.,!?";:()[]{}\'"-')
+                if len(w) > 3 and w not in stop_words:
+                    yield w
+
+    # Reviews tokenised per batch before folding into a bounded summary.
+    WORD_BATCH = 10_000
+
+    def word_counts(self, texts, max_words=None):
+        """Counts of meaningful words, in first-seen order.
+
+        Returns an exact Counter, or with ``max_words`` a `MisraGries`
+        summary keeping at most that many words (exact while the vocabulary
+        fits). Counts from separate chunks merge with ``update``.
+        """
+        if max_words is None:
+            return Counter(self._tokens(texts))
+        summary = MisraGries(max_words)
+        texts = iter(texts)
+        for batch in iter(lambda: list(islice(texts, self.WORD_BATCH)), []):
+            summary.update(Counter(self._tokens(batch)))
+        return summary
+
+    def get_word_frequency(self, df, text_column, top_n=10, max_words=None):
+        """Most common meaningful words across all reviews.
+
+        Words are counted as they are tokenised; ``max_words`` bounds memory
+        on very large inputs by keeping only the heaviest hitters.
+        """
         if text_column not in df.columns:
             return {}
 
-        stop_words = {
-            "the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for",
-            "of", "with", "by", "from", "is", "was", "are", "were", "be", "been",
-            "have", "has", "had", "do", "does", "did", "will", "would", "could",
-            "should", "may", "might", "must", "can", "this", "that", "these",
-            "those", "i", "you", "he", "she", "it", "we", "they", "them", "their",
-            "what", "which", "who", "when", "where", "why", "how", "all", "each",
-            "every", "both", "few", "more", "most", "other", "some", "such",
-            "only", "own", "same", "so", "than", "too", "very", "just", "your",
-            "my", "product", "item", "one", "get", "got", "also", "even", "still",
-        }
+        with self._stage("word_frequency", len(df)):
+            return top_counts(self.word_counts(df[text_column].fillna(""),
+                                               max_words), top_n)
 
-        all_words = []
-        for text in df[text_column].fillna(""):
-            for w in str(text).lower().split():
-                w = w.strip('.,!?";:()[]{}\'"-')
-                if len(w) > 3 and w not in stop_words:
-                    all_words.append(w)
+    def build_cube(self, df, analysis_results, product_column=None,
+                   date_column=None):
+        """Roll the results up into an `AnalysisCube` for the dashboard.
 
-        if all_words:
-            return pd.Series(all_words).value_counts().head(top_n).to_dict()
-        return {}
+        ``product_column``/``date_column`` are optional slicing dimensions
+        (ignored when missing from ``df``).
+        """
+        with self._stage("cube", len(df)):
+            columns = self.result_columns(df, analysis_results)
+            return AnalysisCube.build(
+                columns, self.SENTIMENT_LABELS, self.ISSUE_RULES,
+                df[product_column] if product_column in df.columns else None,
+                df[date_column] if date_column in df.columns else None)
 
     def get_actionable_insights(self, df, analysis_results, text_column):
         """Generate business insights from the analysis results."""
         if not analysis_results:
             return None
+        with self._stage("insights", analysis_results["total_reviews"]):
+            return self._insights(analysis_results)
 
+    def _insights(self, analysis_results):
+        """`get_actionable_insights` for a non-empty results dict."""
         insights = {"urgent_actions": [], "improvement_areas": [],
                     "recommendations": []}
         total = analysis_results["total_reviews"] or 1
@@ -307,6 +779,21 @@ class ReviewAnalyzer:
             "reviewing our value against the market — I'd like to offer you a "
             "discount on your next order as a thank-you for giving us a try."),
     }
+    # Replies for reviews without a detected issue, keyed by sentiment.
+    SENTIMENT_TEMPLATES = {
+        "Positive": (
+            "Hi {name}, thank you so much for the kind words — we're thrilled "
+            "you're happy with the {product}! Reviews like yours make our day. "
+            "We'd love to see you again soon."),
+        "Negative": (
+            "Hi {name}, I'm sorry the {product} didn't meet your expectations. "
+            "We'd really like to understand what went wrong and make it right — "
+            "please reply here and we'll help right away."),
+        "Neutral": (
+            "Hi {name}, thanks for taking the time to review the {product}. We'd "
+            "love to know what would have made this a 5-star experience — your "
+            "feedback helps us improve."),
+    }
 
     def draft_response(self, sentiment, issues=None, rating=None, product=None,
                        name="there"):
@@ -318,45 +805,178 @@ class ReviewAnalyzer:
         for issue in self.ISSUE_RULES:  # dict is ordered most-severe first
             if issue in issues:
                 return self.RESPONSE_TEMPLATES[issue].format(name=name, product=product)
+        template = self.SENTIMENT_TEMPLATES.get(sentiment,
+                                                self.SENTIMENT_TEMPLATES["Neutral"])
+        return template.format(name=name, product=product)
+
+    def draft_replies(self, sentiment, issues, products=None, names=None):
+        """`draft_response` for whole columns at once, as an object array.
+
+        ``sentiment`` holds codes into SENTIMENT_LABELS and ``issues`` the
+        issue bitmasks (as in `result_columns`); ``products`` and ``names``
+        are optional per-row values. The template is picked per row from
+        the bitmask's lowest bit (the most severe issue), and each distinct
+        (template, product, name) combination is formatted only once.
+        """
+        sentiment = np.asarray(sentiment, dtype=np.int64)
+        issues = np.asarray(issues, dtype=np.int64)
+        n = len(sentiment)
+        templates = [*(self.RESPONSE_TEMPLATES[i] for i in self.ISSUE_RULES),
+                     *(self.SENTIMENT_TEMPLATES[s] for s in self.SENTIMENT_LABELS)]
+        lowest = issues & -issues
+        template = np.where(issues > 0,
+                            np.log2(np.maximum(lowest, 1)).astype(np.int64),
+                            len(self.ISSUE_RULES) + sentiment)
+
+        def codes(values, default):
+            if values is None:
+                return np.zeros(n, dtype=np.int64), [default]
+            seen = {}
+            labels = np.fromiter((seen.setdefault(v, len(seen)) for v in values),
+                                 dtype=np.int64, count=n)
+            # Same fallbacks as draft_response (None / "" -> default).
+            return labels, [default if v is None or v == "" else v
+                            for v in seen]
+
+        product_codes, product_values = codes(products, "product")
+        name_codes, name_values = codes(names, "there")
+        combo = ((template * len(product_values) + product_codes)
+                 * len(name_values) + name_codes)
+        labels, uniques = pd.factorize(combo)
+        per_product = len(product_values) * len(name_values)
+        drafts = np.array(
+            [templates[c // per_product].format(
+                product=product_values[c // len(name_values) % len(product_values)],
+                name=name_values[c % len(name_values)])
+             for c in uniques.tolist()], dtype=object)
+        return drafts[labels]
+
+    def reply_drafts(self, df, analysis_results, product_column=None,
+                     name_column=None, actionable_only=True):
+        """Reviews with a suggested reply each, ready to hand to a helpdesk.
+
+        Returns the source rows (in row order) with priority_score,
+        sentiment, issues and draft_response columns. With
+        ``actionable_only`` only negative or issue-tagged reviews are kept.
+        """
+        if not analysis_results or "priority_scores" not in analysis_results:
+            return pd.DataFrame()
 
-        if sentiment == "Positive":
-            return (f"Hi {name}, thank you so much for the kind words — we're "
-                    f"thrilled you're happy with the {product}! Reviews like yours "
-                    "make our day. We'd love to see you again soon.")
-        if sentiment == "Negative":
-            return (f"Hi {name}, I'm sorry the {product} didn't meet your "
-                    "expectations. We'd really like to understand what went wrong "
-                    "and make it right — please reply here and we'll help right away.")
-        return (f"Hi {name}, thanks for taking the time to review the {product}. "
-                "We'd love to know what would have made this a 5-star experience — "
-                "your feedback helps us improve.")
+        with self._stage("reply_drafts", len(df)):
+            columns = self.result_columns(df, analysis_results)
+            sentiment = np.asarray(columns["sentiment"])
+            issues = np.asarray(columns["issues"])
+            keep = np.arange(len(df))
+            if actionable_only:
+                negative = self.SENTIMENT_LABELS.index("Negative")
+                keep = np.flatnonzero((sentiment == negative) | (issues != 0))
+            rows = priority_rows(df, columns, keep, self.SENTIMENT_LABELS,
+                                 self.ISSUE_RULES)
+
+            def column(name):
+                if name and name in df.columns:
+                    return df[name].to_numpy()[keep]
+                return None
+
+            rows["draft_response"] = self.draft_replies(
+                sentiment[keep], issues[keep], column(product_column),
+                column(name_column))
+            return rows
 
     def get_priority_reviews(self, df, analysis_results, text_column, top_n=10):
-        """Return the highest-priority reviews for triage."""
+        """Return the highest-priority reviews for triage.
+
+        Ties keep row order. Only the ``top_n`` selected rows are copied and
+        decoded (see `topk.top_k`).
+        """
         if not analysis_results or "priority_scores" not in analysis_results:
             return pd.DataFrame()
 
-        priority_df = df.copy()
-        priority_df["priority_score"] = analysis_results["priority_scores"]
-        priority_df["sentiment"] = analysis_results["sentiments"]
-        priority_df["issues"] = [", ".join(issues) if issues else "None"
-                                 for issues in analysis_results["issues_found"]]
-
-        return priority_df.sort_values("priority_score", ascending=False).head(top_n)
+        with self._stage("priority_sort", len(df)):
+            columns = self.result_columns(df, analysis_results)
+            best = top_k(columns["priority"], top_n)
+            return priority_rows(df, columns, best, self.SENTIMENT_LABELS,
+                                 self.ISSUE_RULES)
+
+    def executive_summary(self, analysis_results, insights=None):
+        """Plain-text business report (the Export page's executive summary)."""
+        total = analysis_results["total_reviews"]
+        pos_pct = analysis_results["positive_count"] / (total or 1) * 100
+        neg_pct = analysis_results["negative_count"] / (total or 1) * 100
+        top_issues = "\n".join(
+            f"- {k}: {v} occurrences"
+            for k, v in list(analysis_results["issue_summary"].items())[:5])
+        recs = "\n".join(f"- {r}" for r in
+                         (insights["recommendations"] if insights else []))
+        return f"""SMARTREVIEW-AI BUSINESS REPORT
+Generated: {datetime.now():%Y-%m-%d %H:%M}
+
+EXECUTIVE SUMMARY
+Total reviews analysed: {total}
+Positive: {analysis_results['positive_count']} ({pos_pct:.1f}%)
+Negative: {analysis_results['negative_count']} ({neg_pct:.1f}%)
+Urgent reviews: {len(analysis_results['urgent_indices'])}
+
+TOP ISSUES
+{top_issues or '- None detected'}
+
+RECOMMENDATIONS
+{recs or '- None'}
+"""
 
     def export_analysis(self, df, analysis_results):
         """Attach analysis columns to the data for export."""
-        export_data = df.copy()
-
-        if analysis_results:
-            export_data["predicted_sentiment"] = analysis_results["sentiments"]
-            export_data["priority_score"] = analysis_results["priority_scores"]
-            export_data["issues_detected"] = [
-                ", ".join(issues) if issues else "None"
-                for issues in analysis_results["issues_found"]]
-
-        export_data["analysis_date"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        return export_data
+        return next(self.iter_export(df, analysis_results, max(len(df), 1)))
+
+    def iter_export(self, df, analysis_results, chunksize=50_000):
+        """`export_analysis` as consecutive frames of ``chunksize`` rows.
+
+        Lets exports be written chunk by chunk (see `exports`) instead of
+        holding a second copy of the whole dataset. Always yields at least one
+        (possibly empty) frame, so writers still get the header.
+        """
+        stamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        columns = (self.result_columns(df, analysis_results)
+                   if analysis_results else None)
+        labels = np.array(self.SENTIMENT_LABELS, dtype=object)
+        for start in range(0, max(len(df), 1), chunksize):
+            rows = slice(start, start + chunksize)
+            part = df.iloc[rows].copy()
+            if columns is not None:
+                part["predicted_sentiment"] = labels[columns["sentiment"][rows]]
+                part["priority_score"] = columns["priority"][rows].astype(int)
+                part["issues_detected"] = join_issues(columns["issues"][rows],
+                                                      self.ISSUE_RULES)
+                if "duplicates" in columns:
+                    part["duplicate_count"] = columns["duplicates"][rows]
+            part["analysis_date"] = stamp
+            yield part
+
+
+# --- Parallel scoring --------------------------------------------------------
+_WORKER = None  # per-process analyzer, built once by _init_worker
+
+
+def _init_worker():
+    """Process-pool initializer: load the sentiment backend once per worker."""
+    global _WORKER
+    _WORKER = ReviewAnalyzer(cache_size=0)
+    _WORKER._compute_score("")  # warm the backend before the first chunk
+
+
+def _score_chunk(texts):
+    return _WORKER._score_serial(texts)
+
+
+def _balanced_chunks(texts, n_chunks):
+    """Split ``texts`` into <= n_chunks contiguous runs of similar total length."""
+    lengths = np.fromiter((len(str(t)) for t in texts), dtype=np.int64,
+                          count=len(texts))
+    cum = np.cumsum(lengths)
+    targets = np.linspace(0, cum[-1], n_chunks + 1)[1:-1]
+    bounds = np.unique(np.concatenate(
+        ([0], np.searchsorted(cum, targets, side="right"), [len(texts)])))
+    return [texts[a:b] for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
 
 
 # Backwards-compatible aliases (older code imported FinalAnalyzer/SimpleAnalyzer).
@@ -1,14 +1,21 @@
-import io
 import os
+import sqlite3
+import tempfile
 from datetime import datetime
 
-import numpy as np
 import pandas as pd
-import plotly.express as px
 import streamlit as st
 from streamlit.components.v1 import html as st_html
 
+import profiling
 from analyzer import ReviewAnalyzer
+from estimates import strata_codes
+from exports import EXPORT_FORMATS, ExportCache
+from jobs import AnalysisJob
+from ingest import analyze_columns, read_csv_robust
+from results_store import ResultsStore, dataset_fingerprint
+from review_table import ReviewTable, page_count
+from synthetic import synthetic_reviews
 
 st.set_page_config(page_title="SmartReview-AI", page_icon="🤖", layout="wide",
                    initial_sidebar_state="expanded")
@@ -16,7 +23,27 @@ st.set_page_config(page_title="SmartReview-AI", page_icon="🤖", layout="wide",
 # --- Config ------------------------------------------------------------------
 SAMPLE_CSV = os.path.join(os.path.dirname(__file__), "..", "data", "sample",
                           "sample_reviews.csv")
-MAX_ROWS = 5000  # cap analysed rows so the hosted demo stays snappy
+# Finished analyses are kept here so they reopen without re-scoring.
+STORE_DIR = os.environ.get(
+    "SMARTREVIEW_STORE",
+    os.path.join(os.path.dirname(__file__), "..", "data", "results"))
+# "Recent analyses" lists only this session's analyses, so visitors of a
+# hosted demo never see each other's uploads. Set to 1 on a private,
+# single-user deployment to list every stored analysis, across restarts.
+SHARED_HISTORY = os.environ.get("SMARTREVIEW_SHARED_HISTORY") == "1"
+# Reviews whose text appears at least this many times are flagged as likely spam.
+SPAM_MIN_COPIES = 3
+# Table pages are cut server-side: only one page of rows reaches the browser.
+PAGE_SIZES = (25, 50, 100, 250)
+REPLY_PAGE_SIZES = (5, 10, 20)
+# Export files are built on request, in chunks, and kept per analysis here.
+EXPORT_DIR = os.path.join(STORE_DIR, "exports")
+# Datasets this large are scored in a background job, chunk by chunk, with a
+# progress bar and partial dashboard figures while it runs.
+BACKGROUND_ROWS = int(os.environ.get("SMARTREVIEW_BACKGROUND_ROWS", 20_000))
+BACKGROUND_CHUNKSIZE = 10_000
+# Sentiment scores by content hash, in STORE_DIR (see `score_cache`).
+SCORE_CACHE = "scores.sqlite"
 
 # Semantic palette tuned for a light canvas.
 SENTIMENT_COLORS = {"Positive": "#10B981", "Negative": "#EF4444",
@@ -24,7 +51,22 @@ SENTIMENT_COLORS = {"Positive": "#10B981", "Negative": "#EF4444",
 ACCENT = "#6366F1"
 MUTED = "#64748B"
 
-analyzer = ReviewAnalyzer()
+
+@st.cache_resource
+def shared_analyzer():
+    """One analyzer per server, so its score cache outlives reruns.
+
+    Scores are also kept in a SQLite file next to the results store, so
+    re-uploads and edited files hit the cache after a restart too.
+    """
+    try:
+        os.makedirs(STORE_DIR, exist_ok=True)
+        return ReviewAnalyzer(cache_path=os.path.join(STORE_DIR, SCORE_CACHE))
+    except (OSError, sqlite3.Error):  # read-only disk: memory cache only
+        return ReviewAnalyzer()
+
+
+analyzer = shared_analyzer()
 
 # --- Styling: "Refined light" ------------------------------------------------
 st.markdown("""
@@ -285,10 +327,59 @@ def style_fig(fig, show_legend=True):
     return fig
 
 
+def issue_bar(issue_summary, intervals=None):
+    """Horizontal bar chart of issue counts ({issue: count}).
+
+    ``intervals`` ({issue: (low, high)}) adds error bars to estimated counts.
+    """
+    import plotly.express as px  # loaded with the first chart, not at start-up
+
+    issue_df = pd.DataFrame(issue_summary.items(), columns=["Issue Type", "Count"])
+    if intervals:
+        issue_df["plus"] = [intervals[i][1] - c for i, c in issue_summary.items()]
+        issue_df["minus"] = [c - intervals[i][0] for i, c in issue_summary.items()]
+    fig = px.bar(issue_df, x="Count", y="Issue Type", orientation="h",
+                 title="Issues requiring attention", color="Count",
+                 color_continuous_scale=["#FCA5A5", "#DC2626"],
+                 error_x="plus" if intervals else None,
+                 error_x_minus="minus" if intervals else None)
+    fig.update_layout(yaxis={"categoryorder": "total ascending"},
+                      coloraxis_showscale=False)
+    fig.update_traces(marker_line_width=0)
+    return style_fig(fig, show_legend=False)
+
+
+def sentiment_donut(sentiment_counts):
+    """Donut chart of review counts per sentiment ({label: count})."""
+    import plotly.express as px
+
+    sentiment_df = pd.DataFrame(sentiment_counts.items(),
+                                columns=["Sentiment", "Count"])
+    fig = px.pie(sentiment_df, values="Count", names="Sentiment", hole=0.55,
+                 title="Customer sentiment", color="Sentiment",
+                 color_discrete_map=SENTIMENT_COLORS)
+    fig.update_traces(marker=dict(line=dict(color="#FFFFFF", width=3)),
+                      textfont=dict(family="Inter", color="#0F172A", size=13))
+    return style_fig(fig)
+
+
+def timings_table(records):
+    """Stage records (see `profiling`) -> a small table for the sidebar."""
+    rows = []
+    for r in records:
+        rate = r["rows"] / r["seconds"] if r["rows"] and r["seconds"] else None
+        rows.append({"Stage": r["stage"].replace("_", " "),
+                     "ms": round(r["seconds"] * 1000, 1),
+                     "Rows": r["rows"],
+                     "Rows/s": f"{rate:,.0f}" if rate else "–"})
+    return pd.DataFrame(rows)
+
+
 def open_detail(category):
     """Tile/chip click -> jump to Analysis Details with the table pre-filtered."""
     st.session_state.nav = "Analysis Details"
     st.session_state.detail_filter = category
+    st.session_state.detail_page = 1
     st.session_state.scroll_to_table = True
 
 
@@ -296,6 +387,27 @@ def _set(state_key, value):
     st.session_state[state_key] = value
 
 
+def _show_filter(name):
+    st.session_state.detail_filter = name
+    st.session_state.detail_page = 1
+
+
+def page_picker(rows, key, sizes):
+    """Rows-per-page and page-number widgets -> (page number, page size).
+
+    Widget state lives under ``{key}_size`` and ``{key}_page``; the page is
+    clamped when a smaller result set leaves fewer pages.
+    """
+    c_size, c_page, _ = st.columns([1, 1, 2])
+    size = c_size.selectbox("Rows per page", sizes, key=f"{key}_size")
+    pages = page_count(rows, size)
+    page_key = f"{key}_page"
+    st.session_state[page_key] = min(st.session_state.get(page_key, 1), pages)
+    number = c_page.number_input(f"Page (of {pages:,})", min_value=1,
+                                 max_value=pages, key=page_key)
+    return int(number), size
+
+
 # --- Data loading ------------------------------------------------------------
 @st.cache_data(show_spinner=False)
 def load_sample_data():
@@ -303,91 +415,207 @@ def load_sample_data():
     try:
         return pd.read_csv(SAMPLE_CSV)
     except Exception:
-        rng = np.random.default_rng(42)
-        base = [
-            "Excellent product, highly recommend! Fast shipping too.",
-            "Broke after two days. Poor quality, want a refund.",
-            "Good value for money, happy with the purchase.",
-            "Wrong item delivered, not what I ordered at all.",
-            "Customer service was rude and unhelpful.",
-            "Too small, doesn't fit. The size chart is wrong.",
-            "Item never arrived, still waiting after three weeks.",
-            "Overpriced for what you get, waste of money.",
-        ]
-        return pd.DataFrame({
-            "review_text": rng.choice(base, 100),
-            "rating": rng.choice([1, 2, 3, 4, 5], 100, p=[.15, .15, .2, .25, .25]),
-            "product": rng.choice(["Headphones", "Cable", "Bottle", "Chair"], 100),
-            "date": pd.date_range("2025-01-01", periods=100).astype(str),
-        })
-
-
-def read_csv_robust(uploaded_file):
-    """Read an uploaded CSV, tolerating encoding and malformed-row problems."""
-    warnings = []
-    raw = uploaded_file.getvalue()
-    df, last_err = None, None
-    for enc in ("utf-8", "utf-8-sig", "latin-1"):
-        try:
-            df = pd.read_csv(io.BytesIO(raw), encoding=enc)
-            if enc != "utf-8":
-                warnings.append(f"File wasn't UTF-8 — read it as {enc}.")
-            break
-        except UnicodeDecodeError:
-            continue
-        except Exception as e:  # parser error -> retry leniently
-            last_err = e
-            try:
-                df = pd.read_csv(io.BytesIO(raw), encoding=enc, engine="python",
-                                 on_bad_lines="skip")
-                warnings.append("Some malformed rows were skipped during import.")
-                break
-            except Exception as e2:
-                last_err = e2
-                continue
-    if df is None:
-        return None, [f"Couldn't parse this CSV ({last_err})."]
-
-    df.columns = [str(c).strip() for c in df.columns]
-    df = df.dropna(how="all").reset_index(drop=True)
-    if df.empty:
-        return None, ["This file has no usable rows."]
-    return df, warnings
-
-
-def analyze_columns(df):
-    """Detect the review-text and rating columns (with a length-based fallback)."""
-    text_cols = [c for c in df.columns if df[c].dtype == object]
-    info = {"text_column": None, "rating_column": None, "text_columns": text_cols}
-
-    for col in df.columns:
-        if any(k in col.lower() for k in ["rating", "score", "stars", "rate"]):
-            info["rating_column"] = col
-            break
-
-    def avg_len(c):
-        return df[c].astype(str).str.len().mean()
-
-    # Prefer text columns whose name signals review content, but skip id-like
-    # columns and, among matches, pick the one with the longest average text.
-    text_keywords = ["review", "text", "comment", "feedback", "description",
-                     "content", "body", "message"]
-    candidates = [c for c in text_cols
-                  if any(k in c.lower() for k in text_keywords)
-                  and not c.lower().endswith("_id") and c.lower() != "id"]
-    if candidates:
-        info["text_column"] = max(candidates, key=avg_len)
-    elif text_cols:  # fallback: the longest free-text column
-        best = max(text_cols, key=avg_len)
-        if avg_len(best) >= 15:
-            info["text_column"] = best
-    return info
+        return synthetic_reviews(100, seed=42)
+
+
+@st.cache_resource
+def results_store():
+    """On-disk store of past analyses (None if it can't be created)."""
+    try:
+        return ResultsStore(STORE_DIR)
+    except OSError:
+        return None
+
+
+@st.cache_resource
+def export_cache():
+    """On-disk cache of built export files (a temp dir if data/ is read-only)."""
+    try:
+        return ExportCache(EXPORT_DIR)
+    except OSError:
+        return ExportCache(os.path.join(tempfile.gettempdir(),
+                                        "smartreview-exports"))
+
+
+@st.cache_data(show_spinner=False)
+def load_stored_frame(fingerprint):
+    """Source reviews of a stored analysis."""
+    return results_store().load(fingerprint)[0]
+
+
+@st.cache_resource(max_entries=4)
+def review_table(fingerprint, _df, _results):
+    """Analysis Details table of one analysis, built once and shared."""
+    return ReviewTable(_df, analyzer.result_columns(_df, _results),
+                       analyzer.SENTIMENT_LABELS, analyzer.ISSUE_RULES,
+                       SPAM_MIN_COPIES)
 
 
 @st.cache_data(show_spinner=False)
-def analyze(df, text_col):
-    """Run the full analysis pipeline (cached on the data + chosen column)."""
-    results = analyzer.analyze_text(df, text_col)
+def fingerprint_of(df, text_col, rating_col):
+    return dataset_fingerprint(df, text_col, rating_col, analyzer.backend)
+
+
+def background_job(df, text_col, rating_col, col_info, approximate=False):
+    """This session's background analysis of ``df``, started if it's needed.
+
+    Only large datasets that can't be reopened from the store (or updated
+    incrementally) get a job; any job left over from another dataset (or
+    mode) is cancelled. With ``approximate`` rows are scored in a stratified
+    random order (by product and rating) so partial figures are estimates.
+    Returns None when ``df`` should be analysed in the foreground.
+    """
+    key = (fingerprint_of(df, text_col, rating_col), approximate)
+    job = st.session_state.get("analysis_job")
+    if job is not None and job.key != key:
+        job.cancel()  # a new upload replaces the old job
+        job = st.session_state["analysis_job"] = None
+    if job is None and len(df) >= BACKGROUND_ROWS:
+        store = results_store()
+        incremental = (text_col, rating_col, col_info["id_column"])
+        if ((store is None or key[0] not in store)
+                and incremental not in previous_results()):
+            product_col = col_info["product_column"]
+            strata = (strata_codes(len(df), df.get(product_col),
+                                   df.get(rating_col)) if approximate else None)
+            job = st.session_state["analysis_job"] = AnalysisJob(
+                analyzer, df, text_col, rating_col, product_col,
+                col_info["date_column"], BACKGROUND_CHUNKSIZE, key=key,
+                strata=strata).start()
+    if job is not None and job.error is not None:
+        return None  # failed: fall back to the foreground pipeline
+    return job
+
+
+@st.fragment(run_every=1.0)
+def live_analysis(job):
+    """Progress of a background analysis plus figures for the rows done so far."""
+    if job.done:
+        st.rerun()  # results are ready: render the full app
+    p = job.progress()
+    eta = f" · about {p.eta:.0f}s left" if p.eta is not None else ""
+    st.progress(p.rows / (p.total or 1),
+                text=f"Analysing reviews… {p.rows:,} of {p.total:,} · "
+                     f"{p.rate:,.0f} rows/s{eta}")
+    if job.cube is None:
+        st.caption("Figures appear as soon as the first chunk is scored.")
+        return
+    if job.strata is not None:
+        live_estimates(job)
+        return
+    totals = job.cube.totals()
+    st.caption(f"Partial results from the first {totals['total_reviews']:,} "
+               "reviews — the full dashboard opens when analysis finishes.")
+    metrics = [("Analysed", totals["total_reviews"]),
+               ("Positive", totals["positive_count"]),
+               ("Negative", totals["negative_count"]),
+               ("With issues", totals["with_issues"]),
+               ("Urgent", totals["urgent"])]
+    for col, (label, value) in zip(st.columns(len(metrics)), metrics):
+        col.metric(label, f"{value:,}")
+    col1, col2 = st.columns(2)
+    issue_summary = job.cube.issue_counts()
+    if issue_summary:
+        col1.plotly_chart(issue_bar(issue_summary), use_container_width=True)
+    col2.plotly_chart(sentiment_donut(job.cube.sentiment_counts()),
+                      use_container_width=True)
+
+
+def live_estimates(job):
+    """KPI estimates with 95% intervals from a stratified job's sample."""
+    totals, issues = job.estimates()
+    p = job.progress()
+    st.caption(f"**Estimates** from a stratified sample of {p.rows:,} of "
+               f"{p.total:,} reviews (by product and rating), with 95% "
+               "confidence intervals. They tighten as more reviews are scored "
+               "and become exact when analysis finishes.")
+
+    def share(e):
+        pct = e.value / p.total * 100
+        return f"{pct:.1f}% ± {(e.high - e.low) / 2 / p.total * 100:.1f}"
+
+    def count(e):
+        return f"{e.value:,.0f} ± {(e.high - e.low) / 2:,.0f}"
+
+    metrics = [("Positive", share(totals["positive_count"])),
+               ("Negative", share(totals["negative_count"])),
+               ("With issues", share(totals["with_issues"])),
+               ("Urgent", count(totals["urgent"])),
+               ("Need a reply", count(totals["needs_reply"]))]
+    for col, (label, value) in zip(st.columns(len(metrics)), metrics):
+        col.metric(label, value)
+    col1, col2 = st.columns(2)
+    if issues:
+        col1.plotly_chart(
+            issue_bar({i: round(e.value) for i, e in issues.items()},
+                      {i: (e.low, e.high) for i, e in issues.items()}),
+            use_container_width=True)
+    col2.plotly_chart(sentiment_donut(
+        {label: round(totals[f"{label.lower()}_count"].value)
+         for label in analyzer.SENTIMENT_LABELS}), use_container_width=True)
+
+
+@st.cache_resource
+def previous_results():
+    """Last per-row results per (text, rating, id) columns, shared by sessions."""
+    return {}
+
+
+@st.cache_data(show_spinner=False)
+def analyze(df, text_col, rating_col=None, id_col=None, name=None,
+            product_col=None, date_col=None, _job=None):
+    """Run the full analysis pipeline (cached on the data + chosen columns).
+
+    A dataset analysed before (same data, columns and engine) is reopened from
+    the results store. Otherwise the per-row results of a finished background
+    ``_job`` are used, or, with an ID column, rows unchanged since the last
+    analysis of a file with the same columns are reused instead of re-scored.
+    ``timings`` in the results covers every stage of the run. The
+    dashboard's figures come from the returned `AnalysisCube`, sliced by
+    ``product_col`` and ``date_col``.
+    """
+    with analyzer.profile() as recorder:
+        outputs = _run_pipeline(df, text_col, rating_col, id_col, name, recorder,
+                                _job)
+        outputs += (analyzer.build_cube(df, outputs[0], product_col, date_col),)
+    outputs[0]["timings"] = (_job.timings if _job else []) + recorder.records
+    return outputs
+
+
+def _run_pipeline(df, text_col, rating_col, id_col, name, recorder, job=None):
+    store = results_store()
+    fingerprint = dataset_fingerprint(df, text_col, rating_col, analyzer.backend)
+    results = None
+    if store is not None and fingerprint in store:
+        try:
+            with profiling.stage("results_store", len(df), hooks=[recorder]):
+                columns = store.load_columns(fingerprint)
+            results = analyzer.results_from_columns(df, text_col, columns)
+        except Exception:  # unreadable entry -> just re-score
+            results = None
+    runs = previous_results()
+    key = (text_col, rating_col, id_col)
+    if results is None and job is not None:
+        results = analyzer.results_from_columns(df, text_col, job.columns)
+    elif results is None and id_col:
+        results = analyzer.analyze_incremental(df, text_col, runs.get(key),
+                                               id_col, rating_col)
+    elif results is None:
+        results = analyzer.analyze_text(df, text_col, rating_col)
+    if id_col and "row_keys" not in results:
+        # Reopened or scored in the background: the next upload of this
+        # file (with a few rows changed) is still updated incrementally.
+        analyzer.track_rows(df, results, text_col, id_col, rating_col)
+    if id_col:
+        runs[key] = results
+    results["fingerprint"] = fingerprint
+    if store is not None and fingerprint not in store:
+        try:
+            store.save(fingerprint, df, analyzer.result_columns(df, results),
+                       {"name": name or "Dataset", "text_column": text_col,
+                        "backend": analyzer.backend})
+        except Exception:  # persistence is best-effort (e.g. read-only disk)
+            pass
     word_freq = analyzer.get_word_frequency(df, text_col)
     insights = analyzer.get_actionable_insights(df, results, text_col)
     priority = analyzer.get_priority_reviews(df, results, text_col, top_n=25)
@@ -397,13 +625,33 @@ def analyze(df, text_col):
 # --- Sidebar: data source ----------------------------------------------------
 with st.sidebar:
     st.header("Data")
-    source = st.radio("Data source", ["Use sample data", "Upload CSV"])
-
-    df = None
-    if source == "Upload CSV":
+    store = results_store()
+    recent = (store.recent(only=None if SHARED_HISTORY
+                           else st.session_state.get("my_analyses", []))
+              if store is not None else [])
+    sources = ["Use sample data", "Upload CSV"] + (["Recent analyses"] if recent else [])
+    source = st.radio("Data source", sources)
+
+    df, dataset_name, stored_text_col = None, "Sample data", None
+    load_timings = profiling.StageRecorder()
+    if source == "Recent analyses":
+        pick = st.selectbox(
+            "Past analysis", range(len(recent)),
+            format_func=lambda i: (f"{recent[i].get('name', 'Dataset')} · "
+                                   f"{recent[i]['rows']:,} rows · "
+                                   f"{recent[i]['created']}"))
+        entry = recent[pick]
+        df = load_stored_frame(entry["fingerprint"])
+        dataset_name = entry.get("name", "Dataset")
+        stored_text_col = entry.get("text_column")
+        st.success(f"Reopened {len(df):,} analysed reviews")
+    elif source == "Upload CSV":
         uploaded = st.file_uploader("Reviews CSV", type=["csv"])
         if uploaded is not None:
-            df, warns = read_csv_robust(uploaded)
+            dataset_name = uploaded.name
+            with profiling.stage("csv_parse", hooks=[load_timings]) as parse:
+                df, warns = read_csv_robust(uploaded, prune_columns=False)
+                parse["rows"] = 0 if df is None else len(df)
             if df is None:
                 for w in warns:
                     st.error(w)
@@ -423,7 +671,7 @@ with st.sidebar:
         st.divider()
         st.markdown("### Columns")
         options = col_info["text_columns"] or list(df.columns)
-        default = col_info["text_column"] or options[0]
+        default = stored_text_col or col_info["text_column"] or options[0]
         text_col = st.selectbox(
             "Review text column", options,
             index=options.index(default) if default in options else 0,
@@ -436,6 +684,12 @@ with st.sidebar:
         if rating_col and pd.api.types.is_numeric_dtype(df[rating_col]):
             st.metric("Average rating", f"{df[rating_col].mean():.2f} / 5")
         st.caption(f"Sentiment engine: {analyzer.backend.upper()}")
+        if len(df) >= BACKGROUND_ROWS:
+            st.toggle("Approximate first look", key="approximate",
+                      help="Score reviews in a stratified random order (by "
+                           "product and rating) and show each KPI as an "
+                           "estimate with a 95% confidence interval while "
+                           "the rest are scored.")
 
 
 # --- Hero --------------------------------------------------------------------
@@ -473,17 +727,37 @@ if df is None or not text_col:
     """, unsafe_allow_html=True)
     st.stop()
 
-# --- Analyse (cap very large files for speed) --------------------------------
-if len(df) > MAX_ROWS:
-    st.info(f"Large file — analysing a random sample of {MAX_ROWS:,} of "
-            f"{len(df):,} reviews to keep things fast.")
-    df = df.sample(MAX_ROWS, random_state=0).sort_index().reset_index(drop=True)
-
+# --- Analyse every row (no sampling, so every figure is exact) ---------------
+col_info = analyze_columns(df)
+rating_col = col_info["rating_column"]
+job = background_job(df, text_col, rating_col, col_info,
+                     st.session_state.get("approximate", False))
+if job is not None and not job.done:
+    live_analysis(job)
+    st.stop()
 with st.spinner("Analysing reviews…"):
-    analysis_results, word_freq, insights, priority_reviews = analyze(df, text_col)
+    analysis_results, word_freq, insights, priority_reviews, cube = analyze(
+        df, text_col, rating_col, col_info["id_column"], dataset_name,
+        col_info["product_column"], col_info["date_column"],
+        _job=job if job is not None and job.columns is not None else None)
+my_analyses = st.session_state.setdefault("my_analyses", [])
+if analysis_results["fingerprint"] not in my_analyses:
+    my_analyses.append(analysis_results["fingerprint"])
+if analysis_results.get("reused_rows"):
+    st.sidebar.caption(
+        f"Reused {analysis_results['reused_rows']:,} unchanged reviews · "
+        f"re-scored {analysis_results['recomputed_rows']:,}")
+stage_records = load_timings.records + analysis_results.get("timings", [])
+if stage_records:
+    with st.sidebar.expander(
+            f"Timing breakdown · {sum(r['seconds'] for r in stage_records):.2f}s"):
+        st.dataframe(timings_table(stage_records), hide_index=True,
+                     use_container_width=True)
+        st.caption("Analysis stages are cached — re-runs show the first run.")
 
 total = analysis_results["total_reviews"]
-rating_col = analyze_columns(df)["rating_column"]
+# Per-row results as compact arrays (sentiment codes, issue bitmasks, ...).
+result_cols = analyzer.result_columns(df, analysis_results)
 
 NAV = ["Welcome", "Dashboard", "Priority & Replies", "Insights & Actions",
        "Analysis Details", "Export"]
@@ -536,20 +810,49 @@ if nav == "Welcome":
 if nav == "Dashboard":
     st.subheader("Business overview")
 
-    urgent_count = len(analysis_results["urgent_indices"])
+    # Every figure below is a sum over cube cells, so slicing is instant.
+    view = cube
+    weeks = cube.week_range()
+    if cube.products or weeks:
+        p_col, d_col = st.columns([3, 2])
+        picked = (p_col.multiselect("Products", cube.products,
+                                    placeholder="All products",
+                                    key="dash_products")
+                  if cube.products else None)
+        span = None
+        if weeks:
+            first_day = (weeks[0] - pd.Timedelta(days=6)).date()
+            span = d_col.date_input("Dates", (first_day, weeks[1].date()),
+                                    min_value=first_day,
+                                    max_value=weeks[1].date(),
+                                    key="dash_dates")
+        start, end = (span if isinstance(span, tuple) and len(span) == 2
+                      else (None, None))
+        view = cube.slice(picked, start, end)
+    totals = view.totals()
+    shown = totals["total_reviews"] or 1  # avoid 0/0 on an empty slice
+
+    urgent_count = totals["urgent"]
     if urgent_count:
         st.error(f"**URGENT** — {urgent_count} reviews need a response today.")
-
-    pos_pct = analysis_results["positive_count"] / total * 100
-    neg_pct = analysis_results["negative_count"] / total * 100
-    issues_ct = len([i for i in analysis_results["issues_found"] if i])
-    resp_needed = len([s for s in analysis_results["priority_scores"] if s > 50])
+    if "duplicates" in result_cols:
+        copies = result_cols["duplicates"][result_cols["duplicates"] >= SPAM_MIN_COPIES]
+        if len(copies):
+            st.warning(f"**Possible spam** — {len(copies):,} reviews repeat the "
+                       f"same text (largest group: {int(copies.max())} copies).")
+            st.button("Show repeated reviews", key="spam_btn",
+                      on_click=open_detail, args=("Repeated",))
+
+    pos_pct = totals["positive_count"] / shown * 100
+    neg_pct = totals["negative_count"] / shown * 100
+    issues_ct = totals["with_issues"]
+    resp_needed = totals["needs_reply"]
 
     st.caption("Click a tile to open its reviews in Analysis Details.")
     tiles = [
-        ("positive", "Positive", analysis_results["positive_count"], f"{pos_pct:.0f}%"),
-        ("negative", "Negative", analysis_results["negative_count"], f"{neg_pct:.0f}%"),
-        ("issues", "With issues", issues_ct, f"{issues_ct / total * 100:.0f}%"),
+        ("positive", "Positive", totals["positive_count"], f"{pos_pct:.0f}%"),
+        ("negative", "Negative", totals["negative_count"], f"{neg_pct:.0f}%"),
+        ("issues", "With issues", issues_ct, f"{issues_ct / shown * 100:.0f}%"),
         ("urgent", "Urgent", urgent_count, f"{resp_needed} to reply"),
     ]
     for col, (slug, label, value, sub) in zip(st.columns(4), tiles):
@@ -560,18 +863,11 @@ if nav == "Dashboard":
 
     col1, col2 = st.columns(2)
     with col1:
-        if analysis_results["issue_summary"]:
-            issue_df = pd.DataFrame(analysis_results["issue_summary"].items(),
-                                    columns=["Issue Type", "Count"])
-            fig = px.bar(issue_df, x="Count", y="Issue Type", orientation="h",
-                         title="Issues requiring attention", color="Count",
-                         color_continuous_scale=["#FCA5A5", "#DC2626"])
-            fig.update_layout(yaxis={"categoryorder": "total ascending"},
-                              coloraxis_showscale=False)
-            fig.update_traces(marker_line_width=0)
-            ev = st.plotly_chart(style_fig(fig, show_legend=False),
-                            use_container_width=True, on_select="rerun",
-                            key="bar_sel")
+        issue_summary = view.issue_counts()
+        if issue_summary:
+            ev = st.plotly_chart(issue_bar(issue_summary),
+                                 use_container_width=True, on_select="rerun",
+                                 key="bar_sel")
             st.caption("Click a bar to open its reviews.")
             _bpts = (ev or {}).get("selection", {}).get("points", [])
             if _bpts:
@@ -583,21 +879,11 @@ if nav == "Dashboard":
         else:
             st.info("No specific issues detected.")
     with col2:
-        sentiment_df = pd.DataFrame({
-            "Sentiment": ["Positive", "Negative", "Neutral"],
-            "Count": [analysis_results["positive_count"],
-                      analysis_results["negative_count"],
-                      analysis_results["neutral_count"]],
-        })
-        fig = px.pie(sentiment_df, values="Count", names="Sentiment", hole=0.55,
-                     title="Customer sentiment", color="Sentiment",
-                     color_discrete_map=SENTIMENT_COLORS)
-        fig.update_traces(marker=dict(line=dict(color="#FFFFFF", width=3)),
-                          textfont=dict(family="Inter", color="#0F172A", size=13))
-        st.plotly_chart(style_fig(fig), use_container_width=True)
-        chips = [("Positive", analysis_results["positive_count"]),
-                 ("Negative", analysis_results["negative_count"]),
-                 ("Neutral", analysis_results["neutral_count"])]
+        st.plotly_chart(sentiment_donut(view.sentiment_counts()),
+                        use_container_width=True)
+        chips = [("Positive", totals["positive_count"]),
+                 ("Negative", totals["negative_count"]),
+                 ("Neutral", totals["neutral_count"])]
         for _c, (_lbl, _n) in zip(st.columns(3), chips):
             _c.button(f"{_lbl} · {_n}", key=f"schip_{_lbl}", on_click=open_detail,
                       args=(_lbl,), use_container_width=True)
@@ -607,30 +893,34 @@ if nav == "Priority & Replies":
     st.subheader("Reviews to action first")
     st.caption("Ranked by priority score. Each has an editable, suggested reply.")
 
-    if priority_reviews.empty:
+    table = review_table(analysis_results["fingerprint"], df, analysis_results)
+    if not table.count("Needs action"):  # priority 0: nothing to action
         st.info("No priority reviews found.")
     else:
         f1, f2 = st.columns([3, 1])
         with f1:
             issue_opts = ["All"] + list(analysis_results["issue_summary"].keys())
             issue_filter = st.multiselect("Filter by issue", issue_opts,
-                                          default=["All"])
+                                          default=["All"], on_change=_set,
+                                          args=("replies_page", 1))
         with f2:
-            urgent_only = st.checkbox("Urgent only")
+            urgent_only = st.checkbox("Urgent only", on_change=_set,
+                                      args=("replies_page", 1))
 
-        view = priority_reviews.copy()
+        where = table.masks["Needs action"]
         if urgent_only:
-            view = view[view.index.isin(analysis_results["urgent_indices"])]
+            where = where & table.masks["Urgent"]
         if "All" not in issue_filter and issue_filter:
-            view = view[view["issues"].apply(
-                lambda x: any(i in x for i in issue_filter))]
+            where = where & table.any_of(issue_filter)
 
-        if view.empty:
+        number, size = page_picker(int(where.sum()), "replies", REPLY_PAGE_SIZES)
+        view, matching = table.page(where, number, size)
+        if not matching:
             st.info("No reviews match the selected filters.")
-        for idx, row in view.head(20).iterrows():
-            score = int(row["priority_score"])
+        for idx, row in view.iterrows():
+            score = int(row["Priority"])
             text = str(row[text_col])
-            title = f"{score}/100 · {row['sentiment']} · {text[:70]}…"
+            title = f"{score}/100 · {row['Sentiment']} · {text[:70]}…"
             with st.expander(title):
                 meta = []
                 if "product" in row:
@@ -640,13 +930,13 @@ if nav == "Priority & Replies":
                         meta.append("**Rating:** " + "⭐" * int(row[rating_col]))
                     except (ValueError, TypeError):
                         pass
-                meta.append(f"**Issues:** {row['issues']}")
+                meta.append(f"**Issues:** {row['Issues']}")
                 st.markdown("  ·  ".join(meta))
                 st.markdown(f"> {text}")
 
                 draft = analyzer.draft_response(
-                    sentiment=row["sentiment"],
-                    issues=[i.strip() for i in str(row["issues"]).split(",")],
+                    sentiment=row["Sentiment"],
+                    issues=[i.strip() for i in str(row["Issues"]).split(",")],
                     rating=row.get(rating_col) if rating_col else None,
                     product=row.get("product"))
                 st.markdown('<div class="draft-label">Suggested reply '
@@ -686,6 +976,7 @@ if nav == "Insights & Actions":
 
 # --- Analysis details --------------------------------------------------------
 if nav == "Analysis Details":
+    import plotly.express as px
     st.subheader("Detailed analysis")
     if word_freq:
         st.markdown("#### Most mentioned words")
@@ -700,52 +991,45 @@ if nav == "Analysis Details":
         st.plotly_chart(style_fig(fig, show_legend=False),
                         use_container_width=True)
 
-    date_col = next((c for c in df.columns if "date" in c.lower()), None)
-    if date_col:
-        try:
-            trend = df.copy()
-            trend["sentiment"] = analysis_results["sentiments"]
-            trend[date_col] = pd.to_datetime(trend[date_col], errors="coerce")
-            trend = trend.dropna(subset=[date_col])
-            daily = (trend.groupby([pd.Grouper(key=date_col, freq="W"), "sentiment"])
-                     .size().reset_index(name="count"))
-            if not daily.empty:
-                st.markdown("#### Sentiment trend over time")
-                fig = px.line(daily, x=date_col, y="count", color="sentiment",
-                              color_discrete_map=SENTIMENT_COLORS, markers=True)
-                fig.update_traces(line=dict(width=2.5))
-                st.plotly_chart(style_fig(fig), use_container_width=True)
-        except Exception:
-            pass
+    weekly = cube.weekly()
+    if not weekly.empty:
+        st.markdown("#### Sentiment trend over time")
+        fig = px.line(weekly, x="week", y="count", color="sentiment",
+                      color_discrete_map=SENTIMENT_COLORS, markers=True)
+        fig.update_traces(line=dict(width=2.5))
+        st.plotly_chart(style_fig(fig), use_container_width=True)
 
     st.markdown('<div id="reviews-table"></div>', unsafe_allow_html=True)
     st.markdown("#### All reviews with analysis")
+    table = review_table(analysis_results["fingerprint"], df, analysis_results)
     detail_opts = ["All", "Positive", "Negative", "Neutral", "With issues", "Urgent"]
+    if "Repeated" in table.masks:
+        detail_opts.append("Repeated")
     st.session_state.setdefault("detail_filter", "All")
     for _c, _name in zip(st.columns(len(detail_opts)), detail_opts):
-        _c.button(_name, key=f"dfbtn_{_name}", on_click=_set,
-                  args=("detail_filter", _name), use_container_width=True,
+        _c.button(_name, key=f"dfbtn_{_name}", on_click=_show_filter,
+                  args=(_name,), use_container_width=True,
                   type="primary" if st.session_state.detail_filter == _name else "secondary")
     flt = st.session_state.detail_filter
 
-    display_df = df.copy()
-    display_df["Sentiment"] = analysis_results["sentiments"]
-    display_df["Priority"] = analysis_results["priority_scores"]
-    display_df["Issues"] = [", ".join(i) if i else "None"
-                            for i in analysis_results["issues_found"]]
-    if flt in ("Positive", "Negative", "Neutral"):
-        display_df = display_df[display_df["Sentiment"] == flt]
-    elif flt == "With issues":
-        display_df = display_df[display_df["Issues"] != "None"]
-    elif flt == "Urgent":
-        display_df = display_df[display_df.index.isin(analysis_results["urgent_indices"])]
-    elif flt in analyzer.ISSUE_RULES:      # a specific issue category (bar click)
-        display_df = display_df[[flt in i for i in analysis_results["issues_found"]]]
+    # Issue categories (bar clicks) have masks too; anything else shows all.
+    where = flt if flt in table.masks else "All"
+    sort_opts = ["Priority"] + [c for c in (rating_col, col_info["date_column"])
+                                if c and c in df.columns]
+    s_col, a_col = st.columns([3, 1])
+    sort_by = s_col.selectbox("Sort by", sort_opts, key="detail_sort",
+                              on_change=_set, args=("detail_page", 1))
+    ascending = a_col.toggle("Ascending", key="detail_ascending",
+                             on_change=_set, args=("detail_page", 1))
+    number, size = page_picker(table.count(where), "detail", PAGE_SIZES)
+    page_df, matching = table.page(where, number, size, sort_by, ascending)
 
     suffix = "" if flt == "All" else f" · {flt}"
-    st.caption(f"Showing {len(display_df):,} of {total:,} reviews{suffix}")
-    st.dataframe(display_df.sort_values("Priority", ascending=False),
-                 use_container_width=True, height=420)
+    first = (number - 1) * size + 1 if matching else 0
+    last = first + len(page_df) - 1 if matching else 0
+    st.caption(f"Showing {first:,}–{last:,} of {matching:,} matching · "
+               f"{total:,} reviews{suffix}")
+    st.dataframe(page_df, use_container_width=True)
 
     # When arriving from a KPI tile, scroll straight to the table.
     if st.session_state.pop("scroll_to_table", False):
@@ -757,43 +1041,42 @@ if nav == "Analysis Details":
 # --- Export ------------------------------------------------------------------
 if nav == "Export":
     st.subheader("Export results")
-    export_df = analyzer.export_analysis(df, analysis_results)
+    fmt = st.radio("Format", list(EXPORT_FORMATS), horizontal=True,
+                   format_func=lambda f: EXPORT_FORMATS[f].label,
+                   key="export_format")
+    spec = EXPORT_FORMATS[fmt]
+    exports = export_cache()
+    fingerprint = analysis_results["fingerprint"]
     stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
-    c1, c2, c3 = st.columns(3)
-    c1.download_button("Full analysis (CSV)", export_df.to_csv(index=False),
-                       f"review_analysis_{stamp}.csv", "text/csv",
-                       use_container_width=True)
+    # Reports are only written when asked for, chunk by chunk, and reused by
+    # every later request for the same analysis and format.
+    reports = {"review_analysis": ("Full analysis",
+                                   lambda: analyzer.iter_export(df, analysis_results))}
     if not priority_reviews.empty:
-        c2.download_button("Priority reviews (CSV)",
-                           priority_reviews.to_csv(index=False),
-                           f"priority_reviews_{stamp}.csv", "text/csv",
-                           use_container_width=True)
-
-    pos_pct = analysis_results["positive_count"] / total * 100
-    neg_pct = analysis_results["negative_count"] / total * 100
-    top_issues = "\n".join(f"- {k}: {v} occurrences"
-                           for k, v in list(analysis_results["issue_summary"].items())[:5])
-    recs = "\n".join(f"- {r}" for r in (insights["recommendations"] if insights else []))
-    summary = f"""SMARTREVIEW-AI BUSINESS REPORT
-Generated: {datetime.now():%Y-%m-%d %H:%M}
-
-EXECUTIVE SUMMARY
-Total reviews analysed: {total}
-Positive: {analysis_results['positive_count']} ({pos_pct:.1f}%)
-Negative: {analysis_results['negative_count']} ({neg_pct:.1f}%)
-Urgent reviews: {len(analysis_results['urgent_indices'])}
-
-TOP ISSUES
-{top_issues or '- None detected'}
-
-RECOMMENDATIONS
-{recs or '- None'}
-"""
-    c3.download_button("Executive summary (TXT)", summary,
+        reports["priority_reviews"] = ("Priority reviews",
+                                       lambda: [priority_reviews])
+    reports["reply_drafts"] = ("Reply drafts", lambda: [analyzer.reply_drafts(
+        df, analysis_results, col_info["product_column"])])
+    *columns, last = st.columns(4)
+    for col, (report, (title, chunks)) in zip(columns, reports.items()):
+        path = exports.get(fingerprint, report, fmt)
+        if path is None and col.button(f"Prepare {title.lower()} ({spec.label})",
+                                       key=f"prepare_{report}",
+                                       use_container_width=True):
+            with st.spinner(f"Writing {title.lower()}…"):
+                path = exports.build(fingerprint, report, fmt, chunks())
+        if path is not None:
+            with open(path, "rb") as f:
+                col.download_button(f"{title} ({spec.label})", f,
+                                    f"{report}_{stamp}{spec.extension}",
+                                    spec.mime, key=f"download_{report}",
+                                    use_container_width=True)
+
+    summary = analyzer.executive_summary(analysis_results, insights)
+    last.download_button("Executive summary (TXT)", summary,
                        f"executive_summary_{stamp}.txt", "text/plain",
                        use_container_width=True)
-    st.success("Reports ready to download.")
 
 st.divider()
 st.caption("SmartReview-AI · Business Intelligence Edition · Built with Streamlit "
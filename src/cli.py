@@ -0,0 +1,160 @@
+"""Headless batch analysis: CSV files in, analysed rows and a report out.
+
+Runs the same `ReviewAnalyzer` as the dashboard without Streamlit, reading
+each input in chunks so memory stays flat on large backfills::
+
+    python src/cli.py reviews.csv more_reviews.csv -o analysed.parquet \
+        --summary report.txt --workers 4 --cache-dir .cache
+
+The output format follows the file extension (.csv, .csv.gz, .parquet, .jsonl)
+unless ``--format`` is given. Throughput is reported on stderr when the run ends.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import pandas as pd
+
+from analyzer import ReviewAnalyzer
+from dedupe import MODES as DEDUPE_MODES
+from exports import ChunkWriter
+from ingest import analyze_columns
+from streaming import DEFAULT_CHUNKSIZE, AnalysisAggregate, iter_csv_chunks
+
+FORMATS = {".csv": "csv", ".csv.gz": "csv.gz", ".parquet": "parquet",
+           ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+
+def output_format(path, fmt=None):
+    if fmt:
+        return fmt
+    name = path.lower()
+    for ext in sorted(FORMATS, key=len, reverse=True):
+        if name.endswith(ext):
+            return FORMATS[ext]
+    raise ValueError(f"can't tell the output format of {path!r}; use --format")
+
+
+def run(args, log=sys.stderr):
+    """Analyse ``args.inputs`` -> (analyzer, AnalysisAggregate, seconds)."""
+    cache_path = None
+    if args.cache_dir:
+        os.makedirs(args.cache_dir, exist_ok=True)
+        cache_path = os.path.join(args.cache_dir, "scores.sqlite")
+    analyzer = ReviewAnalyzer(cache_path=cache_path, workers=args.workers,
+                              dedupe=args.dedupe)
+    writer = (ChunkWriter(args.output, output_format(args.output, args.format))
+              if args.output else None)
+    drafts = (ChunkWriter(args.drafts, output_format(args.drafts))
+              if args.drafts else None)
+    total = AnalysisAggregate(top_n=args.top_n, backend=analyzer.backend,
+                              max_words=args.max_words)
+    start = time.perf_counter()
+    try:
+        for path in args.inputs:
+            chunks = iter_csv_chunks(path, chunksize=args.chunksize,
+                                     encoding=args.encoding)
+            part = AnalysisAggregate(top_n=args.top_n, backend=analyzer.backend,
+                                     max_words=args.max_words)
+            text_col = rating_col = id_col = product_col = None
+            for chunk in chunks:
+                if text_col is None:
+                    info = analyze_columns(chunk)
+                    text_col = args.text_column or info["text_column"]
+                    rating_col = args.rating_column or info["rating_column"]
+                    id_col = args.id_column or info["id_column"]
+                    product_col = info["product_column"]
+                    if text_col not in chunk.columns:
+                        raise ValueError(f"{path}: no review-text column found; "
+                                         "use --text-column")
+                results = analyzer.analyze_text(chunk, text_col, rating_col)
+                part.update(chunk, results,
+                            analyzer.word_counts(chunk[text_col].fillna(""),
+                                                 args.max_words),
+                            text_col, id_col)
+                if writer is not None:
+                    out = analyzer.export_analysis(chunk, results)
+                    if len(args.inputs) > 1:
+                        out.insert(0, "source_file", os.path.basename(path))
+                    writer.write(out)
+                if drafts is not None:
+                    drafts.write(analyzer.reply_drafts(chunk, results,
+                                                       product_col))
+            print(f"{path}: {part.total:,} reviews", file=log)
+            total.merge(part)
+    finally:
+        for w in (writer, drafts):
+            if w is not None:
+                w.close()
+        analyzer.close()
+    return analyzer, total, time.perf_counter() - start
+
+
+def build_parser():
+    p = argparse.ArgumentParser(
+        prog="smartreview",
+        description="Analyse review CSVs without the web app.")
+    p.add_argument("inputs", nargs="+", help="review CSV file(s)")
+    p.add_argument("-o", "--output",
+                   help="analysed rows (.csv, .parquet or .jsonl)")
+    p.add_argument("--format", choices=sorted(set(FORMATS.values())),
+                   help="output format (default: from the extension)")
+    p.add_argument("--summary", help="write the executive summary here")
+    p.add_argument("--priority", help="write the top priority reviews (CSV)")
+    p.add_argument("--drafts",
+                   help="write a suggested reply for every negative or "
+                        "issue-tagged review (.csv or .jsonl)")
+    p.add_argument("--top-n", type=int, default=25,
+                   help="priority reviews to keep (default: 25)")
+    p.add_argument("--text-column", help="review text column (auto-detected)")
+    p.add_argument("--rating-column", help="star rating column (auto-detected)")
+    p.add_argument("--id-column", help="review ID column (auto-detected)")
+    p.add_argument("--workers", type=int, default=1,
+                   help="sentiment scoring processes (default: 1)")
+    p.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE,
+                   help=f"rows per chunk (default: {DEFAULT_CHUNKSIZE:,})")
+    p.add_argument("--cache-dir",
+                   help="keep a persistent sentiment-score cache here")
+    p.add_argument("--max-words", type=int,
+                   help="cap distinct words tracked for word frequency "
+                        "(approximate beyond it; default: exact)")
+    p.add_argument("--dedupe", choices=DEDUPE_MODES, default="exact",
+                   help="score one review per duplicate group, found within "
+                        "each chunk (default: exact)")
+    p.add_argument("--encoding", default="utf-8",
+                   help="input encoding (default: utf-8)")
+    p.add_argument("--json", action="store_true",
+                   help="print the summary figures as JSON on stdout")
+    return p
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        analyzer, agg, seconds = run(args)
+    except (OSError, ValueError, pd.errors.ParserError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+    results = agg.results()
+    insights = analyzer.get_actionable_insights(None, results, None)
+    if args.summary:
+        with open(args.summary, "w", encoding="utf-8") as f:
+            f.write(analyzer.executive_summary(results, insights))
+    if args.priority:
+        agg.priority_reviews().to_csv(args.priority, index=False)
+    if args.json:
+        results["word_freq"] = agg.word_frequency()
+        print(json.dumps(results, default=str, indent=2))
+
+    rate = agg.total / seconds if seconds else float("inf")
+    print(f"Analysed {agg.total:,} reviews in {seconds:.2f}s "
+          f"({rate:,.0f} rows/s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
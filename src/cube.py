@@ -0,0 +1,186 @@
+"""Pre-aggregated analysis results for slicing the dashboard.
+
+`AnalysisCube` rolls the per-row results up once into cells of
+(product x week x sentiment x issue mask), each holding a review count, the
+priority sum and urgent / reply-needed counts. Even a million reviews make at
+most a few thousand cells, so every dashboard figure (KPI tiles, the issue
+bar chart, the sentiment donut, the weekly trend) is a sum over a slice of
+cells, whichever products or dates are picked.
+
+The issue dimension is the whole bitmask rather than one issue per cell, so
+"reviews with any issue" stays exact and a per-issue count sums the cells with
+that bit set. Weeks end on Sunday, as with ``pd.Grouper(freq="W")``.
+"""
+
+import numpy as np
+import pandas as pd
+
+_KEYS = ["product", "week", "sentiment", "issues"]
+
+
+def week_ending(dates):
+    """Sunday ending each date's week, as datetime64[ns] (NaT if unparseable)."""
+    parsed = pd.to_datetime(pd.Series(dates), errors="coerce")
+    days = parsed.to_numpy(dtype="datetime64[ns]").astype("datetime64[D]")
+    valid = ~np.isnat(days)
+    n = days.astype(np.int64)
+    # 1970-01-01 was a Thursday: (n + 3) % 7 is Monday=0 ... Sunday=6.
+    sunday = np.where(valid, n + (6 - (n + 3) % 7), 0).astype("datetime64[D]")
+    return np.where(valid, sunday, np.datetime64("NaT")).astype("datetime64[ns]")
+
+
+class AnalysisCube:
+    """Review counts and priority sums by product, week, sentiment and issues.
+
+    ``cells`` has the key columns ``product`` (index into ``products``, -1
+    when unknown), ``week`` (NaT when undated), ``sentiment`` (index into
+    ``labels``) and ``issues`` (bitmask over ``issue_names``), and the
+    measures ``reviews``, ``priority_sum``, ``urgent``, ``needs_reply`` and
+    ``first_row`` (earliest row in the cell, to break ties in row order).
+    """
+
+    def __init__(self, cells, products, labels, issue_names):
+        self.cells = cells
+        self.products = list(products)
+        self.labels = tuple(labels)
+        self.issue_names = tuple(issue_names)
+
+    @classmethod
+    def build(cls, columns, labels, issue_names, products=None, dates=None,
+              reply_threshold=50, positions=None):
+        """Aggregate `ReviewAnalyzer.result_columns` output.
+
+        ``products`` and ``dates`` are optional per-row values aligned with
+        the columns; rows with priority above ``reply_threshold`` count as
+        needing a reply. ``positions`` are the rows' positions in the whole
+        dataset when the columns cover only part of it (see `merge`).
+        """
+        n = len(columns["sentiment"])
+        if products is not None:
+            codes, names = pd.factorize(pd.Series(products), sort=True)
+            names = [str(p) for p in names]
+        else:
+            codes, names = np.full(n, -1), []
+        priority = np.asarray(columns["priority"], dtype=np.int64)
+        rows = pd.DataFrame({
+            "product": codes,
+            "week": (week_ending(dates) if dates is not None
+                     else np.full(n, np.datetime64("NaT"), dtype="datetime64[ns]")),
+            "sentiment": np.asarray(columns["sentiment"], dtype=np.int8),
+            "issues": np.asarray(columns["issues"], dtype=np.uint16),
+            "reviews": np.ones(n, dtype=np.int64),
+            "priority_sum": priority,
+            "urgent": np.asarray(columns["urgent"], dtype=np.int64),
+            "needs_reply": (priority > reply_threshold).astype(np.int64),
+            "first_row": np.arange(n) if positions is None else positions,
+        })
+        return cls(_rollup(rows), names, labels, issue_names)
+
+    def merge(self, other):
+        """Cube over the rows of both cubes (e.g. two chunks of one dataset).
+
+        Product codes are re-mapped onto the union of both product lists.
+        """
+        names = sorted(set(self.products) | set(other.products))
+        parts = []
+        for cube in (self, other):
+            remap = np.array([names.index(p) for p in cube.products] + [-1])
+            cells = cube.cells.copy()
+            cells["product"] = remap[cells["product"].to_numpy()]
+            parts.append(cells)
+        cells = pd.concat(parts, ignore_index=True)
+        return AnalysisCube(_rollup(cells), names, self.labels, self.issue_names)
+
+    # --- Slicing -------------------------------------------------------------
+    def slice(self, products=None, start=None, end=None):
+        """Cube of the cells for ``products`` (names) between two dates.
+
+        Dates apply per week: a week is kept when its Sunday falls within
+        [start, end + 6 days], i.e. it overlaps the range. Undated reviews are
+        dropped once the range leaves out some dated week; a range covering
+        every week (the dashboard's default) keeps them.
+        """
+        keep = np.ones(len(self.cells), dtype=bool)
+        if products:
+            wanted = [self.products.index(p) for p in products if p in self.products]
+            keep &= self.cells["product"].isin(wanted).to_numpy()
+        week = self.cells["week"]
+        first_last = self.week_range()
+        start = None if start is None else pd.Timestamp(start)
+        end = None if end is None else pd.Timestamp(end) + pd.Timedelta(days=6)
+        if first_last and ((start is None or start <= first_last[0])
+                           and (end is None or end >= first_last[1])):
+            start = end = None  # nothing dated is left out
+        if start is not None:
+            keep &= (week >= start).to_numpy()
+        if end is not None:
+            keep &= (week <= end).to_numpy()
+        return AnalysisCube(self.cells[keep], self.products, self.labels,
+                            self.issue_names)
+
+    def week_range(self):
+        """(first, last) week-ending dates present, or None if undated."""
+        weeks = self.cells["week"].dropna()
+        return (weeks.min(), weeks.max()) if len(weeks) else None
+
+    # --- Figures -------------------------------------------------------------
+    def totals(self):
+        """Headline counts: reviews, per sentiment, with issues, urgent, ..."""
+        cells = self.cells
+        reviews = int(cells["reviews"].sum())
+        by_sentiment = np.bincount(cells["sentiment"], weights=cells["reviews"],
+                                   minlength=len(self.labels))
+        out = {"total_reviews": reviews,
+               "with_issues": int(cells.loc[cells["issues"] != 0, "reviews"].sum()),
+               "urgent": int(cells["urgent"].sum()),
+               "needs_reply": int(cells["needs_reply"].sum()),
+               "avg_priority": (float(cells["priority_sum"].sum() / reviews)
+                                if reviews else 0.0)}
+        for label, count in zip(self.labels, by_sentiment):
+            out[f"{label.lower()}_count"] = int(count)
+        return out
+
+    def sentiment_counts(self):
+        """Reviews per sentiment label, in label order."""
+        counts = np.bincount(self.cells["sentiment"], weights=self.cells["reviews"],
+                             minlength=len(self.labels))
+        return {label: int(c) for label, c in zip(self.labels, counts)}
+
+    def issue_counts(self):
+        """Reviews per issue, most common first (ties: earliest row first)."""
+        masks = self.cells["issues"].to_numpy()
+        reviews = self.cells["reviews"].to_numpy()
+        first = self.cells["first_row"].to_numpy()
+        found = []
+        for bit, name in enumerate(self.issue_names):
+            hit = (masks >> bit & 1).astype(bool)
+            if hit.any():
+                found.append((-int(reviews[hit].sum()), int(first[hit].min()),
+                              bit, name))
+        return {name: -neg for neg, _, _, name in sorted(found)}
+
+    def weekly(self):
+        """Reviews per (week, sentiment) as a DataFrame, dated weeks only."""
+        cells = self.cells.dropna(subset=["week"])
+        out = (cells.groupby(["week", "sentiment"], sort=True)["reviews"].sum()
+               .reset_index(name="count"))
+        out["sentiment"] = pd.Categorical.from_codes(out["sentiment"], self.labels)
+        return out
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __repr__(self):
+        return (f"AnalysisCube({len(self)} cells, "
+                f"{int(self.cells['reviews'].sum())} reviews)")
+
+
+def _rollup(rows):
+    """Sum the measures of ``rows`` per cell (the earliest first_row wins)."""
+    return (rows.groupby(_KEYS, dropna=False, sort=False)
+            .agg(reviews=("reviews", "sum"),
+                 priority_sum=("priority_sum", "sum"),
+                 urgent=("urgent", "sum"),
+                 needs_reply=("needs_reply", "sum"),
+                 first_row=("first_row", "min"))
+            .reset_index())
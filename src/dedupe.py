@@ -0,0 +1,141 @@
+"""Duplicate and near-duplicate review grouping.
+
+Review exports repeat themselves: the same text posted twice, case and
+whitespace variants, templated copy-paste and bot spam. `find_duplicates`
+groups rows so `ReviewAnalyzer` scores one representative per group and
+copies its results to the rest, and so cluster sizes can flag likely spam.
+
+Modes, from strictest to loosest:
+
+    exact       identical text (results are unchanged by the collapsing)
+    normalized  identical after case-folding and collapsing whitespace
+    near        normalized groups further merged when the MinHash estimate
+                of their word-bigram Jaccard similarity reaches ``threshold``
+                (candidates come from LSH banding, so no all-pairs pass)
+"""
+
+import numpy as np
+import pandas as pd
+
+MODES = ("exact", "normalized", "near")
+
+_PRIME = (1 << 61) - 1  # Mersenne prime for the universal hash family
+
+
+def normalize(text):
+    """Case-folded text with runs of whitespace collapsed to one space."""
+    return " ".join(str(text).casefold().split())
+
+
+class DuplicateGroups:
+    """Rows partitioned into duplicate groups.
+
+    ``labels[i]`` is the group of row ``i``; groups are numbered in order of
+    first appearance, so ``first[g]`` (the group's first row) is increasing
+    and serves as its representative.
+    """
+
+    def __init__(self, labels):
+        self.labels = np.asarray(labels, dtype=np.int64)
+        self.sizes = np.bincount(self.labels)
+        self.first = np.full(len(self.sizes), len(self.labels), dtype=np.int64)
+        np.minimum.at(self.first, self.labels, np.arange(len(self.labels)))
+
+    def __len__(self):
+        return len(self.sizes)
+
+    def row_sizes(self):
+        """Size of each row's group (1 = no duplicates)."""
+        return self.sizes[self.labels]
+
+    def duplicate_rows(self):
+        """Rows beyond the first of their group (work saved by collapsing)."""
+        return len(self.labels) - len(self.sizes)
+
+
+def find_duplicates(texts, mode="exact", threshold=0.8, num_perm=64, bands=16,
+                    seed=0):
+    """Group ``texts`` (a list of str) by duplicate ``mode`` -> DuplicateGroups."""
+    if mode not in MODES:
+        raise ValueError(f"unknown dedupe mode {mode!r}; expected one of {MODES}")
+    if mode == "exact":
+        return DuplicateGroups(pd.factorize(pd.Series(texts, dtype=object))[0])
+    normalized = [normalize(t) for t in texts]
+    labels, uniques = pd.factorize(pd.Series(normalized, dtype=object))
+    if mode == "near" and len(uniques) > 1:
+        merged = near_duplicate_labels(list(uniques), threshold, num_perm,
+                                       bands, seed)
+        labels = pd.factorize(merged[labels])[0]
+    return DuplicateGroups(labels)
+
+
+def _shingles(doc):
+    words = doc.split()
+    if len(words) < 2:
+        return words or [""]
+    return [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def minhash_signatures(docs, num_perm=64, seed=0):
+    """MinHash signatures (len(docs) x num_perm, uint64) over word bigrams."""
+    shingles = [_shingles(d) for d in docs]
+    counts = np.fromiter((len(s) for s in shingles), dtype=np.int64,
+                         count=len(docs))
+    ids = pd.factorize(pd.Series([s for doc in shingles for s in doc],
+                                 dtype=object))[0].astype(np.uint64)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, _PRIME, num_perm, dtype=np.uint64)
+    b = rng.integers(0, _PRIME, num_perm, dtype=np.uint64)
+    sig = np.empty((len(docs), num_perm), dtype=np.uint64)
+    x = (ids * np.uint64(0x9E3779B97F4A7C15)) >> np.uint64(4)  # spread the ids
+    for k in range(num_perm):
+        # (a*x + b) mod 2^64, folded below the prime: cheap and well mixed.
+        h = (a[k] * x + b[k]) % np.uint64(_PRIME)
+        sig[:, k] = np.minimum.reduceat(h, starts)
+    return sig
+
+
+def near_duplicate_labels(docs, threshold=0.8, num_perm=64, bands=16, seed=0):
+    """Cluster id per doc, merging docs whose estimated Jaccard >= threshold.
+
+    Docs sharing an LSH band bucket are compared with the bucket's first doc;
+    matches are merged transitively (union-find). Returns the smallest doc
+    index of each doc's cluster.
+    """
+    if num_perm % bands:
+        raise ValueError("num_perm must be a multiple of bands")
+    sig = minhash_signatures(docs, num_perm, seed)
+    rows = num_perm // bands
+    mix = np.random.default_rng(seed + 1).integers(
+        1, 1 << 63, rows, dtype=np.uint64) | np.uint64(1)
+    parent = list(range(len(docs)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for band in range(bands):
+        # One uint64 per band (a collision only costs an extra comparison).
+        keys = (sig[:, band * rows:(band + 1) * rows] * mix).sum(axis=1)
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+        heads = np.repeat(order[starts], np.diff(np.r_[starts, len(order)]))
+        pairs = np.flatnonzero(heads != order)
+        if not len(pairs):
+            continue
+        a, b = heads[pairs], order[pairs]
+        similar = (sig[a] == sig[b]).mean(axis=1) >= threshold
+        for i, j in zip(a[similar].tolist(), b[similar].tolist()):
+            ri, rj = find(i), find(j)
+            if ri != rj:
+                parent[max(ri, rj)] = min(ri, rj)
+    roots = np.array(parent)
+    while True:  # pointer jumping until every doc points at its root
+        nxt = roots[roots]
+        if np.array_equal(nxt, roots):
+            return roots
+        roots = nxt
@@ -0,0 +1,158 @@
+"""Compact per-row analysis results.
+
+`ReviewAnalyzer.analyze_text` used to return per-row results as Python lists
+(a label string, a list of issue names, an int priority per review), which
+dominated the memory of a results dict and the time to pickle it into
+Streamlit's cache. `EncodedResults` keeps them as NumPy columns instead:
+
+    sentiment  int8    index into the sentiment labels
+    score      float64 blended sentiment score
+    priority   uint8   0-100
+    issues     uint16  bit i set = i-th issue category
+    urgent     bool
+
+It is a mapping with the same keys as the old dict: the summary figures are
+stored as-is and the per-row keys (``sentiments``, ``issues_found``, ...) are
+decoded from the columns when read, so existing callers keep working while
+hot paths use `columns` directly.
+"""
+
+from collections.abc import MutableMapping
+
+import numpy as np
+
+
+def issue_counts(masks, issue_names):
+    """Reviews per issue for an array of issue bitmasks.
+
+    Issues come in first-seen order (row by row, and by bit within a row),
+    the order a row-by-row tally over the decoded issue lists would produce.
+    """
+    masks = np.asarray(masks)
+    found = []
+    for bit, name in enumerate(issue_names):
+        hits = np.flatnonzero(masks >> bit & 1)
+        if len(hits):
+            found.append((int(hits[0]), bit, name, len(hits)))
+    return {name: count for _, _, name, count in sorted(found)}
+
+
+def join_issues(masks, issue_names, empty="None"):
+    """"Issue A, Issue B" per bitmask (``empty`` for none), as an object array.
+
+    Each distinct mask is decoded once, so this stays fast on big columns.
+    """
+    unique, inverse = np.unique(np.asarray(masks), return_inverse=True)
+    names = np.array([", ".join(n for bit, n in enumerate(issue_names)
+                                if int(m) >> bit & 1) or empty
+                      for m in unique.tolist()], dtype=object)
+    return names[inverse.ravel()]
+
+
+def priority_rows(frame, columns, positions, labels, issue_names):
+    """Rows ``positions`` of ``frame`` with their priority_score, sentiment
+    and issues (the triage view), decoding only those rows' results."""
+    rows = frame.iloc[positions].copy()
+    rows["priority_score"] = np.asarray(columns["priority"])[positions].astype(int)
+    rows["sentiment"] = np.array(labels, dtype=object)[
+        np.asarray(columns["sentiment"])[positions]]
+    rows["issues"] = join_issues(np.asarray(columns["issues"])[positions],
+                                 issue_names)
+    return rows
+
+
+class EncodedResults(MutableMapping):
+    """`analyze_text` results with the per-row values held as NumPy columns."""
+
+    # Keys decoded from the columns on access (read-only).
+    ROW_KEYS = ("sentiments", "sentiment_scores", "issues_found",
+                "priority_scores", "urgent_indices", "urgent_flags")
+
+    def __init__(self, summary, columns, index, labels, issue_names):
+        self._summary = dict(summary)
+        self.columns = columns
+        self.index = index
+        self.labels = tuple(labels)
+        self.issue_names = tuple(issue_names)
+
+    # --- Decoding ------------------------------------------------------------
+    def decode_issues(self, mask):
+        """Issue names (category order) for one bitmask."""
+        return [name for bit, name in enumerate(self.issue_names)
+                if mask >> bit & 1]
+
+    def row(self, pos):
+        """Decoded results for the row at position ``pos``."""
+        return {"sentiment": self.labels[self.columns["sentiment"][pos]],
+                "score": float(self.columns["score"][pos]),
+                "issues": self.decode_issues(int(self.columns["issues"][pos])),
+                "priority": int(self.columns["priority"][pos]),
+                "urgent": bool(self.columns["urgent"][pos])}
+
+    def _decode(self, key):
+        cols = self.columns
+        if key == "sentiments":
+            return np.array(self.labels, dtype=object)[cols["sentiment"]].tolist()
+        if key == "sentiment_scores":
+            return cols["score"].tolist()
+        if key == "priority_scores":
+            return cols["priority"].tolist()
+        if key == "urgent_indices":
+            return self.index[cols["urgent"]].tolist()
+        if key == "urgent_flags":
+            return cols["urgent"].tolist()
+        # issues_found: decode each distinct mask once.
+        masks, inverse = np.unique(cols["issues"], return_inverse=True)
+        lists = [tuple(self.decode_issues(int(m))) for m in masks]
+        return [list(lists[i]) for i in inverse.ravel().tolist()]
+
+    # --- Mapping protocol ----------------------------------------------------
+    def __getitem__(self, key):
+        if key in self.ROW_KEYS:
+            return self._decode(key)
+        return self._summary[key]
+
+    def __setitem__(self, key, value):
+        if key in self.ROW_KEYS:
+            raise TypeError(f"{key!r} is derived from the result columns")
+        self._summary[key] = value
+
+    def __delitem__(self, key):
+        if key in self.ROW_KEYS:
+            raise TypeError(f"{key!r} is derived from the result columns")
+        del self._summary[key]
+
+    def __iter__(self):
+        yield from self._summary
+        yield from self.ROW_KEYS
+
+    def __len__(self):
+        return len(self._summary) + len(self.ROW_KEYS)
+
+    def __contains__(self, key):
+        return key in self.ROW_KEYS or key in self._summary
+
+    def __eq__(self, other):
+        if isinstance(other, EncodedResults):
+            return (self._summary.keys() == other._summary.keys()
+                    and all(_same(v, other._summary[k])
+                            for k, v in self._summary.items())
+                    and self.labels == other.labels
+                    and self.issue_names == other.issue_names
+                    and all(np.array_equal(v, other.columns[k])
+                            for k, v in self.columns.items())
+                    and np.array_equal(self.index[self.columns["urgent"]],
+                                       other.index[other.columns["urgent"]]))
+        return super().__eq__(other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return (f"EncodedResults({self._summary.get('total_reviews', 0)} rows, "
+                f"backend={self._summary.get('backend')!r})")
+
+
+def _same(a, b):
+    if isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+        return np.array_equal(a, b)
+    return a == b or (a != a and b != b)  # NaN averages of empty frames
@@ -0,0 +1,128 @@
+"""Stratified sampling and KPI estimates with confidence intervals.
+
+For a quick first look at a large file, `AnalysisJob` can score the rows in
+`stratified_order` instead of file order. Every prefix of that order is then
+a stratified random sample: each stratum (product x star rating) gets a few
+rows up front, however small it is, and after that rows arrive in proportion
+to stratum size. `estimate_kpis` turns the rows scored so far into estimated
+counts with confidence intervals, using the stratified estimator
+
+    total = sum_h N_h * mean_h
+    var   = sum_h N_h^2 * (1 - n_h / N_h) * s_h^2 / n_h
+
+(N_h rows in stratum h, n_h of them scored). The intervals shrink as more
+rows are scored and collapse to the exact counts once every row is in.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+Estimate = namedtuple("Estimate", "value low high")
+
+# Normal quantile for a two-sided 95% interval.
+Z_95 = 1.959964
+
+# More strata than this leaves too few sampled rows per stratum for its
+# variance (every stratum gets `stratified_order`'s first rows up front).
+MAX_STRATA = 200
+
+
+def strata_codes(n, *keys, max_strata=MAX_STRATA):
+    """Stratum id per row from aligned key columns (e.g. product, rating).
+
+    Numeric keys are rounded to whole numbers, so a 4.3 or 4.35 rating is a
+    4-star review. While the keys make more than ``max_strata`` strata the
+    last key is dropped (e.g. product and rating -> product only), down to a
+    single stratum. Missing values form their own stratum; with no keys every
+    row is in one.
+    """
+    columns = []
+    for key in keys:
+        if key is None:
+            continue
+        column = pd.Series(key).reset_index(drop=True)
+        if (pd.api.types.is_numeric_dtype(column)
+                and not pd.api.types.is_bool_dtype(column)):
+            column = column.round()
+        columns.append(column.astype(object))
+    while columns:
+        frame = pd.DataFrame(dict(enumerate(columns)))
+        codes = frame.groupby(list(frame.columns), dropna=False,
+                              sort=False).ngroup().to_numpy(dtype=np.int64)
+        if codes.max(initial=-1) < max_strata:
+            return codes
+        columns.pop()
+    return np.zeros(n, dtype=np.int64)
+
+
+def stratified_order(codes, seed=0, min_per_stratum=2):
+    """Row order whose every prefix is a stratified random sample.
+
+    Rows are shuffled within each stratum; the first ``min_per_stratum`` of
+    every stratum come first, then the rest are interleaved so a stratum of
+    N_h rows contributes about N_h / N of any prefix.
+    """
+    codes = np.asarray(codes, dtype=np.int64)
+    n = len(codes)
+    rng = np.random.default_rng(seed)
+    shuffled = rng.permutation(n)
+    # Rank of each row within its stratum, in shuffled order.
+    by_stratum = shuffled[np.argsort(codes[shuffled], kind="stable")]
+    sizes = np.bincount(codes)
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    rank = np.empty(n, dtype=np.int64)
+    rank[by_stratum] = np.arange(n) - np.repeat(starts, sizes)
+    # Systematic position within the stratum, jittered so strata interleave.
+    key = (rank + rng.random(n)) / sizes[codes]
+    key[rank < min_per_stratum] = -1.0 + rank[rank < min_per_stratum]
+    return np.lexsort((rng.random(n), key))
+
+
+def estimate_kpis(codes, positions, columns, labels, issue_names,
+                  reply_threshold=50, z=Z_95):
+    """Estimated dashboard counts from the rows scored so far.
+
+    ``codes`` are the strata of every row, ``positions`` the scored rows and
+    ``columns`` their `ReviewAnalyzer.result_columns` (aligned with
+    ``positions``). Returns ``(totals, issues)``: ``totals`` has the
+    `AnalysisCube.totals` count keys (``positive_count``, ...,
+    ``with_issues``, ``urgent``, ``needs_reply``) and ``issues`` one entry per
+    issue name, most common first; each value is an `Estimate` of the count.
+    """
+    codes = np.asarray(codes, dtype=np.int64)
+    positions = np.asarray(positions, dtype=np.int64)
+    sentiment = np.asarray(columns["sentiment"])
+    issues = np.asarray(columns["issues"]).astype(np.int64)
+    metrics = {f"{label.lower()}_count": sentiment == i
+               for i, label in enumerate(labels)}
+    metrics["with_issues"] = issues != 0
+    metrics["urgent"] = np.asarray(columns["urgent"], dtype=bool)
+    metrics["needs_reply"] = np.asarray(columns["priority"]) > reply_threshold
+    for bit, name in enumerate(issue_names):
+        metrics[name] = (issues >> bit & 1).astype(bool)
+
+    size = np.bincount(codes).astype(float)
+    sampled = codes[positions]
+    n = np.bincount(sampled, minlength=len(size)).astype(float)
+    seen = n > 0
+    out = {}
+    for name, hits in metrics.items():
+        y = np.bincount(sampled, weights=hits, minlength=len(size))
+        overall = hits.mean() if len(hits) else 0.5
+        mean = np.where(seen, y / np.maximum(n, 1), overall)
+        # Bernoulli sample variance; 0.25 (its maximum) when n_h < 2.
+        s2 = np.where(n >= 2, mean * (1 - mean) * n / np.maximum(n - 1, 1), 0.25)
+        var = size ** 2 * (1 - n / size) * s2 / np.maximum(n, 1)
+        value = float((size * mean).sum())
+        half = z * float(np.sqrt(var.sum()))
+        # The population count can't be below the hits already seen, nor
+        # above the rows not yet seen plus those hits.
+        count = float(hits.sum())
+        low = max(value - half, count)
+        high = min(value + half, len(codes) - (len(hits) - count))
+        out[name] = Estimate(value, low, high)
+    totals = {k: out.pop(k) for k in list(out) if k not in issue_names}
+    ranked = sorted(out.items(), key=lambda kv: -kv[1].value)
+    return totals, {k: v for k, v in ranked if v.value > 0}
@@ -0,0 +1,154 @@
+"""Chunked export files, written on request and cached per analysis.
+
+`ChunkWriter` appends DataFrame chunks to one CSV, gzip-compressed CSV,
+Parquet or JSONL file, so an export never has to exist as one big in-memory
+string. `ExportCache` keeps the finished files on disk, named by the analysis
+fingerprint, report and format: asking for the same export again (another
+session, a rerun, a reopened analysis) reuses the file instead of rebuilding.
+"""
+
+import gzip
+import os
+import threading
+from collections import namedtuple
+
+ExportFormat = namedtuple("ExportFormat", "label extension mime")
+
+# Formats offered for download, in display order.
+EXPORT_FORMATS = {
+    "csv": ExportFormat("CSV", ".csv", "text/csv"),
+    "csv.gz": ExportFormat("CSV (gzip)", ".csv.gz", "application/gzip"),
+    "parquet": ExportFormat("Parquet", ".parquet",
+                            "application/vnd.apache.parquet"),
+    "jsonl": ExportFormat("JSON Lines", ".jsonl", "application/x-ndjson"),
+}
+
+
+class ChunkWriter:
+    """Append DataFrame chunks to one CSV, CSV.gz, Parquet or JSONL file."""
+
+    JSONL_ROWS = 10_000
+
+    def __init__(self, path, fmt):
+        self.path = path
+        self.fmt = fmt
+        self._file = None
+        self._parquet = None
+        self._schema = None
+
+    def write(self, frame):
+        if self.fmt == "parquet":
+            self._write_parquet(frame)
+            return
+        if self._file is None:
+            if self.fmt == "csv.gz":
+                self._file = gzip.open(self.path, "wt", encoding="utf-8",
+                                       newline="")
+            else:
+                self._file = open(self.path, "w", encoding="utf-8", newline="")
+            if self.fmt in ("csv", "csv.gz"):
+                frame.to_csv(self._file, index=False)
+                return
+        if self.fmt in ("csv", "csv.gz"):
+            frame.to_csv(self._file, index=False, header=False)
+            return
+        # pandas' line splitting slows down sharply on very large strings,
+        # so JSONL goes out in slices.
+        for start in range(0, len(frame), self.JSONL_ROWS):
+            frame.iloc[start:start + self.JSONL_ROWS].to_json(
+                self._file, orient="records", lines=True, date_format="iso",
+                force_ascii=False)
+
+    def _write_parquet(self, frame):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        try:
+            table = pa.Table.from_pandas(frame, schema=self._schema,
+                                         preserve_index=False)
+        except (TypeError, ValueError):
+            # Mixed-type object columns: write them as text instead.
+            obj = frame.select_dtypes("object").columns
+            frame = frame.astype({c: "string" for c in obj})
+            table = pa.Table.from_pandas(frame, schema=self._schema,
+                                         preserve_index=False)
+        if self._parquet is None:
+            self._schema = table.schema
+            self._parquet = pq.ParquetWriter(self.path, self._schema)
+        self._parquet.write_table(table)
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+        if self._file is not None:
+            self._file.close()
+
+
+def write_chunks(path, chunks, fmt):
+    """Write an iterable of DataFrames to ``path`` -> rows written.
+
+    The file appears under ``path`` only once complete (written beside it,
+    then renamed), so a reader never sees a half-written export.
+    """
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    writer = ChunkWriter(tmp, fmt)
+    rows = 0
+    try:
+        for chunk in chunks:
+            writer.write(chunk)
+            rows += len(chunk)
+    except BaseException:
+        writer.close()
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    writer.close()
+    os.replace(tmp, path)
+    return rows
+
+
+class ExportCache:
+    """Directory of finished exports, ``<fingerprint>-<report><extension>``.
+
+    Only the ``max_files`` most recently built files are kept.
+    """
+
+    def __init__(self, root, max_files=20):
+        self.root = root
+        self.max_files = max_files
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def path(self, fingerprint, report, fmt):
+        name = f"{fingerprint}-{report}{EXPORT_FORMATS[fmt].extension}"
+        return os.path.join(self.root, name)
+
+    def get(self, fingerprint, report, fmt):
+        """Path of a finished export, or None if it hasn't been built."""
+        path = self.path(fingerprint, report, fmt)
+        return path if os.path.exists(path) else None
+
+    def build(self, fingerprint, report, fmt, chunks):
+        """Write ``chunks`` (DataFrames) as this export -> its path.
+
+        An export that already exists is returned as is; ``chunks`` is then
+        never consumed, so pass a generator to skip the work entirely.
+        """
+        path = self.get(fingerprint, report, fmt)
+        if path is not None:
+            return path
+        path = self.path(fingerprint, report, fmt)
+        write_chunks(path, chunks, fmt)
+        self._evict()
+        return path
+
+    def _evict(self):
+        with self._lock:
+            files = [os.path.join(self.root, n) for n in os.listdir(self.root)
+                     if not n.endswith(".tmp")]
+            files.sort(key=os.path.getmtime, reverse=True)
+            for old in files[self.max_files:]:
+                try:
+                    os.remove(old)
+                except OSError:
+                    pass
@@ -0,0 +1,74 @@
+"""Bounded-memory word counts.
+
+`MisraGries` keeps at most ``capacity`` counters however many distinct words
+stream past. Each kept count is an underestimate of the true count by at most
+``error`` (no more than total / (capacity + 1)), so every word making up more
+than that share of the text is guaranteed to be kept. While the vocabulary
+fits in ``capacity`` nothing is ever dropped and the counts are exact.
+
+Summaries built from separate chunks merge with `update` (add the counters,
+then subtract the (capacity + 1)-th largest count), so chunks counted in
+parallel combine with the same guarantee.
+"""
+
+import heapq
+from collections.abc import Mapping
+
+import pandas as pd
+
+
+class MisraGries(Mapping):
+    """Misra–Gries heavy-hitter summary: a read-only word -> count mapping."""
+
+    def __init__(self, capacity, counts=None):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.total = 0   # occurrences summarised
+        self.error = 0   # largest possible undercount of any word
+        self._counts = {}
+        if counts:
+            self.update(counts)
+
+    def update(self, counts):
+        """Add a word -> count mapping (a Counter or another summary)."""
+        if isinstance(counts, MisraGries):
+            self.total += counts.total
+            self.error += counts.error
+        else:
+            self.total += sum(counts.values())
+        merged = self._counts
+        for word, count in counts.items():
+            merged[word] = merged.get(word, 0) + count
+        if len(merged) > self.capacity:
+            cut = heapq.nlargest(self.capacity + 1, merged.values())[-1]
+            self.error += cut
+            # Dict order (first seen) survives, so ties still break the same way.
+            self._counts = {w: c - cut for w, c in merged.items() if c > cut}
+        return self
+
+    def __getitem__(self, word):
+        return self._counts[word]
+
+    def __iter__(self):
+        return iter(self._counts)
+
+    def __len__(self):
+        return len(self._counts)
+
+    def __repr__(self):
+        return (f"MisraGries(capacity={self.capacity}, words={len(self)}, "
+                f"total={self.total}, error={self.error})")
+
+
+def top_counts(counts, top_n=10):
+    """Top ``top_n`` entries of a word -> count mapping, as a dict.
+
+    Given counts in first-seen order this is exactly the order of
+    ``pd.Series(words).value_counts().head(top_n)``: the same sort over the
+    same starting order breaks count ties the same way.
+    """
+    if not counts:
+        return {}
+    return (pd.Series(dict(counts)).sort_values(ascending=False)
+            .head(top_n).to_dict())
@@ -0,0 +1,211 @@
+"""Reading review files and detecting their columns.
+
+Shared by the Streamlit app and the batch CLI, so nothing here imports
+Streamlit.
+"""
+
+import codecs
+import importlib.util
+import io
+
+import numpy as np
+import pandas as pd
+
+# Multi-threaded Arrow CSV reader when installed (found without importing it,
+# so pyarrow loads on the first upload rather than at start-up).
+_FAST_ENGINE = "pyarrow" if importlib.util.find_spec("pyarrow") else "c"
+
+# Rows parsed up front to pick the columns worth loading.
+SAMPLE_ROWS = 500
+
+# Column-name hints for review text.
+TEXT_KEYWORDS = ["review", "text", "comment", "feedback", "description",
+                 "content", "body", "message"]
+
+
+def sniff_encoding(raw, block=1 << 20):
+    """``utf-8-sig`` (BOM), ``utf-8`` if every byte decodes, else ``latin-1``.
+
+    Decodes block by block without keeping the text, so a non-UTF-8 file
+    usually stops within the first block.
+    """
+    if raw.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    view = memoryview(raw)
+    try:
+        for start in range(0, len(raw), block):
+            decoder.decode(view[start:start + block])
+        decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        return "latin-1"
+    return "utf-8"
+
+
+def analysis_columns(df):
+    """Columns the analysis and dashboard use, or None if unsure.
+
+    That is the review-text candidates, rating, review ID, date and product
+    columns. None when no review-text column can be detected (the user then
+    picks one from all columns).
+    """
+    info = analyze_columns(df)
+    if info["text_column"] is None:
+        return None
+    keep = {info["text_column"], info["rating_column"], info["id_column"]}
+    for col in df.columns:
+        name = col.lower()
+        if ("date" in name or "product" in name
+                or (col in info["text_columns"]
+                    and any(k in name for k in TEXT_KEYWORDS))):
+            keep.add(col)
+    return [c for c in df.columns if c in keep]
+
+
+def _parse(raw, encoding, usecols=None):
+    """Parse ``raw`` -> (DataFrame, whether malformed lines were skipped).
+
+    The fast engine reads well-formed files in one pass (the strict C parser
+    covers anything Arrow rejects). On a parse error the C parser re-reads
+    skipping just the bad lines; the slow python engine is the last resort
+    for files the C tokenizer can't handle at all.
+
+    Only Arrow gets ``usecols`` directly: it still rejects rows with extra
+    fields, while the C and python parsers silently truncate them, so those
+    parse every column and the selection happens afterwards.
+    """
+    attempts = [dict(engine=e) for e in dict.fromkeys([_FAST_ENGINE, "c"])]
+    attempts += [dict(engine="c", on_bad_lines="skip"),
+                 dict(engine="python", on_bad_lines="skip")]
+    for i, kw in enumerate(attempts):
+        arrow = kw["engine"] == "pyarrow"
+        try:
+            df = pd.read_csv(io.BytesIO(raw), encoding=encoding,
+                             usecols=usecols if arrow else None, **kw)
+        except UnicodeDecodeError:
+            raise
+        except Exception:  # malformed rows -> retry more leniently
+            if i == len(attempts) - 1:
+                raise
+            continue
+        if usecols is not None and not arrow:
+            df = df[list(usecols)]
+        if arrow:  # Arrow leaves missing strings as None; the others use NaN
+            df = df.fillna(np.nan)
+            df.columns = _dedup_names(df.columns)
+        return df, "on_bad_lines" in kw
+
+
+def _dedup_names(names):
+    """Header names as the C parser makes them: a blank name becomes
+    ``Unnamed: N`` and a repeat ``name.1``, ``name.2``, ... (skipping any
+    taken by another header). Arrow keeps both as they are in the file."""
+    names = [f"Unnamed: {i}" if str(n) == "" else str(n)
+             for i, n in enumerate(names)]
+    header, seen, counts, out = set(names), set(), {}, []
+    for name in names:
+        new = name
+        if name in seen:
+            k = counts.get(name, 1)
+            while f"{name}.{k}" in seen or f"{name}.{k}" in header:
+                k += 1
+            new = f"{name}.{k}"
+            counts[name] = k + 1
+        seen.add(new)
+        out.append(new)
+    return out
+
+
+def _usecols(raw, encoding):
+    """Raw header names of the `analysis_columns`, from a parsed sample."""
+    try:
+        sample = pd.read_csv(io.BytesIO(raw), encoding=encoding,
+                             nrows=SAMPLE_ROWS, on_bad_lines="skip")
+    except Exception:
+        return None
+    names = {str(c).strip(): c for c in sample.columns}
+    if len(names) != len(sample.columns):      # duplicate names after strip
+        return None
+    sample.columns = list(names)
+    keep = analysis_columns(sample)
+    return [names[c] for c in keep] if keep else None
+
+
+def read_csv_robust(uploaded_file, prune_columns=True):
+    """Read an uploaded CSV, tolerating encoding and malformed-row problems.
+
+    The encoding is sniffed from the bytes and, with ``prune_columns``, only
+    the `analysis_columns` found in the first rows are loaded. The app keeps
+    every column (``prune_columns=False``): exports round-trip the whole
+    upload and any text column can be picked as the review text.
+    """
+    warnings = []
+    raw = uploaded_file.getvalue()
+    df, last_err = None, None
+    encodings = [sniff_encoding(raw)]
+    if encodings[0] != "latin-1":  # a bad byte the sniffer missed
+        encodings.append("latin-1")
+    for enc in encodings:
+        try:
+            usecols = _usecols(raw, enc) if prune_columns else None
+            df, skipped = _parse(raw, enc, usecols)
+        except UnicodeDecodeError:
+            continue
+        except Exception as e:
+            last_err = e
+            continue
+        if enc == "latin-1":
+            warnings.append(f"File wasn't UTF-8 — read it as {enc}.")
+        if skipped:
+            warnings.append("Some malformed rows were skipped during import.")
+        break
+    if df is None:
+        return None, [f"Couldn't parse this CSV ({last_err})."]
+
+    df.columns = [str(c).strip() for c in df.columns]
+    df = df.dropna(how="all").reset_index(drop=True)
+    if df.empty:
+        return None, ["This file has no usable rows."]
+    return df, warnings
+
+
+def analyze_columns(df):
+    """Detect the review-text, rating, ID, product and date columns (text
+    with a length-based fallback)."""
+    text_cols = [c for c in df.columns if df[c].dtype == object]
+    info = {"text_column": None, "rating_column": None, "id_column": None,
+            "product_column": None, "date_column": None,
+            "text_columns": text_cols}
+
+    # Dimensions the dashboard can slice by (see `cube`).
+    for key, word in (("product_column", "product"), ("date_column", "date")):
+        info[key] = next((c for c in df.columns if word in str(c).lower()), None)
+
+    # A unique per-review key lets re-uploads reuse earlier results.
+    for col in df.columns:
+        name = col.lower()
+        if (name in ("review_id", "reviewid", "id") or name.endswith("_id")) \
+                and df[col].notna().all() and df[col].is_unique:
+            info["id_column"] = col
+            break
+
+    for col in df.columns:
+        if any(k in col.lower() for k in ["rating", "score", "stars", "rate"]):
+            info["rating_column"] = col
+            break
+
+    def avg_len(c):
+        return df[c].astype(str).str.len().mean()
+
+    # Prefer text columns whose name signals review content, but skip id-like
+    # columns and, among matches, pick the one with the longest average text.
+    candidates = [c for c in text_cols
+                  if any(k in c.lower() for k in TEXT_KEYWORDS)
+                  and not c.lower().endswith("_id") and c.lower() != "id"]
+    if candidates:
+        info["text_column"] = max(candidates, key=avg_len)
+    elif text_cols:  # fallback: the longest free-text column
+        best = max(text_cols, key=avg_len)
+        if avg_len(best) >= 15:
+            info["text_column"] = best
+    return info
@@ -0,0 +1,184 @@
+"""Background analysis of large datasets, with partial results as it goes.
+
+`ReviewAnalyzer.analyze_text` scores a whole frame in one call, which keeps a
+Streamlit session busy (and blank) until it returns. `AnalysisJob` runs the
+same scoring in a worker thread, one chunk at a time, and after every chunk
+publishes its progress and an `AnalysisCube` of the rows done so far, so the
+dashboard can draw partial figures while the rest is scored. A job can be
+cancelled between chunks, e.g. when a new file is uploaded.
+
+Given ``strata`` (a stratum id per row, see `estimates.strata_codes`) the
+rows are scored in `estimates.stratified_order` instead of file order, so
+the rows done at any point are a stratified random sample and `estimates`
+gives every KPI as an estimate with a confidence interval.
+
+When the job finishes, ``columns`` holds the per-row results for the whole
+frame (as `ReviewAnalyzer.result_columns`), ready for
+`ReviewAnalyzer.results_from_columns`.
+"""
+
+import threading
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from cube import AnalysisCube
+from estimates import estimate_kpis, stratified_order
+from streaming import DEFAULT_CHUNKSIZE
+
+Progress = namedtuple("Progress", "rows total seconds rate eta")
+
+
+class AnalysisJob:
+    """Scores ``df`` chunk by chunk in a daemon thread.
+
+    ``key`` identifies what is being analysed (the app uses the dataset
+    fingerprint). Read ``progress()``, ``cube`` and ``done`` from any thread;
+    ``columns``, ``timings`` and ``error`` are set once the job has stopped.
+    """
+
+    def __init__(self, analyzer, df, text_column, rating_column=None,
+                 product_column=None, date_column=None,
+                 chunksize=DEFAULT_CHUNKSIZE, key=None, strata=None, seed=0):
+        self.analyzer = analyzer
+        self.df = df
+        self.text_column = text_column
+        self.rating_column = rating_column
+        self.product_column = product_column
+        self.date_column = date_column
+        self.chunksize = chunksize
+        self.key = key
+        self.strata = strata
+        self.order = None if strata is None else stratified_order(strata, seed)
+        self.total = len(df)
+        self.rows = 0
+        self.cube = None
+        self.columns = None
+        self.timings = []
+        self.error = None
+        self._parts = []
+        self._started = None
+        self._finished = None
+        self._cancel = threading.Event()
+        self._done = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, daemon=True,
+                                        name="analysis-job")
+
+    def start(self):
+        self._started = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        """Stop after the chunk being scored; no results are produced."""
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    @property
+    def done(self):
+        """True once the job has stopped: finished, cancelled or failed."""
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        """Block until the job stops (or ``timeout`` seconds) -> done."""
+        return self._done.wait(timeout)
+
+    def progress(self):
+        """Rows scored so far, elapsed seconds, rows/s and the ETA (seconds)."""
+        with self._lock:
+            rows = self.rows
+        if self._started is None:
+            return Progress(0, self.total, 0.0, 0.0, None)
+        end = self._finished if self._finished is not None else time.perf_counter()
+        seconds = end - self._started
+        rate = rows / seconds if seconds > 0 else 0.0
+        eta = (self.total - rows) / rate if rate else None
+        return Progress(rows, self.total, seconds, rate, eta)
+
+    def _run(self):
+        analyzer = self.analyzer
+        try:
+            with analyzer.profile() as recorder:
+                for start in range(0, self.total, self.chunksize):
+                    if self._cancel.is_set():
+                        return
+                    rows = (np.arange(start, min(start + self.chunksize, self.total))
+                            if self.order is None
+                            else self.order[start:start + self.chunksize])
+                    self._score(rows)
+                if self._parts and not self._cancel.is_set():
+                    self.columns = self._combine()
+            self.timings = [
+                {"stage": name, "seconds": agg["seconds"], "rows": agg["rows"],
+                 "peak_kib": None}
+                for name, agg in recorder.by_stage().items()]
+        except Exception as e:  # reported to the caller, who decides
+            self.error = e
+        finally:
+            self._finished = time.perf_counter()
+            self._done.set()
+
+    def scored(self):
+        """(positions, result columns) of the rows scored so far."""
+        with self._lock:
+            parts = list(self._parts)
+            rows = self.rows
+        if not parts:
+            return np.empty(0, dtype=np.int64), None
+        positions = (np.arange(rows) if self.order is None
+                     else np.asarray(self.order[:rows]))
+        return positions, _concat(parts)
+
+    def estimates(self):
+        """`estimate_kpis` over the rows scored so far.
+
+        None before the first chunk, or for a job not given ``strata``.
+        """
+        positions, columns = self.scored()
+        if columns is None or self.strata is None:
+            return None
+        return estimate_kpis(self.strata, positions, columns,
+                             self.analyzer.SENTIMENT_LABELS,
+                             self.analyzer.ISSUE_RULES)
+
+    def _score(self, rows):
+        analyzer = self.analyzer
+        chunk = self.df.iloc[rows]
+        results = analyzer.analyze_text(chunk, self.text_column,
+                                        self.rating_column)
+        columns = analyzer.result_columns(chunk, results)
+        part = AnalysisCube.build(
+            columns, analyzer.SENTIMENT_LABELS, analyzer.ISSUE_RULES,
+            self._values(chunk, self.product_column),
+            self._values(chunk, self.date_column), positions=rows)
+        cube = part if self.cube is None else self.cube.merge(part)
+        with self._lock:
+            self._parts.append(columns)
+            self.cube = cube
+            self.rows += len(chunk)
+
+    @staticmethod
+    def _values(chunk, column):
+        return chunk[column] if column and column in chunk.columns else None
+
+    def _combine(self):
+        columns = _concat(self._parts)
+        if self.order is not None:  # back to row order
+            inverse = np.empty(self.total, dtype=np.int64)
+            inverse[self.order] = np.arange(self.total)
+            columns = {k: v[inverse] for k, v in columns.items()}
+        if "duplicates" in columns:
+            # Chunks only see their own duplicates: count them frame-wide.
+            texts = self.df[self.text_column].astype(str).tolist()
+            columns["duplicates"] = (self.analyzer.duplicate_groups(texts)
+                                     .row_sizes().astype(np.uint32))
+        return columns
+
+
+def _concat(parts):
+    return {k: np.concatenate([p[k] for p in parts]) for k in parts[0]}
@@ -0,0 +1,84 @@
+"""Single-pass multi-phrase matching for SmartReview-AI's keyword rules.
+
+`ReviewAnalyzer` tags issues and urgency with plain substring rules
+(``phrase in text.lower()``). Checking each phrase separately costs
+rows x phrases scans; `PhraseMatcher` compiles every phrase into one
+Aho-Corasick automaton instead, so a review is read once no matter how many
+rules there are. Matching semantics are identical to the substring checks:
+case-insensitive, overlapping and mid-word matches all count.
+"""
+
+from collections import deque
+
+
+class PhraseMatcher:
+    """Aho-Corasick matcher over labelled groups of phrases.
+
+    ``groups`` maps a label to the phrases that signal it. `scan` returns a
+    bitmask with bit ``i`` set when any phrase of ``labels[i]`` occurs in the
+    text.
+    """
+
+    def __init__(self, groups):
+        self.labels = list(groups)
+        if len(self.labels) > 63:
+            raise ValueError("PhraseMatcher supports at most 63 labels")
+
+        # Trie of the lower-cased phrases; `out[s]` is the label bitmask of
+        # phrases ending in state `s`.
+        goto, out = [{}], [0]
+        for bit, label in enumerate(self.labels):
+            for phrase in groups[label]:
+                phrase = str(phrase).lower()
+                if not phrase:
+                    raise ValueError(f"empty phrase for label {label!r}")
+                state = 0
+                for ch in phrase:
+                    nxt = goto[state].get(ch)
+                    if nxt is None:
+                        nxt = len(goto)
+                        goto[state][ch] = nxt
+                        goto.append({})
+                        out.append(0)
+                    state = nxt
+                out[state] |= 1 << bit
+
+        # Breadth-first pass: resolve failure links into a full transition
+        # table (a DFA), so scanning never has to walk back up the trie. A
+        # character missing from `delta[s]` always leads back to the root.
+        delta = [None] * len(goto)
+        delta[0] = dict(goto[0])
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())  # depth-1 states fail to the root
+        while queue:
+            state = queue.popleft()
+            delta[state] = {**delta[fail[state]], **goto[state]}
+            out[state] |= out[fail[state]]
+            for ch, nxt in goto[state].items():
+                fail[nxt] = delta[fail[state]].get(ch, 0)
+                queue.append(nxt)
+
+        self._delta = delta
+        self._out = out
+        self.n_states = len(goto)
+
+    def scan(self, text):
+        """Bitmask of the labels whose phrases occur in ``text``."""
+        delta, out = self._delta, self._out
+        state, found = 0, 0
+        for ch in str(text).lower():
+            state = delta[state].get(ch, 0)
+            found |= out[state]
+        return found
+
+    def scan_many(self, texts):
+        """`scan` over an iterable of texts -> list of bitmasks."""
+        return [self.scan(t) for t in texts]
+
+    def bit(self, label):
+        """The mask bit for ``label``."""
+        return 1 << self.labels.index(label)
+
+    def decode(self, mask):
+        """Labels set in ``mask``, in `labels` order."""
+        return [label for i, label in enumerate(self.labels) if mask >> i & 1]
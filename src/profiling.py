@@ -0,0 +1,67 @@
+"""Per-stage timing for the analysis pipeline.
+
+`ReviewAnalyzer` wraps each stage of its work (sentiment scoring, keyword
+matching, aggregation, word frequency, ...) in `stage`, which measures wall
+time and, optionally, peak traced allocations, then hands a record to every
+registered hook. `StageRecorder` is the stock hook: it just keeps the
+records so they can be shown or returned.
+
+A record is a dict: ``{"stage", "seconds", "rows", "peak_kib"}``.
+"""
+
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+@contextmanager
+def stage(name, rows=None, track_allocations=False, hooks=()):
+    """Time the ``with`` body as stage ``name`` and pass the record to hooks.
+
+    The yielded record can be updated inside the block (e.g. to set ``rows``
+    once known). With ``track_allocations`` the peak memory allocated while
+    the block ran is recorded as ``peak_kib`` (tracemalloc is started just for
+    the block if it isn't running already).
+    """
+    record = {"stage": name, "seconds": 0.0, "rows": rows, "peak_kib": None}
+    started_tracing = False
+    if track_allocations:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            started_tracing = True
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record["seconds"] = time.perf_counter() - start
+        if track_allocations:
+            record["peak_kib"] = (tracemalloc.get_traced_memory()[1] - base) / 1024
+            if started_tracing:
+                tracemalloc.stop()
+        for hook in hooks:
+            hook(record)
+
+
+class StageRecorder:
+    """Stage hook that keeps every record it is given, in order."""
+
+    def __init__(self):
+        self.records = []
+
+    def __call__(self, record):
+        self.records.append(dict(record))
+
+    def total_seconds(self):
+        return sum(r["seconds"] for r in self.records)
+
+    def by_stage(self):
+        """Seconds and rows summed per stage name, in first-seen order."""
+        out = {}
+        for r in self.records:
+            agg = out.setdefault(r["stage"], {"seconds": 0.0, "rows": 0, "calls": 0})
+            agg["seconds"] += r["seconds"]
+            agg["rows"] += r["rows"] or 0
+            agg["calls"] += 1
+        return out
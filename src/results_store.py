@@ -0,0 +1,130 @@
+"""Persistent, columnar store of finished analyses.
+
+Streamlit's cache lives in the process, so every restart or redeploy used to
+mean re-scoring. `ResultsStore` writes each analysed dataset to a Parquet
+file named by its fingerprint: the source columns plus compact per-row
+outputs (sentiment code, score, priority, issue bitmask, urgent flag). A
+small JSON index lists recent analyses so one can be reopened from disk, and
+the output columns alone can be read back without touching the source text.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+import pandas as pd
+
+# Prefix of the per-row output columns inside a stored Parquet file.
+OUTPUT_PREFIX = "_sr_"
+
+
+def dataset_fingerprint(df, text_column, rating_column=None, backend=None):
+    """Stable hex id for a dataset analysed with the given columns and backend."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(json.dumps([[str(c) for c in df.columns], text_column,
+                         rating_column, backend]).encode())
+    h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+class ResultsStore:
+    """Directory of ``<fingerprint>.parquet`` analyses plus an ``index.json``.
+
+    Only the ``max_entries`` most recent analyses are kept on disk.
+    """
+
+    INDEX = "index.json"
+
+    def __init__(self, root, max_entries=20):
+        self.root = root
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, fingerprint):
+        return os.path.join(self.root, f"{fingerprint}.parquet")
+
+    def __contains__(self, fingerprint):
+        return os.path.exists(self._path(fingerprint))
+
+    def _read_index(self):
+        try:
+            with open(os.path.join(self.root, self.INDEX)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return []
+
+    def _write_index(self, entries):
+        path = os.path.join(self.root, self.INDEX)
+        with open(path + ".tmp", "w") as f:
+            json.dump(entries, f)
+        os.replace(path + ".tmp", path)
+
+    def save(self, fingerprint, df, columns, meta=None):
+        """Persist ``df`` with its output ``columns`` -> the new index entry.
+
+        ``columns`` maps output names to per-row arrays (see
+        `ReviewAnalyzer.result_columns`); ``meta`` is any JSON-able extra
+        information to keep in the index (name, text column, summary...).
+        """
+        outputs = pd.DataFrame({OUTPUT_PREFIX + k: v for k, v in columns.items()})
+        frame = pd.concat([df.reset_index(drop=True), outputs], axis=1)
+        frame.columns = [str(c) for c in frame.columns]
+        tmp = self._path(fingerprint) + ".tmp"
+        try:
+            frame.to_parquet(tmp, index=False)
+        except (TypeError, ValueError, ImportError):
+            # Mixed-type object columns: store them as text instead.
+            obj = frame.select_dtypes("object").columns
+            frame[obj] = frame[obj].astype("string")
+            frame.to_parquet(tmp, index=False)
+        os.replace(tmp, self._path(fingerprint))
+
+        entry = {"fingerprint": fingerprint, "rows": len(df),
+                 "created": time.strftime("%Y-%m-%d %H:%M:%S"), **(meta or {})}
+        with self._lock:
+            entries = [e for e in self._read_index()
+                       if e["fingerprint"] != fingerprint]
+            entries.insert(0, entry)
+            for old in entries[self.max_entries:]:
+                try:
+                    os.remove(self._path(old["fingerprint"]))
+                except OSError:
+                    pass
+            self._write_index(entries[:self.max_entries])
+        return entry
+
+    def recent(self, limit=10, only=None):
+        """Index entries of stored analyses, newest first.
+
+        ``only`` (fingerprints, e.g. those of one user's session) limits the
+        list to those analyses; None lists every one.
+        """
+        entries = self._read_index()
+        if only is not None:
+            only = set(only)
+            entries = [e for e in entries if e["fingerprint"] in only]
+        return [e for e in entries[:limit] if e["fingerprint"] in self]
+
+    def entry(self, fingerprint):
+        return next((e for e in self._read_index()
+                     if e["fingerprint"] == fingerprint), None)
+
+    def load_columns(self, fingerprint):
+        """Only the per-row output arrays of a stored analysis."""
+        import pyarrow.parquet as pq  # pandas' Parquet engine (requirements.txt)
+
+        path = self._path(fingerprint)
+        names = [n for n in pq.read_schema(path).names
+                 if n.startswith(OUTPUT_PREFIX)]
+        frame = pd.read_parquet(path, columns=names)
+        return {n[len(OUTPUT_PREFIX):]: frame[n].to_numpy() for n in names}
+
+    def load(self, fingerprint):
+        """A stored analysis -> (source frame, output columns)."""
+        frame = pd.read_parquet(self._path(fingerprint))
+        outputs = [c for c in frame.columns if c.startswith(OUTPUT_PREFIX)]
+        columns = {c[len(OUTPUT_PREFIX):]: frame[c].to_numpy() for c in outputs}
+        return frame.drop(columns=outputs), columns
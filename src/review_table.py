@@ -0,0 +1,107 @@
+"""The Analysis Details reviews table, built once per analysis.
+
+`ReviewTable` joins the source rows with their decoded results (sentiment
+label, priority, issue list, duplicate count), sorts them by priority once,
+and precomputes a boolean mask per table filter: each sentiment, each issue
+category, "With issues", "Urgent", "Repeated" and "Needs action" (priority
+above zero: the Priority & Replies queue). Switching filters is then a
+mask lookup instead of rebuilding, re-decoding and re-sorting the frame.
+
+`page` serves one page of a filtered (and optionally re-sorted) view, so the
+browser is only ever sent ``size`` rows however large the dataset.
+"""
+
+import numpy as np
+import pandas as pd
+
+from encoded_results import join_issues
+
+
+class ReviewTable:
+    """Priority-sorted reviews with their results and per-filter masks.
+
+    ``frame`` holds the rows highest priority first (ties keep source order);
+    ``masks[name]`` selects the rows of filter ``name`` from it.
+    """
+
+    def __init__(self, df, columns, labels, issue_names, repeat_threshold=3):
+        priority = np.asarray(columns["priority"])
+        order = np.argsort(-priority.astype(np.int64), kind="stable")
+        sentiment = np.asarray(columns["sentiment"])[order]
+        issues = np.asarray(columns["issues"])[order]
+        urgent = np.asarray(columns["urgent"], dtype=bool)[order]
+
+        frame = df.take(order)
+        frame["Sentiment"] = pd.Categorical.from_codes(sentiment, labels)
+        frame["Priority"] = priority[order]
+        frame["Issues"] = join_issues(issues, issue_names)
+        masks = {"All": np.ones(len(frame), dtype=bool)}
+        for code, label in enumerate(labels):
+            masks[label] = sentiment == code
+        masks["With issues"] = issues != 0
+        masks["Urgent"] = urgent
+        masks["Needs action"] = priority[order] > 0
+        if "duplicates" in columns:
+            copies = np.asarray(columns["duplicates"])[order]
+            frame["Copies"] = copies
+            masks["Repeated"] = copies >= repeat_threshold
+        for bit, name in enumerate(issue_names):
+            masks[name] = (issues >> bit & 1).astype(bool)
+
+        self.frame = frame
+        self.masks = masks
+        self.order = order
+        self._orders = {}  # (column, ascending) -> row positions in that order
+
+    def __len__(self):
+        return len(self.frame)
+
+    def filters(self):
+        """Names accepted by `view` (and `count`)."""
+        return list(self.masks)
+
+    def count(self, name):
+        return int(np.count_nonzero(self.masks[name]))
+
+    def view(self, name="All"):
+        """Rows of filter ``name``, highest priority first."""
+        if name == "All":
+            return self.frame
+        return self.frame[self.masks[name]]
+
+    def any_of(self, names):
+        """Mask of the rows matching at least one of the filters ``names``."""
+        return np.logical_or.reduce([self.masks[n] for n in names])
+
+    def page(self, where="All", number=1, size=50, sort_by=None,
+             ascending=False):
+        """One page of a view -> (rows, rows matching ``where`` in total).
+
+        ``where`` is a filter name or a boolean mask over `frame`. Rows come
+        highest priority first unless ``sort_by`` names another column of
+        `frame` (ties keep priority order). ``number`` counts from 1 and is
+        clamped to the last page.
+        """
+        mask = self.masks[where] if isinstance(where, str) else where
+        order = self._sorted(sort_by, ascending)
+        positions = np.flatnonzero(mask) if order is None else order[mask[order]]
+        number = min(max(1, number), page_count(len(positions), size))
+        start = (number - 1) * size
+        return self.frame.iloc[positions[start:start + size]], len(positions)
+
+    def _sorted(self, column, ascending):
+        if column in (None, "Priority") and not ascending:
+            return None  # `frame` is already in this order
+        key = (column or "Priority", ascending)
+        order = self._orders.get(key)
+        if order is None:
+            values = self.frame[key[0]].reset_index(drop=True)
+            order = self._orders[key] = values.sort_values(
+                ascending=ascending, kind="stable",
+                na_position="last").index.to_numpy()
+        return order
+
+
+def page_count(rows, size):
+    """Pages needed for ``rows`` rows at ``size`` per page (at least 1)."""
+    return max(1, -(-rows // size))
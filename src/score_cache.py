@@ -0,0 +1,130 @@
+"""Content-addressed cache for sentiment scores.
+
+Review exports repeat themselves: syndicated reviews, thousands of "Great
+product!", the same file re-uploaded with a few new rows. `ScoreCache`
+memoises backend scores keyed by a hash of (backend, normalised text) in a
+bounded in-memory LRU, optionally backed by a SQLite file so scores survive
+restarts.
+
+Normalisation only collapses whitespace: every backend tokenises on
+whitespace, while case and punctuation ("GREAT!!!") change VADER's score and
+are kept.
+"""
+
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+
+
+def normalize(text):
+    """Whitespace-collapsed text (the part of the key scores don't depend on)."""
+    return " ".join(str(text).split())
+
+
+class ScoreCache:
+    """Bounded LRU of sentiment scores with an optional on-disk SQLite tier.
+
+    ``maxsize`` bounds the in-memory tier; ``path`` (a SQLite file, created on
+    first use) adds a persistent tier that is checked on memory misses.
+    """
+
+    _BATCH = 500  # keys per SQLite IN (...) query, under the variable limit
+
+    def __init__(self, maxsize=100_000, path=None):
+        self.maxsize = maxsize
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._mem = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS scores "
+                             "(key BLOB PRIMARY KEY, score REAL NOT NULL)")
+            self._db.commit()
+
+    @staticmethod
+    def key(backend, text):
+        """Content address of ``text`` as scored by ``backend``."""
+        payload = f"{backend}\0{normalize(text)}".encode("utf-8", "surrogatepass")
+        return hashlib.blake2b(payload, digest_size=16).digest()
+
+    def __len__(self):
+        return len(self._mem)
+
+    def _remember(self, key, score):
+        self._mem[key] = score
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.maxsize:
+            self._mem.popitem(last=False)
+
+    def get_many(self, keys):
+        """Look up ``keys`` -> {key: score} for those cached (memory, then disk)."""
+        found, missing = {}, []
+        with self._lock:
+            for key in keys:
+                score = self._mem.get(key)
+                if score is not None:
+                    self._mem.move_to_end(key)
+                    found[key] = score
+                elif key not in found:
+                    missing.append(key)
+            if missing and self._db is not None:
+                unique = list(dict.fromkeys(missing))
+                for i in range(0, len(unique), self._BATCH):
+                    batch = unique[i:i + self._BATCH]
+                    marks = ",".join("?" * len(batch))
+                    rows = self._db.execute(
+                        f"SELECT key, score FROM scores WHERE key IN ({marks})",
+                        batch).fetchall()
+                    for key, score in rows:
+                        found[key] = score
+                        self._remember(key, score)
+            hit = sum(key in found for key in keys)
+            self.hits += hit
+            self.misses += len(keys) - hit
+        return found
+
+    def get(self, key):
+        """Cached score for ``key``, or None."""
+        return self.get_many([key]).get(key)
+
+    def put_many(self, items):
+        """Store ``(key, score)`` pairs in memory (and on disk if enabled)."""
+        items = list(items)
+        with self._lock:
+            for key, score in items:
+                self._remember(key, score)
+            if self._db is not None and items:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO scores (key, score) VALUES (?, ?)",
+                    items)
+                self._db.commit()
+
+    def put(self, key, score):
+        self.put_many([(key, score)])
+
+    def stats(self):
+        """Hit/miss counters and tier sizes."""
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self._mem), "maxsize": self.maxsize,
+                "disk": self.path}
+
+    def clear(self):
+        """Drop every cached score (both tiers) and reset the counters."""
+        with self._lock:
+            self._mem.clear()
+            self.hits = self.misses = 0
+            if self._db is not None:
+                self._db.execute("DELETE FROM scores")
+                self._db.commit()
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
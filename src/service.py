@@ -0,0 +1,204 @@
+"""Small async HTTP service for scoring reviews as they arrive.
+
+Exposes `ReviewAnalyzer.triage` over JSON without Streamlit, so a storefront
+webhook can get sentiment, issues, priority, the urgent flag and a suggested
+reply per review::
+
+    python src/service.py --port 8080 --workers 2
+
+Endpoints:
+
+- ``POST /score``        one review: ``{"text": ..., "rating": 1-5, "product": ..., "name": ...}``
+- ``POST /score/batch``  ``{"reviews": [review, ...]}`` (up to MAX_BATCH per call)
+- ``GET  /stats``        request counts and p50/p99 latency (ms) of this worker
+- ``GET  /health``
+
+Each worker process keeps one warm analyzer and scores one request at a
+time (scoring is CPU-bound, so threads would not help); with ``--workers``
+> 1 the processes share one listening socket.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import sys
+import time
+from collections import deque
+from http import HTTPStatus
+
+import numpy as np
+
+from analyzer import ReviewAnalyzer
+
+MAX_BATCH = 1000
+MAX_BODY = 8 * 1024 * 1024  # bytes
+
+
+class ScoringService:
+    """Request routing and latency bookkeeping around one warm analyzer."""
+
+    def __init__(self, analyzer=None, window=10_000):
+        self.analyzer = analyzer or ReviewAnalyzer()
+        self.analyzer.triage([{"text": "warm up", "rating": 5}])
+        self.started = time.time()
+        self._latency = {"/score": deque(maxlen=window),
+                         "/score/batch": deque(maxlen=window)}
+        self._reviews = 0
+
+    def stats(self):
+        out = {"pid": os.getpid(), "backend": self.analyzer.backend,
+               "uptime_s": round(time.time() - self.started, 1),
+               "reviews_scored": self._reviews, "endpoints": {}}
+        for path, samples in self._latency.items():
+            ms = np.array(samples, dtype=float) * 1000
+            out["endpoints"][path] = {
+                "requests": len(ms),
+                "p50_ms": round(float(np.percentile(ms, 50)), 3) if len(ms) else None,
+                "p99_ms": round(float(np.percentile(ms, 99)), 3) if len(ms) else None,
+            }
+        return out
+
+    def handle(self, method, path, body):
+        """Dispatch one request -> (HTTPStatus, JSON-able payload)."""
+        path = path.split("?", 1)[0].rstrip("/") or "/"
+        if method == "GET" and path == "/health":
+            return HTTPStatus.OK, {"status": "ok"}
+        if method == "GET" and path == "/stats":
+            return HTTPStatus.OK, self.stats()
+        if path not in self._latency:
+            return HTTPStatus.NOT_FOUND, {"error": f"no route for {path}"}
+        if method != "POST":
+            return HTTPStatus.METHOD_NOT_ALLOWED, {"error": "use POST"}
+
+        start = time.perf_counter()
+        try:
+            payload = json.loads(body or b"null")
+            if path == "/score":
+                reviews = [payload]
+            else:
+                reviews = payload.get("reviews") if isinstance(payload, dict) else None
+                if not isinstance(reviews, list):
+                    raise ValueError('expected {"reviews": [...]}')
+                if len(reviews) > MAX_BATCH:
+                    raise ValueError(f"at most {MAX_BATCH} reviews per call")
+            if not all(isinstance(r, dict) and "text" in r for r in reviews):
+                raise ValueError('each review needs a "text" field')
+            results = self.analyzer.triage(reviews)
+        except (ValueError, TypeError) as e:
+            return HTTPStatus.BAD_REQUEST, {"error": str(e)}
+        self._latency[path].append(time.perf_counter() - start)
+        self._reviews += len(reviews)
+        if path == "/score":
+            return HTTPStatus.OK, results[0]
+        return HTTPStatus.OK, {"results": results}
+
+    async def serve_connection(self, reader, writer):
+        """HTTP/1.1 with keep-alive: one request at a time per connection."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._respond(writer, HTTPStatus.BAD_REQUEST,
+                                        {"error": "bad request line"}, False)
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = self._content_length(method, headers)
+                if length is None:
+                    await self._respond(writer, HTTPStatus.BAD_REQUEST,
+                                        {"error": "POST needs a valid "
+                                                  "Content-Length"}, False)
+                    break
+                if length > MAX_BODY:
+                    await self._respond(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                                        {"error": "body too large"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                keep_alive = (headers.get("connection", "").lower() != "close"
+                              and version == "HTTP/1.1")
+                status, payload = self.handle(method.upper(), path, body)
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _content_length(method, headers):
+        """Body size from the headers; None if it's missing (on a POST) or
+        not a non-negative integer. Chunked bodies aren't supported."""
+        value = headers.get("content-length")
+        if value is None:
+            return None if method.upper() == "POST" else 0
+        try:
+            length = int(value)
+        except ValueError:
+            return None
+        return length if length >= 0 else None
+
+    @staticmethod
+    async def _respond(writer, status, payload, keep_alive):
+        data = json.dumps(payload).encode()
+        head = (f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(data)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode() + data)
+        await writer.drain()
+
+
+async def serve(sock, service=None):
+    """Serve on an already-bound listening socket until cancelled."""
+    service = service or ScoringService()
+    server = await asyncio.start_server(service.serve_connection, sock=sock)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Review scoring HTTP service.")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8080)
+    p.add_argument("--workers", type=int, default=1,
+                   help="worker processes sharing the port (default: 1)")
+    args = p.parse_args(argv)
+
+    sock = socket.create_server((args.host, args.port))
+    sock.setblocking(False)
+    children = []
+    for _ in range(max(args.workers, 1) - 1):
+        pid = os.fork()
+        if pid == 0:
+            children = None
+            break
+        children.append(pid)
+    print(f"pid {os.getpid()} serving on http://{args.host}:{args.port}",
+          file=sys.stderr)
+    try:
+        asyncio.run(serve(sock))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for pid in children or []:
+            try:
+                os.kill(pid, 15)
+            except OSError:
+                pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
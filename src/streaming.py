@@ -0,0 +1,152 @@
+"""Chunked, bounded-memory analysis for review files of any size.
+
+`ReviewAnalyzer.analyze_text` keeps a row of results per review, which is
+what the dashboard tables need but grows with the file. For large exports,
+`ReviewAnalyzer.analyze_stream` scores one chunk at a time and folds each
+chunk into an `AnalysisAggregate`: sentiment counts, issue summary, word
+counts, a running top-k of priority rows and urgent IDs. Aggregates built from separate
+chunks (e.g. in parallel) combine with `merge`, so totals are exact for the
+whole file.
+"""
+
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from encoded_results import issue_counts, priority_rows
+from heavy_hitters import MisraGries, top_counts
+from topk import TopK
+
+DEFAULT_CHUNKSIZE = 50_000
+
+
+def iter_csv_chunks(source, chunksize=DEFAULT_CHUNKSIZE, **read_csv_kwargs):
+    """Yield DataFrame chunks of a CSV with stripped column names.
+
+    Chunks keep pandas' running RangeIndex, so index labels are row positions
+    in the whole file.
+    """
+    with pd.read_csv(source, chunksize=chunksize, **read_csv_kwargs) as reader:
+        for chunk in reader:
+            chunk.columns = [str(c).strip() for c in chunk.columns]
+            yield chunk
+
+
+class AnalysisAggregate:
+    """Mergeable running totals for a review stream analysed chunk by chunk."""
+
+    SENTIMENTS = ("Positive", "Negative", "Neutral")
+
+    def __init__(self, top_n=25, backend=None, max_words=None):
+        """``max_words`` keeps word counts in a `MisraGries` summary of that
+        capacity instead of an exact Counter."""
+        self.top_n = top_n
+        self.backend = backend
+        self.total = 0
+        self.empty = 0
+        self.length_sum = 0
+        self.shortest = None
+        self.longest = None
+        self.sentiments = Counter()
+        self.issues = Counter()
+        self.words = Counter() if max_words is None else MisraGries(max_words)
+        self.with_issues = 0
+        self.response_needed = 0
+        self.urgent_ids = []
+        # Highest-priority rows so far; on equal priority the earlier row wins.
+        self._top = TopK(top_n)
+
+    def update(self, chunk, results, word_counts, text_column, id_column=None,
+               offset=None):
+        """Fold one analysed chunk into the totals.
+
+        ``results`` is the `analyze_text` output (`EncodedResults`) for
+        ``chunk``; ``offset`` is the chunk's first row position in the whole
+        stream (defaults to the rows seen so far). Urgent reviews are recorded by ``id_column`` when given,
+        otherwise by the chunk's index labels.
+        """
+        offset = self.total if offset is None else offset
+        n = results["total_reviews"]
+        self.total += n
+        if not n:
+            return self
+        self.empty += results["empty_reviews"]
+        self.length_sum += results["avg_length"] * n
+        self.shortest = (results["shortest_review"] if self.shortest is None
+                         else min(self.shortest, results["shortest_review"]))
+        self.longest = (results["longest_review"] if self.longest is None
+                        else max(self.longest, results["longest_review"]))
+        for label in self.SENTIMENTS:
+            self.sentiments[label] += results[f"{label.lower()}_count"]
+        cols = results.columns
+        # Counter.update keeps first-seen order, which breaks count ties the
+        # same way the single-frame issue_summary does.
+        self.issues.update(issue_counts(cols["issues"], results.issue_names))
+        self.with_issues += int(np.count_nonzero(cols["issues"]))
+        self.response_needed += int(np.count_nonzero(cols["priority"] > 50))
+        self.words.update(word_counts)
+
+        if id_column and id_column in chunk.columns:
+            urgent = chunk.loc[results["urgent_indices"], id_column]
+            self.urgent_ids.extend(urgent.tolist())
+        else:
+            self.urgent_ids.extend(results["urgent_indices"])
+
+        # Only the chunk's own top-k rows are materialised.
+        self._top.update(cols["priority"], offset, lambda best: priority_rows(
+            chunk, cols, best, results.labels, results.issue_names))
+        return self
+
+    def merge(self, other):
+        """Add another aggregate (built with its own row offsets) into this one."""
+        self.total += other.total
+        self.empty += other.empty
+        self.length_sum += other.length_sum
+        for attr, pick in (("shortest", min), ("longest", max)):
+            mine, theirs = getattr(self, attr), getattr(other, attr)
+            setattr(self, attr, theirs if mine is None else
+                    mine if theirs is None else pick(mine, theirs))
+        self.sentiments.update(other.sentiments)
+        self.issues.update(other.issues)
+        self.words.update(other.words)
+        self.with_issues += other.with_issues
+        self.response_needed += other.response_needed
+        self.urgent_ids.extend(other.urgent_ids)
+        self._top.merge(other._top)
+        return self
+
+    def priority_reviews(self):
+        """Top-k rows by priority (ties: earlier row first), indexed by position."""
+        return self._top.frame()
+
+    def word_frequency(self, top_n=10):
+        """Top words, ordered exactly like `get_word_frequency`.
+
+        The counts keep words in first-seen order, as `value_counts` does
+        before sorting, so the same sort breaks count ties the same way.
+        """
+        return top_counts(self.words, top_n)
+
+    def results(self):
+        """Summary in the `analyze_text` results shape, minus per-row lists.
+
+        Adds ``with_issues`` and ``response_needed`` counts, which the
+        dashboard otherwise derives from the per-row lists.
+        """
+        return {
+            "backend": self.backend,
+            "total_reviews": self.total,
+            "avg_length": self.length_sum / self.total if self.total else float("nan"),
+            "shortest_review": self.shortest,
+            "longest_review": self.longest,
+            "empty_reviews": self.empty,
+            "positive_count": self.sentiments["Positive"],
+            "negative_count": self.sentiments["Negative"],
+            "neutral_count": self.sentiments["Neutral"],
+            "urgent_indices": list(self.urgent_ids),
+            "issue_summary": dict(sorted(self.issues.items(),
+                                         key=lambda kv: kv[1], reverse=True)),
+            "with_issues": self.with_issues,
+            "response_needed": self.response_needed,
+        }
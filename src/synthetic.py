@@ -0,0 +1,99 @@
+"""Seeded synthetic review generator.
+
+Builds realistic-looking review tables of any size, for the app's offline
+demo fallback and for benchmarks. Text is assembled from rating-appropriate
+openers and closers plus complaint phrases taken from
+`ReviewAnalyzer.ISSUE_RULES` and `URGENT_KEYWORDS`, so issue detection,
+urgency and priority all get exercised the way real exports do.
+"""
+
+import numpy as np
+import pandas as pd
+
+from analyzer import ReviewAnalyzer
+
+PRODUCTS = ["Wireless Headphones", "USB-C Cable", "Stainless Water Bottle",
+            "Ergonomic Office Chair", "Phone Case", "Insulated Coffee Mug",
+            "Smart LED Bulbs (4-pack)", "Yoga Mat", "Bluetooth Speaker",
+            "Running Shoes", "Space Heater", "Kids' Backpack"]
+
+RATING_WEIGHTS = [.15, .15, .2, .25, .25]  # 1..5 stars
+
+POSITIVE = [
+    "Excellent product, highly recommend!", "Love it, works perfectly.",
+    "Great value for money, happy with the purchase.",
+    "Exactly as described and arrived quickly.",
+    "Fantastic quality, better than I expected.",
+    "Five stars, would buy again.", "Really impressed with the build.",
+    "Setup took two minutes and it looks great.",
+]
+NEUTRAL = [
+    "It's okay, does the job.", "Middling. Nothing special but it works.",
+    "Average quality for the price.", "Fine for now, we'll see how it lasts.",
+    "Not bad, not great.", "Does what it says, nothing more.",
+]
+NEGATIVE = [
+    "Very disappointed.", "Would not recommend.", "Terrible experience.",
+    "Not happy with this at all.", "Save your money.", "Awful.",
+]
+DETAILS = [
+    "I use it every day.", "Bought it as a gift.", "Second one I've owned.",
+    "The color is nice.", "Packaging was simple.", "My kids like it too.",
+    "",
+]
+
+
+def _phrases():
+    """Complaint phrases per issue category, plus the urgent ones."""
+    rules = ReviewAnalyzer.ISSUE_RULES
+    return [kws for kws, _ in rules.values()], list(ReviewAnalyzer.URGENT_KEYWORDS)
+
+
+def synthetic_reviews(n, seed=42, start="2025-01-01", days=365):
+    """A DataFrame of ``n`` synthetic reviews (review_id, date, product,
+    rating, review_text), reproducible for a given ``seed``."""
+    rng = np.random.default_rng(seed)
+    ratings = rng.choice([1, 2, 3, 4, 5], n, p=RATING_WEIGHTS)
+    issue_phrases, urgent_phrases = _phrases()
+
+    # Which rows mention an issue / urgent phrase depends on the rating.
+    p_issue = np.array([0, .9, .8, .35, .08, .03])[ratings]
+    has_issue = rng.random(n) < p_issue
+    category = rng.integers(0, len(issue_phrases), n)
+    phrase_pick = rng.random(n)
+    p_urgent = np.array([0, .35, .2, .05, 0, 0])[ratings]
+    has_urgent = rng.random(n) < p_urgent
+    urgent_pick = rng.integers(0, len(urgent_phrases), n)
+
+    mood = np.where(ratings >= 4, 0, np.where(ratings == 3, 1, 2))
+    openers = (POSITIVE, NEUTRAL, NEGATIVE)
+    opener_pick = rng.random(n)
+    detail_pick = rng.integers(0, len(DETAILS), n)
+    products = np.array(PRODUCTS)[rng.integers(0, len(PRODUCTS), n)]
+    has_usage = rng.random(n) < .5
+    weeks = rng.integers(1, 53, n)
+
+    texts = []
+    for i in range(n):
+        pool = openers[mood[i]]
+        parts = [pool[int(opener_pick[i] * len(pool))]]
+        if has_issue[i]:
+            phrases = issue_phrases[category[i]]
+            phrase = phrases[int(phrase_pick[i] * len(phrases))]
+            parts.append(f"{phrase.capitalize()}.")
+        if has_urgent[i]:
+            parts.append(f"{urgent_phrases[urgent_pick[i]].capitalize()}!")
+        if has_usage[i]:
+            parts.append(f"Had the {products[i].lower()} for {weeks[i]} weeks.")
+        parts.append(DETAILS[detail_pick[i]])
+        texts.append(" ".join(p for p in parts if p))
+
+    dates = (pd.Timestamp(start)
+             + pd.to_timedelta(rng.integers(0, days, n), unit="D"))
+    return pd.DataFrame({
+        "review_id": [f"S{i:07d}" for i in range(n)],
+        "date": dates.strftime("%Y-%m-%d"),
+        "product": products,
+        "rating": ratings,
+        "review_text": texts,
+    })
@@ -0,0 +1,91 @@
+"""Top-k selection by priority without sorting every row.
+
+Triage only ever shows the few highest-priority reviews, so `top_k` finds
+them with ``np.argpartition`` (linear time) and sorts just those k. Ties are
+broken by position, earlier row first, which is the order a stable
+descending sort gives and the one the reviews table and the streaming
+aggregate use.
+
+`TopK` keeps a running top-k across chunks of a stream: each chunk is cut
+down to its own top k before any of its rows are materialised, and two
+`TopK` built from separate chunks combine with `merge`.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def top_k(priority, k):
+    """Positions of the ``k`` highest priorities, best first (ties: earlier first)."""
+    priority = np.asarray(priority)
+    n = len(priority)
+    k = max(0, min(k, n))
+    if k == 0:
+        return np.empty(0, dtype=np.intp)
+    if k < n:
+        # The k-th largest value splits the rows: everything above it is in,
+        # and the earliest rows equal to it fill the remaining places.
+        kth = np.partition(priority, n - k)[n - k]
+        above = np.flatnonzero(priority > kth)
+        ties = np.flatnonzero(priority == kth)[:k - len(above)]
+        chosen = np.concatenate((above, ties))
+    else:
+        chosen = np.arange(n)
+    # lexsort is stable and sorts by the last key first.
+    return chosen[np.lexsort((chosen, -priority[chosen].astype(np.int64)))]
+
+
+class TopK:
+    """Running top-k rows of a stream, ordered by priority then position.
+
+    ``priority`` and ``position`` hold the kept rows' priorities and stream
+    positions, best first; ``rows`` is a DataFrame of those rows (indexed by
+    position) once anything has been added.
+    """
+
+    def __init__(self, k):
+        self.k = k
+        self.priority = np.empty(0, dtype=np.int64)
+        self.position = np.empty(0, dtype=np.int64)
+        self.rows = None
+
+    def __len__(self):
+        return len(self.position)
+
+    def update(self, priority, offset, materialize):
+        """Offer one chunk's rows.
+
+        ``priority`` is the chunk's per-row priority, ``offset`` its first
+        row's position in the stream, and ``materialize(positions)`` returns
+        the DataFrame rows at those chunk positions; it is only called for
+        rows that make the chunk's own top k.
+        """
+        best = top_k(priority, self.k)
+        if not len(best):
+            return self
+        rows = materialize(best)
+        rows.index = best + offset
+        return self._combine(np.asarray(priority, dtype=np.int64)[best],
+                             best + offset, rows)
+
+    def merge(self, other):
+        """Fold in another `TopK` (over different stream positions)."""
+        if other.rows is None:
+            return self
+        return self._combine(other.priority, other.position, other.rows)
+
+    def _combine(self, priority, position, rows):
+        if self.rows is not None:
+            priority = np.concatenate((self.priority, priority))
+            position = np.concatenate((self.position, position))
+            rows = pd.concat([self.rows, rows])
+        # Rank by (priority desc, position asc) over the combined candidates.
+        order = np.lexsort((position, -priority))[:self.k]
+        self.priority = priority[order]
+        self.position = position[order]
+        self.rows = rows.iloc[order]
+        return self
+
+    def frame(self):
+        """The kept rows, best first (an empty DataFrame if none)."""
+        return pd.DataFrame() if self.rows is None else self.rows
@@ -0,0 +1,259 @@
+"""Batch VADER scoring with precompiled lookup tables.
+
+`SentimentIntensityAnalyzer.polarity_scores` is written for one sentence at a
+time: it rebuilds the text character by character to swap out emoji, and
+re-lowercases the whole token list inside every negation, idiom and "but"
+check, so long reviews cost O(tokens²). `BatchVader` compiles the analyzer's
+lexicon, the booster/negation word lists and the idiom tables once, lowercases
+each token once, memoises token normalisation across a batch and skips the
+idiom checks when no idiom word is nearby.
+
+The rules (and their quirks) are VADER 3.3.2's, applied in the same order
+with the same float arithmetic, so `compound` returns exactly
+``polarity_scores(text)["compound"]``.
+"""
+
+import math
+import string
+import threading
+
+import numpy as np
+
+_PUNCTUATION = string.punctuation
+_DEFAULT = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+class BatchVader:
+    """VADER compound scores from tables compiled once per analyzer."""
+
+    def __init__(self, analyzer=None):
+        from vaderSentiment import vaderSentiment as vs
+        if analyzer is None:
+            analyzer = vs.SentimentIntensityAnalyzer()
+        self.analyzer = analyzer
+        self.lexicon = analyzer.lexicon
+        # Only single characters are ever replaced (VADER walks the text one
+        # character at a time) and none of them are ASCII.
+        self.emojis = {e: d for e, d in analyzer.emojis.items() if len(e) == 1}
+        self.boosters = dict(vs.BOOSTER_DICT)
+        self.negations = frozenset(vs.NEGATE)
+        self.special_cases = dict(vs.SPECIAL_CASES)
+        self.n_scalar = vs.N_SCALAR
+        self.c_incr = vs.C_INCR
+        # Words of the multi-word idioms / boosters: the idiom check can only
+        # change a valence when one of these is within its window.
+        self._idiom_words = frozenset(
+            w for key in (*self.special_cases, *self.boosters)
+            if " " in key for w in key.split())
+
+    # --- Text preparation ----------------------------------------------------
+    def _replace_emoji(self, text):
+        if text.isascii():
+            return text
+        emojis = self.emojis
+        out = []
+        prev_space = True
+        for ch in text:
+            description = emojis.get(ch)
+            if description is not None:
+                if not prev_space:
+                    out.append(" ")
+                out.append(description)
+                prev_space = False
+            else:
+                out.append(ch)
+                prev_space = ch == " "
+        return "".join(out).strip()
+
+    @staticmethod
+    def _token(raw):
+        """(token, lowercase, is_upper) for one whitespace-split word."""
+        stripped = raw.strip(_PUNCTUATION)
+        token = raw if len(stripped) <= 2 else stripped
+        return token, token.lower(), token.isupper()
+
+    # --- Scoring -------------------------------------------------------------
+    def compound(self, text, _tokens=None):
+        """VADER's compound score for ``text``."""
+        text = self._replace_emoji(str(text))
+        memo = {} if _tokens is None else _tokens
+        toks = []
+        for raw in text.split():
+            tok = memo.get(raw)
+            if tok is None:
+                tok = memo[raw] = self._token(raw)
+            toks.append(tok)
+        if not toks:
+            return 0.0
+        n = len(toks)
+        low = [t[1] for t in toks]
+        caps = sum(t[2] for t in toks)
+        is_cap_diff = 0 < n - caps < n
+
+        lexicon, boosters = self.lexicon, self.boosters
+        sentiments = []
+        for i in range(n):
+            w = low[i]
+            if w in boosters or (w == "kind" and i < n - 1 and low[i + 1] == "of"):
+                sentiments.append(0)
+                continue
+            base = lexicon.get(w)
+            if base is None:
+                sentiments.append(0)
+                continue
+            sentiments.append(self._valence(base, toks, low, i, n, is_cap_diff))
+
+        if "but" in low:
+            sentiments = _but_check(sentiments, low.index("but"))
+        return self._compound(sentiments, text)
+
+    def score_batch(self, texts):
+        """Compound scores for an iterable of texts, as a float64 array."""
+        memo = {}
+        if not isinstance(texts, list):
+            texts = list(texts)
+        return np.fromiter((self.compound(t, memo) for t in texts),
+                           dtype=float, count=len(texts))
+
+    def _valence(self, base, toks, low, i, n, is_cap_diff):
+        lexicon, n_scalar = self.lexicon, self.n_scalar
+        valence = base
+        if low[i] == "no" and i != n - 1 and low[i + 1] in lexicon:
+            valence = 0.0
+        if ((i > 0 and low[i - 1] == "no") or (i > 1 and low[i - 2] == "no")
+                or (i > 2 and low[i - 3] == "no" and low[i - 1] in ("or", "nor"))):
+            valence = base * n_scalar
+        if toks[i][2] and is_cap_diff:
+            valence = valence + self.c_incr if valence > 0 else valence - self.c_incr
+
+        for start_i in range(3):
+            j = i - (start_i + 1)
+            if j < 0 or low[j] in lexicon:
+                continue
+            s = self._scalar(toks[j], valence, is_cap_diff)
+            if start_i == 1 and s != 0:
+                s = s * 0.95
+            if start_i == 2 and s != 0:
+                s = s * 0.9
+            valence = valence + s
+            valence = self._negation(valence, low, start_i, i)
+            if start_i == 2:
+                valence = self._idioms(valence, low, i, n)
+
+        if i > 1 and low[i - 1] == "least" and "least" not in lexicon:
+            if low[i - 2] != "at" and low[i - 2] != "very":
+                valence = valence * n_scalar
+        elif i > 0 and low[i - 1] == "least" and "least" not in lexicon:
+            valence = valence * n_scalar
+        return valence
+
+    def _scalar(self, tok, valence, is_cap_diff):
+        scalar = self.boosters.get(tok[1])
+        if scalar is None:
+            return 0.0
+        if valence < 0:
+            scalar *= -1
+        if tok[2] and is_cap_diff:
+            if valence > 0:
+                scalar += self.c_incr
+            else:
+                scalar -= self.c_incr
+        return scalar
+
+    def _negated(self, word):
+        return word in self.negations or "n't" in word
+
+    def _negation(self, valence, low, start_i, i):
+        if start_i == 0:
+            if self._negated(low[i - 1]):
+                valence = valence * self.n_scalar
+        elif start_i == 1:
+            if low[i - 2] == "never" and low[i - 1] in ("so", "this"):
+                valence = valence * 1.25
+            elif low[i - 2] == "without" and low[i - 1] == "doubt":
+                pass
+            elif self._negated(low[i - 2]):
+                valence = valence * self.n_scalar
+        else:
+            if ((low[i - 3] == "never" and low[i - 2] in ("so", "this"))
+                    or low[i - 1] in ("so", "this")):
+                valence = valence * 1.25
+            elif low[i - 3] == "without" and "doubt" in (low[i - 2], low[i - 1]):
+                pass
+            elif self._negated(low[i - 3]):
+                valence = valence * self.n_scalar
+        return valence
+
+    def _idioms(self, valence, low, i, n):
+        words = self._idiom_words
+        if not any(w in words for w in low[i - 3:i + 3]):
+            return valence
+        special, boosters = self.special_cases, self.boosters
+        onezero = f"{low[i - 1]} {low[i]}"
+        twoonezero = f"{low[i - 2]} {low[i - 1]} {low[i]}"
+        twoone = f"{low[i - 2]} {low[i - 1]}"
+        threetwoone = f"{low[i - 3]} {low[i - 2]} {low[i - 1]}"
+        threetwo = f"{low[i - 3]} {low[i - 2]}"
+        for seq in (onezero, twoonezero, twoone, threetwoone, threetwo):
+            if seq in special:
+                valence = special[seq]
+                break
+        if n - 1 > i:
+            zeroone = f"{low[i]} {low[i + 1]}"
+            if zeroone in special:
+                valence = special[zeroone]
+        if n - 1 > i + 1:
+            zeroonetwo = f"{low[i]} {low[i + 1]} {low[i + 2]}"
+            if zeroonetwo in special:
+                valence = special[zeroonetwo]
+        for n_gram in (threetwoone, threetwo, twoone):
+            if n_gram in boosters:
+                valence = valence + boosters[n_gram]
+        return valence
+
+    @staticmethod
+    def _compound(sentiments, text):
+        if not sentiments:
+            return 0.0
+        sum_s = float(sum(sentiments))
+        ep = min(text.count("!"), 4) * 0.292
+        qm_count = text.count("?")
+        qm = 0
+        if qm_count > 1:
+            qm = qm_count * 0.18 if qm_count <= 3 else 0.96
+        emphasis = ep + qm
+        if sum_s > 0:
+            sum_s += emphasis
+        elif sum_s < 0:
+            sum_s -= emphasis
+        norm = sum_s / math.sqrt(sum_s * sum_s + 15)
+        return round(max(-1.0, min(1.0, norm)), 4)
+
+
+def _but_check(sentiments, bi):
+    """VADER's "but" rule, including its lookup of each value by equality
+    (``list.index``), which rescales the first equal entry rather than the
+    current one when values repeat."""
+    for sentiment in sentiments:
+        si = sentiments.index(sentiment)
+        if si < bi:
+            sentiments.pop(si)
+            sentiments.insert(si, sentiment * 0.5)
+        elif si > bi:
+            sentiments.pop(si)
+            sentiments.insert(si, sentiment * 1.5)
+    return sentiments
+
+
+def score_batch(texts):
+    """Compound VADER scores for ``texts`` as a float64 NumPy array.
+
+    Uses a process-wide `BatchVader`, compiled on the first call.
+    """
+    global _DEFAULT
+    if _DEFAULT is None:
+        with _DEFAULT_LOCK:
+            if _DEFAULT is None:
+                _DEFAULT = BatchVader()
+    return _DEFAULT.score_batch(texts)
@@ -1,9 +1,12 @@
 """Make the app's `src/` modules importable in tests.
 
 The app runs with `streamlit run src/app.py`, which puts `src/` on the path.
-Tests replicate that so `from analyzer import ReviewAnalyzer` works.
+Tests replicate that so `from analyzer import ReviewAnalyzer` works. App runs
+also get a throwaway results store so they don't write into `data/`.
 """
 import os
 import sys
+import tempfile
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+os.environ.setdefault("SMARTREVIEW_STORE", tempfile.mkdtemp(prefix="smartreview-"))
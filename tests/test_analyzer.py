@@ -1,4 +1,9 @@
 """Tests for the review analysis engine (src/analyzer.py)."""
+import os
+import subprocess
+import sys
+import threading
+
 import pandas as pd
 import pytest
 
@@ -35,6 +40,37 @@ def test_backend_is_known(analyzer):
     assert analyzer.backend in {"vader", "textblob", "lexicon"}
 
 
+def test_backend_loads_on_first_score_not_at_import():
+    src = os.path.join(os.path.dirname(__file__), "..", "src")
+    code = ("import sys, analyzer\n"
+            "a = analyzer.ReviewAnalyzer()\n"
+            "assert analyzer._VADER is None and analyzer._BACKEND is None\n"
+            "a.analyze_sentiment('Love it')\n"
+            "assert analyzer._BACKEND is not None\n"
+            "assert (analyzer._VADER is not None) == (a.backend == 'vader')\n")
+    subprocess.run([sys.executable, "-c", code], check=True,
+                   env=dict(os.environ, PYTHONPATH=src))
+
+
+def test_vader_lexicon_is_built_once_across_threads(monkeypatch):
+    vader = pytest.importorskip("vaderSentiment.vaderSentiment")
+    import analyzer as analyzer_module
+    built = []
+    real = vader.SentimentIntensityAnalyzer
+
+    def counting():
+        built.append(1)
+        return real()
+    monkeypatch.setattr(vader, "SentimentIntensityAnalyzer", counting)
+    monkeypatch.setattr(analyzer_module, "_VADER", None)
+    threads = [threading.Thread(target=analyzer_module._vader) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(built) == 1
+
+
 def test_backwards_compatible_aliases():
     # Old code imported these names; they must still resolve to the engine.
     assert FinalAnalyzer is ReviewAnalyzer
@@ -145,6 +181,19 @@ def test_word_frequency_skips_stopwords_and_short_words(analyzer):
     assert freq.get("battery") == 2
 
 
+def test_word_frequency_matches_value_counts_order(analyzer):
+    df = pd.read_csv(os.path.join(os.path.dirname(__file__), "..", "data",
+                                  "sample", "sample_reviews.csv"))
+    words = list(analyzer._tokens(df[TEXT_COL].fillna("")))
+    expected = pd.Series(words).value_counts().head(20).to_dict()
+    assert list(analyzer.get_word_frequency(df, TEXT_COL, 20).items()) == \
+        list(expected.items())
+    # A budget the vocabulary fits in changes nothing.
+    assert list(analyzer.get_word_frequency(
+        df, TEXT_COL, 20, max_words=len(set(words))).items()) == \
+        list(expected.items())
+
+
 # --- Insights ----------------------------------------------------------------
 def test_insights_surface_top_issues_and_recommendations(analyzer):
     reviews = ["Broke, poor quality."] * 4 + ["Love it!"]
@@ -180,6 +229,31 @@ def test_draft_response_prioritises_most_severe_issue(analyzer):
     assert "safety" in draft.lower()
 
 
+def test_draft_replies_match_draft_response_row_by_row(analyzer):
+    masks = [0, 1, 2, 6, 64, 65, 127, 0, 0]
+    sentiment = [0, 1, 2, 1, 0, 2, 1, 1, 2]
+    products = ["Heater", None, "", float("nan"), "Mat", "Mat", "Heater", "Mat", "Mat"]
+    names = ["Sam", None, "Ana", "Sam", None, "Ana", "Sam", None, ""]
+    drafts = analyzer.draft_replies(sentiment, masks, products, names)
+    for i in range(len(masks)):
+        issues = [n for bit, n in enumerate(analyzer.ISSUE_RULES) if masks[i] >> bit & 1]
+        assert drafts[i] == analyzer.draft_response(
+            analyzer.SENTIMENT_LABELS[sentiment[i]], issues,
+            product=products[i], name=names[i] or "there")
+
+
+def test_reply_drafts_cover_negative_and_issue_tagged_reviews(analyzer):
+    df = _df(["Love it!", "Terrible, I hate it.", "Great mat, though delivery was delayed",
+              "It's okay."], ratings=[5, 1, 4, 3])
+    df["product"] = ["Mat", "Mat", "Heater", "Lamp"]
+    res = analyzer.analyze_text(df, TEXT_COL)
+    drafts = analyzer.reply_drafts(df, res, "product")
+    assert drafts.index.tolist() == [1, 2]
+    assert "Heater" in drafts.loc[2, "draft_response"]
+    assert drafts.loc[2, "issues"] == "Shipping Problems"
+    assert len(analyzer.reply_drafts(df, res, actionable_only=False)) == 4
+
+
 # --- Priority reviews & export -----------------------------------------------
 def test_priority_reviews_sorted_descending(analyzer):
     reviews = ["Love it!", "Dangerous, refund now!", "It's okay."]
@@ -198,3 +272,114 @@ def test_export_adds_analysis_columns(analyzer):
                 "analysis_date"):
         assert col in export.columns
     assert len(export) == len(df)
+
+
+def test_detected_rating_column_is_used(analyzer):
+    # The app passes whatever column analyze_columns detected, e.g. "stars".
+    df = pd.DataFrame({TEXT_COL: ["It's fine.", "It's fine."], "stars": [1, 5]})
+    res = analyzer.analyze_text(df, TEXT_COL, rating_column="stars")
+    assert res["priority_scores"][0] > res["priority_scores"][1]
+
+
+def test_urgent_indices_use_frame_labels(analyzer):
+    df = _df(["All good.", "I want a refund."])
+    df.index = [10, 20]
+    assert analyzer.analyze_text(df, TEXT_COL)["urgent_indices"] == [20]
+
+
+# --- Parallel scoring --------------------------------------------------------
+def test_parallel_scoring_is_bit_identical(monkeypatch):
+    df = pd.read_csv(os.path.join(os.path.dirname(__file__), "..", "data",
+                                  "sample", "sample_reviews.csv"))
+    serial = ReviewAnalyzer(cache_size=0).analyze_text(df, TEXT_COL)
+    parallel = ReviewAnalyzer(cache_size=0, workers=2)
+    monkeypatch.setattr(parallel, "PARALLEL_MIN_ROWS", 10)
+    try:
+        results = parallel.analyze_text(df, TEXT_COL)
+        results.pop("timings"), serial.pop("timings")
+        assert results == serial
+        assert parallel._pool is not None        # really went through the pool
+    finally:
+        parallel.close()
+
+
+def test_balanced_chunks_keep_order_and_cover_everything():
+    from analyzer import _balanced_chunks
+    texts = ["x" * n for n in [1, 500, 2, 3, 400, 5, 6, 7, 300, 1]]
+    chunks = _balanced_chunks(texts, 4)
+    assert [t for c in chunks for t in c] == texts
+    assert 1 < len(chunks) <= 4
+
+
+# --- Incremental re-analysis -------------------------------------------------
+def _sample():
+    return pd.read_csv(os.path.join(os.path.dirname(__file__), "..", "data",
+                                    "sample", "sample_reviews.csv"))
+
+
+def test_incremental_reuses_unchanged_rows(analyzer):
+    day1 = _sample().head(150)
+    first = analyzer.analyze_incremental(day1, TEXT_COL, None, "review_id")
+    assert first["reused_rows"] == 0 and first["recomputed_rows"] == 150
+
+    day2 = _sample().iloc[10:].copy()                 # 10 dropped, 30 new
+    day2.loc[day2.index[0], TEXT_COL] = "Dangerous, it caught fire. Refund!"
+    day2.loc[day2.index[1], "rating"] = 1             # rating change counts too
+    second = analyzer.analyze_incremental(day2, TEXT_COL, first, "review_id")
+    assert second["recomputed_rows"] == 30 + 2
+    assert second["reused_rows"] == len(day2) - 32
+
+    full = analyzer.analyze_text(day2, TEXT_COL)
+    full.pop("timings")
+    for key in full:
+        assert second[key] == full[key], key
+
+
+def test_tracked_full_analysis_feeds_incremental(analyzer):
+    day1 = _sample()
+    first = analyzer.track_rows(day1, analyzer.analyze_text(day1, TEXT_COL),
+                                TEXT_COL, "review_id")
+    day2 = day1.copy()
+    day2.loc[day2.index[0], TEXT_COL] = "Dangerous, it caught fire. Refund!"
+    second = analyzer.analyze_incremental(day2, TEXT_COL, first, "review_id")
+    assert second["recomputed_rows"] == 1
+    assert second["reused_rows"] == len(day2) - 1
+
+
+def test_incremental_needs_key_column(analyzer):
+    assert analyzer.analyze_incremental(_df(["ok"]), TEXT_COL, None, "id") is None
+
+
+# --- Stage timings -----------------------------------------------------------
+def test_analyze_text_reports_stage_timings(analyzer):
+    results = analyzer.analyze_text(_df(["Great!", "Broke, want a refund"]),
+                                    TEXT_COL)
+    stages = [t["stage"] for t in results["timings"]]
+    assert stages == ["deduplication", "sentiment", "keyword_matching",
+                      "priority", "aggregation"]
+    assert all(t["rows"] == 2 and t["seconds"] >= 0 for t in results["timings"])
+
+
+def test_stage_hook_sees_every_pipeline_stage():
+    seen = []
+    analyzer = ReviewAnalyzer(on_stage=seen.append, track_allocations=True)
+    df = _df(["Great!", "Broke, want a refund"])
+    results = analyzer.analyze_text(df, TEXT_COL)
+    analyzer.get_word_frequency(df, TEXT_COL)
+    analyzer.get_actionable_insights(df, results, TEXT_COL)
+    analyzer.get_priority_reviews(df, results, TEXT_COL)
+    assert [r["stage"] for r in seen][5:] == ["word_frequency", "insights",
+                                              "priority_sort"]
+    assert all(r["peak_kib"] is not None for r in seen)
+
+
+def test_profile_collects_nested_calls(analyzer):
+    df = _df(["Great!", "Broke"])
+    with analyzer.profile() as recorder:
+        results = analyzer.analyze_text(df, TEXT_COL)
+        analyzer.get_word_frequency(df, TEXT_COL)
+    assert recorder.records[:5] == results["timings"]
+    assert "word_frequency" in recorder.by_stage()
+    with analyzer.profile() as outside:
+        pass
+    assert outside.records == []
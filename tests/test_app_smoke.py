@@ -5,10 +5,14 @@ of bug — e.g. a NameError that only fires when you open Export — before it
 reaches the live site. Uses Streamlit's native AppTest harness.
 """
 import os
+import sqlite3
 
+import pytest
 from streamlit.testing.v1 import AppTest
 
 APP = os.path.join(os.path.dirname(__file__), "..", "src", "app.py")
+SAMPLE = os.path.join(os.path.dirname(__file__), "..", "data", "sample",
+                      "sample_reviews.csv")
 
 SECTIONS = ["Welcome", "Dashboard", "Priority & Replies",
             "Insights & Actions", "Analysis Details", "Export"]
@@ -16,7 +20,7 @@ SECTIONS = ["Welcome", "Dashboard", "Priority & Replies",
 # Every value the table filter can take, including the ones set by the
 # chart drill-downs (sentiment chips -> "Neutral", issue bar -> "Quality Issues").
 FILTERS = ["All", "Positive", "Negative", "Neutral", "With issues",
-           "Urgent", "Quality Issues"]
+           "Urgent", "Repeated", "Quality Issues"]
 
 
 def test_every_nav_section_renders():
@@ -37,3 +41,155 @@ def test_detail_filters_do_not_crash():
         at.session_state["detail_filter"] = flt
         at.run()
         assert not at.exception, f"detail_filter={flt!r} raised: {at.exception}"
+
+
+def test_recent_analysis_reopens():
+    """After one run the sample analysis is stored and can be reopened."""
+    at = AppTest.from_file(APP, default_timeout=60).run()
+    at.run()  # second run sees the stored analysis in the sidebar
+    at.sidebar.radio[0].set_value("Recent analyses").run()
+    assert not at.exception, f"reopen raised: {at.exception}"
+    at.session_state["nav"] = "Dashboard"
+    at.run()
+    assert not at.exception, f"Dashboard after reopen raised: {at.exception}"
+
+
+def test_recent_analyses_are_private_to_a_session():
+    """Another visitor's session doesn't list this session's analyses."""
+    at = AppTest.from_file(APP, default_timeout=60).run()
+    at.run()
+    assert "Recent analyses" in at.sidebar.radio[0].options
+    other = AppTest.from_file(APP, default_timeout=60).run()
+    assert not other.exception
+    assert "Recent analyses" not in other.sidebar.radio[0].options
+
+
+def test_sidebar_shows_timing_breakdown():
+    """The sidebar lists how long each analysis stage took."""
+    at = AppTest.from_file(APP, default_timeout=60).run()
+    assert not at.exception
+    assert any(e.label.startswith("Timing breakdown") for e in at.sidebar.expander)
+
+
+def test_dashboard_slices_by_product_and_date():
+    """Picking products and a date range re-slices the dashboard figures."""
+    at = AppTest.from_file(APP, default_timeout=60).run()
+    at.session_state["nav"] = "Dashboard"
+    at.run()
+    products = at.multiselect(key="dash_products")
+    products.set_value(products.options[:1]).run()
+    assert not at.exception, f"product filter raised: {at.exception}"
+    start, end = at.date_input(key="dash_dates").value
+    at.date_input(key="dash_dates").set_value((start, start)).run()
+    assert not at.exception, f"date filter raised: {at.exception}"
+
+
+def test_tables_send_one_page_at_a_time():
+    """Analysis Details and Priority & Replies render a single page of rows."""
+    at = AppTest.from_file(APP, default_timeout=60).run()
+    at.session_state["nav"] = "Analysis Details"
+    at.run()
+    at.selectbox(key="detail_size").set_value(25).run()
+    at.number_input(key="detail_page").set_value(2).run()
+    assert not at.exception
+    assert len(at.main.dataframe[-1].value) == 25
+    at.selectbox(key="detail_sort").set_value("rating").run()
+    assert not at.exception
+
+    at.session_state["nav"] = "Priority & Replies"
+    at.run()
+    at.selectbox(key="replies_size").set_value(5).run()
+    assert not at.exception
+    assert len(at.text_area) == 5
+    # The queue stops at the last review with a priority above zero.
+    last = at.number_input(key="replies_page")
+    last.set_value(last.max).run()
+    scores = [int(e.label.split("/", 1)[0]) for e in at.main.expander]
+    assert scores and min(scores) > 0
+
+
+def test_exports_are_prepared_on_request():
+    """Export files are only written when asked for, then offered for download."""
+    at = AppTest.from_file(APP, default_timeout=60).run()
+    at.session_state["nav"] = "Export"
+    at.run()
+    at.radio(key="export_format").set_value("csv.gz").run()
+    assert not at.exception
+    at.button(key="prepare_review_analysis").click().run()
+    assert not at.exception, f"prepare raised: {at.exception}"
+    at.run()  # the built file is reused: a download replaces the button
+    assert not any(b.key == "prepare_review_analysis" for b in at.button)
+
+
+@pytest.mark.parametrize("approximate", [False, True])
+def test_large_datasets_are_analysed_in_the_background(monkeypatch, tmp_path,
+                                                       approximate):
+    """A background job shows progress (or estimates) first, then the full
+    app renders."""
+    import streamlit as st
+
+    monkeypatch.setenv("SMARTREVIEW_BACKGROUND_ROWS", "50")
+    monkeypatch.setenv("SMARTREVIEW_STORE", str(tmp_path))  # nothing stored yet
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    at = AppTest.from_file(APP, default_timeout=60)
+    at.session_state["approximate"] = approximate
+    at.run()
+    assert not at.exception
+    job = at.session_state["analysis_job"]
+    assert (job.strata is not None) == approximate
+    assert job.wait(60) and job.error is None
+    at.session_state["nav"] = "Dashboard"
+    at.run()
+    assert not at.exception, f"Dashboard after the job raised: {at.exception}"
+    assert at.session_state["analysis_job"] is job  # not restarted
+    st.cache_data.clear()
+    st.cache_resource.clear()
+
+
+def test_reupload_after_a_background_job_is_incremental(monkeypatch, tmp_path):
+    """Rows scored by a background job are reused when the file comes back
+    with a few rows changed."""
+    import pandas as pd
+    import streamlit as st
+
+    monkeypatch.setenv("SMARTREVIEW_BACKGROUND_ROWS", "50")
+    monkeypatch.setenv("SMARTREVIEW_STORE", str(tmp_path))
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    at = AppTest.from_file(APP, default_timeout=60).run()
+    job = at.session_state["analysis_job"]
+    assert job.wait(60) and job.error is None
+    at.run()
+    assert not at.exception
+
+    # The same export again, with three reviews edited.
+    read_csv = pd.read_csv
+
+    def edited(path, *args, **kwargs):
+        df = read_csv(path, *args, **kwargs)
+        df.loc[:2, "review_text"] = "Dangerous, it caught fire. Refund!"
+        return df
+
+    monkeypatch.setattr(pd, "read_csv", edited)
+    st.cache_data.clear()  # reload the sample; keeps previous_results()
+    at.run()
+    assert not at.exception
+    reused = [c.value for c in at.sidebar.caption if c.value.startswith("Reused")]
+    assert reused and reused[0].startswith(f"Reused {len(read_csv(SAMPLE)) - 3:,}")
+    st.cache_data.clear()
+    st.cache_resource.clear()
+
+
+def test_score_cache_is_shared_and_kept_on_disk(monkeypatch, tmp_path):
+    """Reruns reuse one analyzer whose scores persist in the store dir."""
+    import streamlit as st
+
+    monkeypatch.setenv("SMARTREVIEW_STORE", str(tmp_path))
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    at = AppTest.from_file(APP, default_timeout=60).run()
+    assert not at.exception
+    with sqlite3.connect(tmp_path / "scores.sqlite") as db:
+        assert db.execute("SELECT COUNT(*) FROM scores").fetchone()[0] > 0
+    st.cache_resource.clear()
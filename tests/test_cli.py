@@ -0,0 +1,56 @@
+"""Tests for the headless batch CLI (src/cli.py)."""
+import json
+import os
+
+import pandas as pd
+import pytest
+
+import cli
+
+SAMPLE_CSV = os.path.join(os.path.dirname(__file__), "..", "data", "sample",
+                          "sample_reviews.csv")
+
+
+@pytest.mark.parametrize("ext", [".csv", ".csv.gz", ".parquet", ".jsonl"])
+def test_cli_streams_every_row_to_output(tmp_path, ext):
+    out = tmp_path / f"analysed{ext}"
+    summary = tmp_path / "summary.txt"
+    code = cli.main([SAMPLE_CSV, "-o", str(out), "--summary", str(summary),
+                     "--chunksize", "50"])
+    assert code == 0
+    if ext in (".csv", ".csv.gz"):
+        rows = pd.read_csv(out)
+    elif ext == ".parquet":
+        rows = pd.read_parquet(out)
+    else:
+        rows = pd.read_json(out, lines=True)
+    assert len(rows) == len(pd.read_csv(SAMPLE_CSV))
+    assert {"predicted_sentiment", "priority_score", "issues_detected"} <= set(rows)
+    assert "Total reviews analysed: 180" in summary.read_text()
+
+
+def test_cli_multiple_inputs_and_json(tmp_path, capsys):
+    out = tmp_path / "all.csv"
+    code = cli.main([SAMPLE_CSV, SAMPLE_CSV, "-o", str(out), "--json",
+                     "--cache-dir", str(tmp_path / "cache")])
+    assert code == 0
+    captured = capsys.readouterr()
+    assert json.loads(captured.out)["total_reviews"] == 360
+    assert "rows/s" in captured.err
+    assert set(pd.read_csv(out)["source_file"]) == {"sample_reviews.csv"}
+    assert os.path.exists(tmp_path / "cache" / "scores.sqlite")
+
+
+def test_cli_writes_reply_drafts(tmp_path):
+    drafts = tmp_path / "drafts.jsonl"
+    assert cli.main([SAMPLE_CSV, "--drafts", str(drafts), "--chunksize", "50"]) == 0
+    rows = pd.read_json(drafts, lines=True)
+    assert len(rows) and rows["draft_response"].str.startswith("Hi ").all()
+    assert ((rows["sentiment"] == "Negative") | (rows["issues"] != "None")).all()
+
+
+def test_cli_reports_missing_text_column(tmp_path, capsys):
+    bad = tmp_path / "bad.csv"
+    pd.DataFrame({"n": [1, 2]}).to_csv(bad, index=False)
+    assert cli.main([str(bad)]) == 1
+    assert "text column" in capsys.readouterr().err
@@ -0,0 +1,112 @@
+"""Tests for the dashboard aggregation cube (src/cube.py)."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from analyzer import ReviewAnalyzer
+from cube import AnalysisCube, week_ending
+from synthetic import synthetic_reviews
+
+TEXT_COL = "review_text"
+
+
+@pytest.fixture(scope="module")
+def analysed():
+    analyzer = ReviewAnalyzer()
+    df = synthetic_reviews(3000, seed=8)
+    results = analyzer.analyze_text(df, TEXT_COL)
+    return analyzer, df, results, analyzer.build_cube(df, results, "product", "date")
+
+
+def test_cube_totals_match_the_summary(analysed):
+    _, df, results, cube = analysed
+    assert len(cube) < len(df)
+    totals = cube.totals()
+    cols = results.columns
+    for key in ("total_reviews", "positive_count", "negative_count", "neutral_count"):
+        assert totals[key] == results[key]
+    assert totals["with_issues"] == int((cols["issues"] != 0).sum())
+    assert totals["urgent"] == int(cols["urgent"].sum())
+    assert totals["needs_reply"] == int((cols["priority"] > 50).sum())
+    assert cube.issue_counts() == results["issue_summary"]
+    assert list(cube.issue_counts()) == list(results["issue_summary"])
+
+
+def test_weekly_matches_a_grouper_over_rows(analysed):
+    analyzer, df, results, cube = analysed
+    rows = pd.DataFrame({
+        "date": pd.to_datetime(df["date"]),
+        "sentiment": pd.Categorical.from_codes(results.columns["sentiment"],
+                                               analyzer.SENTIMENT_LABELS)})
+    expected = (rows.groupby([pd.Grouper(key="date", freq="W"), "sentiment"],
+                             observed=True).size().reset_index(name="count"))
+    weekly = cube.weekly()
+    assert weekly["week"].tolist() == expected["date"].tolist()
+    assert weekly["sentiment"].tolist() == expected["sentiment"].tolist()
+    assert weekly["count"].tolist() == expected["count"].tolist()
+
+
+def test_slices_match_filtered_rows(analysed):
+    analyzer, df, _, cube = analysed
+    products = cube.products[:2]
+    view = cube.slice(products, "2025-03-05", "2025-04-20")
+    # Weeks overlapping the range: Monday 2025-03-03 .. Sunday 2025-04-20.
+    dates = pd.to_datetime(df["date"])
+    keep = (df["product"].isin(products)
+            & (dates >= "2025-03-03") & (dates <= "2025-04-20"))
+    expected = analyzer.analyze_text(df[keep], TEXT_COL)
+    totals = view.totals()
+    assert totals["total_reviews"] == keep.sum()
+    assert totals["negative_count"] == expected["negative_count"]
+    assert view.issue_counts() == expected["issue_summary"]
+
+
+def test_full_date_range_keeps_undated_reviews():
+    analyzer = ReviewAnalyzer()
+    df = synthetic_reviews(180, seed=9)
+    df.loc[::3, "date"] = None
+    df.loc[5, "date"] = "not a date"
+    cube = analyzer.build_cube(df, analyzer.analyze_text(df, TEXT_COL),
+                               "product", "date")
+    first, last = cube.week_range()
+    everything = cube.slice(None, first - pd.Timedelta(days=6), last)
+    assert everything.totals()["total_reviews"] == len(df)
+    dated = pd.to_datetime(df["date"], errors="coerce").notna()
+    narrowed = cube.slice(None, first + pd.Timedelta(days=1), last)
+    assert narrowed.totals()["total_reviews"] < dated.sum()
+
+
+def test_cube_without_dimensions():
+    analyzer = ReviewAnalyzer()
+    df = pd.DataFrame({TEXT_COL: ["Great!", "Broke, refund please", "Great!"]})
+    cube = analyzer.build_cube(df, analyzer.analyze_text(df, TEXT_COL))
+    assert cube.products == [] and cube.week_range() is None
+    assert cube.weekly().empty
+    assert cube.slice(["Mug"]).totals()["total_reviews"] == 0
+    assert cube.sentiment_counts() == {"Positive": 2, "Negative": 1, "Neutral": 0}
+
+
+def test_week_ending_is_the_following_sunday():
+    weeks = week_ending(["2025-01-05", "2025-01-06", "not a date"])
+    assert weeks[0] == np.datetime64("2025-01-05")
+    assert weeks[1] == np.datetime64("2025-01-12")
+    assert np.isnat(weeks[2])
+
+
+def test_merged_chunk_cubes_equal_the_whole(analysed):
+    analyzer, df, results, cube = analysed
+    cols = results.columns
+    merged = None
+    for start in (2000, 0, 1000):  # any order
+        rows = slice(start, start + 1000)
+        part = AnalysisCube.build({k: v[rows] for k, v in cols.items()},
+                                  analyzer.SENTIMENT_LABELS, analyzer.ISSUE_RULES,
+                                  df["product"].iloc[rows], df["date"].iloc[rows],
+                                  positions=np.arange(start, start + 1000))
+        merged = part if merged is None else merged.merge(part)
+    assert merged.products == cube.products
+    assert merged.totals() == cube.totals()
+    assert merged.issue_counts() == cube.issue_counts()
+    pd.testing.assert_frame_equal(merged.weekly(), cube.weekly())
+    picked = cube.products[:2]
+    assert merged.slice(picked).totals() == cube.slice(picked).totals()
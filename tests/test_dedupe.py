@@ -0,0 +1,98 @@
+"""Tests for duplicate grouping (src/dedupe.py) and its use before scoring."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from analyzer import ReviewAnalyzer
+from dedupe import (DuplicateGroups, find_duplicates, minhash_signatures,
+                    near_duplicate_labels, normalize)
+from synthetic import synthetic_reviews
+
+TEXT_COL = "review_text"
+TEXTS = ["Great product", "great   PRODUCT", "Great product",
+         "Terrible, broke after one day and I want a refund now",
+         "Terrible, broke after one day and I want a refund now please",
+         "Totally unrelated words about running shoes"]
+
+
+def test_groups_are_numbered_by_first_appearance():
+    groups = DuplicateGroups([0, 1, 0, 2, 1, 0])
+    assert groups.first.tolist() == [0, 1, 3]
+    assert groups.sizes.tolist() == [3, 2, 1]
+    assert groups.row_sizes().tolist() == [3, 2, 3, 1, 2, 3]
+    assert groups.duplicate_rows() == 3
+
+
+def test_modes_merge_progressively_more():
+    exact = find_duplicates(TEXTS, "exact")
+    normalized = find_duplicates(TEXTS, "normalized")
+    near = find_duplicates(TEXTS, "near", threshold=0.7)
+    assert exact.labels.tolist() == [0, 1, 0, 2, 3, 4]
+    assert normalized.labels.tolist() == [0, 0, 0, 1, 2, 3]
+    assert near.labels.tolist() == [0, 0, 0, 1, 1, 2]
+    assert normalize("  Mixed\tCASE \n text ") == "mixed case text"
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        find_duplicates(TEXTS, "fuzzy")
+    with pytest.raises(ValueError):
+        ReviewAnalyzer(dedupe="fuzzy")
+
+
+def test_minhash_estimates_jaccard():
+    a = " ".join(f"w{i}" for i in range(100))
+    b = " ".join(f"w{i}" for i in range(50, 150))   # bigram Jaccard ~ 1/3
+    sig = minhash_signatures([a, a, b], num_perm=256)
+    assert (sig[0] == sig[1]).all()
+    assert abs((sig[0] == sig[2]).mean() - 49 / 149) < 0.1
+
+
+def test_near_duplicates_need_the_threshold():
+    docs = ["the strap broke after two days of light use",
+            "the strap broke after two days of light use sadly",
+            "shipping was slow but the seller was helpful"]
+    assert near_duplicate_labels(docs, threshold=0.7).tolist() == [0, 0, 2]
+    assert near_duplicate_labels(docs, threshold=1.0).tolist() == [0, 1, 2]
+
+
+def test_exact_dedupe_leaves_results_unchanged():
+    df = synthetic_reviews(1500, seed=11)
+    deduped = ReviewAnalyzer(cache_size=0).analyze_text(df, TEXT_COL)
+    rows = ReviewAnalyzer(cache_size=0)
+    per_row = [rows.triage([{"text": t, "rating": r}])[0]
+               for t, r in zip(df[TEXT_COL].head(200), df["rating"].head(200))]
+    assert deduped["sentiment_scores"][:200] == [r["score"] for r in per_row]
+    assert deduped["priority_scores"][:200] == [r["priority"] for r in per_row]
+    assert deduped["issues_found"][:200] == [r["issues"] for r in per_row]
+
+
+def test_results_report_duplicate_clusters():
+    df = pd.DataFrame({TEXT_COL: ["Buy now!!"] * 4 + ["Fine.", "Fine.", "Odd one"]})
+    results = ReviewAnalyzer().analyze_text(df, TEXT_COL)
+    assert results.columns["duplicates"].tolist() == [4, 4, 4, 4, 2, 2, 1]
+    assert results["duplicate_groups"] == 2
+    assert results["duplicate_rows"] == 6
+
+
+def test_normalized_mode_broadcasts_the_representative():
+    df = pd.DataFrame({TEXT_COL: ["I LOVE it, great!", "i love it,   GREAT!"],
+                       "rating": [5, 1]})
+    results = ReviewAnalyzer(dedupe="normalized").analyze_text(df, TEXT_COL)
+    exact = ReviewAnalyzer().analyze_text(df.iloc[:1], TEXT_COL)
+    cols = results.columns
+    # Same text score, but each row keeps its own rating adjustment.
+    text_score = (cols["score"] - 0.35 * np.array([1.0, -1.0])) / 0.65
+    assert text_score[0] == pytest.approx(text_score[1])
+    assert cols["score"][0] == exact.columns["score"][0]
+    assert cols["duplicates"].tolist() == [2, 2]
+
+
+def test_incremental_reports_clusters_over_the_whole_frame():
+    analyzer = ReviewAnalyzer()
+    df = pd.DataFrame({"review_id": [1, 2, 3], TEXT_COL: ["Same", "Same", "Other"]})
+    first = analyzer.analyze_incremental(df, TEXT_COL)
+    df2 = pd.concat([df, pd.DataFrame({"review_id": [4], TEXT_COL: ["Same"]})])
+    second = analyzer.analyze_incremental(df2, TEXT_COL, previous=first)
+    assert second["recomputed_rows"] == 1
+    assert second.columns["duplicates"].tolist() == [3, 3, 1, 3]
@@ -0,0 +1,74 @@
+"""Tests for the compact per-row results (src/encoded_results.py)."""
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analyzer import ReviewAnalyzer
+from encoded_results import EncodedResults, issue_counts
+from synthetic import synthetic_reviews
+
+TEXT_COL = "review_text"
+
+
+@pytest.fixture(scope="module")
+def encoded():
+    df = synthetic_reviews(2000, seed=5).set_index("review_id")
+    return df, ReviewAnalyzer().analyze_text(df, TEXT_COL)
+
+
+def test_columns_use_compact_dtypes(encoded):
+    _, res = encoded
+    assert isinstance(res, EncodedResults)
+    dtypes = {k: v.dtype for k, v in res.columns.items()}
+    assert dtypes == {"sentiment": np.int8, "score": np.float64,
+                      "priority": np.uint8, "issues": np.uint16,
+                      "urgent": np.bool_, "duplicates": np.uint32}
+
+
+def test_decoded_keys_match_a_row_by_row_decode(encoded):
+    df, res = encoded
+    analyzer = ReviewAnalyzer()
+    sentiments = res["sentiments"]
+    issues = res["issues_found"]
+    for pos in range(0, len(df), 97):
+        text = df[TEXT_COL].iloc[pos]
+        assert issues[pos] == analyzer.detect_issues(text)[0]
+        assert sentiments[pos] == ReviewAnalyzer.SENTIMENT_LABELS[
+            res.columns["sentiment"][pos]]
+        assert res.row(pos)["issues"] == issues[pos]
+    assert res["urgent_indices"] == df.index[res.columns["urgent"]].tolist()
+    assert all(type(p) is int for p in res["priority_scores"][:5])
+
+
+def test_mapping_behaves_like_the_old_dict(encoded):
+    _, res = encoded
+    assert "sentiments" in res and "issue_summary" in res
+    assert set(dict(res)) == set(res.keys())
+    with pytest.raises(TypeError):
+        res["sentiments"] = []
+    res["note"] = "extra"
+    assert res.pop("note") == "extra"
+
+
+def test_pickle_round_trip(encoded):
+    _, res = encoded
+    again = pickle.loads(pickle.dumps(res))
+    assert again == res
+    assert again["issues_found"] == res["issues_found"]
+
+
+def test_issue_counts_keep_first_seen_order():
+    masks = np.array([0, 0b100, 0b011, 0b001])
+    assert list(issue_counts(masks, ["a", "b", "c"]).items()) == [
+        ("c", 1), ("a", 2), ("b", 1)]
+
+
+def test_plain_results_dicts_still_encode():
+    analyzer = ReviewAnalyzer()
+    df = pd.DataFrame({TEXT_COL: ["Broke after a day, refund please", "Great!"]})
+    res = analyzer.analyze_text(df, TEXT_COL)
+    plain = {k: res[k] for k in res}
+    for name, column in analyzer.result_columns(df, plain).items():
+        assert np.array_equal(column, res.columns[name]), name
@@ -0,0 +1,93 @@
+"""Tests for stratified sampling and KPI estimates (src/estimates.py)."""
+import numpy as np
+import pytest
+
+from analyzer import ReviewAnalyzer
+from estimates import estimate_kpis, strata_codes, stratified_order
+from jobs import AnalysisJob
+from synthetic import synthetic_reviews
+
+TEXT_COL = "review_text"
+
+
+@pytest.fixture(scope="module")
+def analysed():
+    analyzer = ReviewAnalyzer()
+    df = synthetic_reviews(20_000, seed=6)
+    results = analyzer.analyze_text(df, TEXT_COL, "rating")
+    codes = strata_codes(len(df), df["product"], df["rating"])
+    return analyzer, df, results.columns, codes
+
+
+def _estimate(analyzer, codes, columns, positions):
+    return estimate_kpis(codes, positions,
+                         {k: v[positions] for k, v in columns.items()},
+                         analyzer.SENTIMENT_LABELS, analyzer.ISSUE_RULES)
+
+
+def test_strata_codes_group_equal_keys():
+    codes = strata_codes(5, ["a", "b", "a", None, None], [1, 1, 1, 2, 2])
+    assert codes.tolist() == [0, 1, 0, 2, 2]
+    assert strata_codes(3).tolist() == [0, 0, 0]
+
+
+def test_strata_codes_bin_fractional_ratings():
+    rng = np.random.default_rng(3)
+    ratings = np.round(rng.uniform(1, 5, 1000), 2)  # 4.3, 4.35, ...
+    products = rng.choice(["Mug", "Lamp"], 1000)
+    codes = strata_codes(1000, products, ratings)
+    assert codes.max() + 1 <= 2 * 5
+    stars = np.round(ratings)
+    for code in np.unique(codes):
+        assert len(set(stars[codes == code])) == 1
+
+
+def test_strata_codes_drop_keys_past_the_cap():
+    products = [f"P{i % 40}" for i in range(400)]
+    ratings = [i % 7 for i in range(400)]
+    codes = strata_codes(400, products, ratings, max_strata=100)
+    assert codes.max() + 1 == 40  # product only
+    assert strata_codes(400, products, max_strata=10).tolist() == [0] * 400
+
+
+def test_stratified_order_covers_every_stratum_early():
+    codes = np.r_[np.zeros(5000, dtype=int), 1, 2, np.full(995, 3)]
+    order = stratified_order(codes, seed=1)
+    assert sorted(order.tolist()) == list(range(len(codes)))
+    assert set(codes[order[:8]]) == {0, 1, 2, 3}  # two of each, singles once
+    # After that, any prefix is close to proportional.
+    share = np.bincount(codes[order[:2000]], minlength=4) / 2000
+    assert abs(share[0] - 5000 / 5997) < 0.01
+
+
+def test_estimates_are_exact_once_every_row_is_scored(analysed):
+    analyzer, df, columns, codes = analysed
+    totals, issues = _estimate(analyzer, codes, columns, np.arange(len(df)))
+    assert totals["negative_count"] == (int((columns["sentiment"] == 1).sum()),) * 3
+    assert totals["urgent"].low == totals["urgent"].high == columns["urgent"].sum()
+    assert all(e.low == e.value == e.high for e in issues.values())
+
+
+def test_intervals_cover_the_truth_and_shrink(analysed):
+    analyzer, df, columns, codes = analysed
+    truth, truth_issues = _estimate(analyzer, codes, columns, np.arange(len(df)))
+    order = stratified_order(codes, seed=0)
+    small, _ = _estimate(analyzer, codes, columns, order[:1000])
+    large, issues = _estimate(analyzer, codes, columns, order[:5000])
+    for key in ("positive_count", "negative_count", "with_issues", "urgent"):
+        assert large[key].low <= truth[key].value <= large[key].high, key
+        assert (large[key].high - large[key].low
+                < small[key].high - small[key].low), key
+    for name, e in issues.items():
+        assert e.low <= truth_issues[name].value <= e.high, name
+
+
+def test_stratified_job_returns_rows_in_file_order(analysed):
+    analyzer, df, columns, codes = analysed
+    job = AnalysisJob(analyzer, df, TEXT_COL, "rating", "product", "date",
+                      chunksize=4000, strata=codes).start()
+    assert job.wait(60) and job.error is None
+    for key, values in columns.items():
+        np.testing.assert_array_equal(job.columns[key], values, err_msg=key)
+    totals, _ = job.estimates()
+    assert totals["positive_count"].value == (columns["sentiment"] == 0).sum()
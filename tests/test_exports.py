@@ -0,0 +1,95 @@
+"""Tests for chunked, cached export files (src/exports.py)."""
+import os
+
+import pandas as pd
+import pytest
+
+from analyzer import ReviewAnalyzer
+from exports import EXPORT_FORMATS, ChunkWriter, ExportCache, write_chunks
+
+
+@pytest.fixture(scope="module")
+def analysed():
+    df = pd.DataFrame({
+        "review_text": ["Broke after a day, want a refund", "Love it!",
+                        "Arrived late and too small", "Love it!", "Fine."] * 4,
+        "rating": [1, 5, 2, 5, 3] * 4,
+    })
+    analyzer = ReviewAnalyzer()
+    return analyzer, df, analyzer.analyze_text(df, "review_text", "rating")
+
+
+def _read(path, fmt):
+    if fmt == "parquet":
+        return pd.read_parquet(path)
+    if fmt == "jsonl":
+        return pd.read_json(path, lines=True)
+    return pd.read_csv(path)  # infers gzip from the .gz suffix
+
+
+def test_iter_export_chunks_match_export_analysis(analysed):
+    analyzer, df, results = analysed
+    whole = analyzer.export_analysis(df, results)
+    chunks = list(analyzer.iter_export(df, results, chunksize=6))
+    assert [len(c) for c in chunks] == [6, 6, 6, 2]
+    pd.testing.assert_frame_equal(pd.concat(chunks), whole)
+    assert whole["issues_detected"].iloc[4] == "None"
+
+
+@pytest.mark.parametrize("fmt", list(EXPORT_FORMATS))
+def test_written_exports_round_trip(tmp_path, analysed, fmt):
+    analyzer, df, results = analysed
+    path = tmp_path / f"out{EXPORT_FORMATS[fmt].extension}"
+    rows = write_chunks(str(path), analyzer.iter_export(df, results, 7), fmt)
+    back = _read(path, fmt)
+    assert rows == len(back) == len(df)
+    assert back["predicted_sentiment"].tolist() == results["sentiments"]
+    assert back["priority_score"].tolist() == list(results["priority_scores"])
+    assert not [p for p in os.listdir(tmp_path) if p.endswith(".tmp")]
+
+
+def test_parquet_writer_handles_mixed_object_columns(tmp_path):
+    path = tmp_path / "mixed.parquet"
+    writer = ChunkWriter(str(path), "parquet")
+    writer.write(pd.DataFrame({"id": ["a1", 2, 3.5]}))
+    writer.close()
+    assert pd.read_parquet(path)["id"].tolist() == ["a1", "2", "3.5"]
+
+
+def test_cache_builds_once_per_fingerprint_and_format(tmp_path):
+    cache = ExportCache(str(tmp_path))
+    calls = []
+
+    def chunks():
+        calls.append(1)
+        yield pd.DataFrame({"x": [1, 2]})
+
+    assert cache.get("abc", "report", "csv") is None
+    path = cache.build("abc", "report", "csv", chunks())
+    assert cache.get("abc", "report", "csv") == path
+    assert cache.build("abc", "report", "csv", chunks()) == path
+    assert len(calls) == 1
+    cache.build("abc", "report", "csv.gz", chunks())
+    cache.build("def", "report", "csv", chunks())
+    assert len(calls) == 3
+
+
+def test_failed_build_leaves_nothing_behind(tmp_path):
+    cache = ExportCache(str(tmp_path))
+
+    def chunks():
+        yield pd.DataFrame({"x": [1]})
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        cache.build("abc", "report", "csv", chunks())
+    assert os.listdir(tmp_path) == []
+
+
+def test_cache_keeps_only_recent_files(tmp_path):
+    cache = ExportCache(str(tmp_path), max_files=2)
+    for i, name in enumerate(["a", "b", "c"]):
+        path = cache.build(name, "report", "csv", [pd.DataFrame({"x": [1]})])
+        os.utime(path, (i, i))
+    assert cache.get("a", "report", "csv") is None
+    assert cache.get("c", "report", "csv") is not None
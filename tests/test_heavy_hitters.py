@@ -0,0 +1,47 @@
+"""Tests for the bounded word-count summary (src/heavy_hitters.py)."""
+from collections import Counter
+
+import pytest
+
+from analyzer import ReviewAnalyzer
+from heavy_hitters import MisraGries, top_counts
+from synthetic import synthetic_reviews
+
+
+def test_exact_while_vocabulary_fits():
+    counts = Counter("a b a c b a d".split())
+    summary = MisraGries(4, counts)
+    assert dict(summary) == dict(counts)
+    assert summary.error == 0 and summary.total == 7
+
+
+def test_undercount_is_bounded_and_heavy_hitters_survive():
+    words = ["hot"] * 500 + ["warm"] * 200 + [f"w{i}" for i in range(2000)]
+    truth = Counter(words)
+    summary = MisraGries(20)
+    for start in range(0, len(words), 300):
+        summary.update(Counter(words[start:start + 300]))
+    assert len(summary) <= 20
+    assert summary.error <= summary.total / 21
+    for word in ("hot", "warm"):
+        assert truth[word] - summary.error <= summary[word] <= truth[word]
+
+
+def test_merged_summaries_keep_the_guarantee():
+    df = synthetic_reviews(4000, seed=3)
+    analyzer = ReviewAnalyzer()
+    truth = analyzer.word_counts(df["review_text"])
+    parts = [analyzer.word_counts(df["review_text"].iloc[i:i + 1000], 30)
+             for i in range(0, len(df), 1000)]
+    merged = MisraGries(30)
+    for part in parts:
+        merged.update(part)
+    assert merged.total == sum(truth.values())
+    assert set(top_counts(merged, 5)) == set(top_counts(truth, 5))
+    for word, count in merged.items():
+        assert truth[word] - merged.error <= count <= truth[word]
+
+
+def test_capacity_must_be_positive():
+    with pytest.raises(ValueError):
+        MisraGries(0)
@@ -0,0 +1,122 @@
+"""Tests for CSV reading and column detection (src/ingest.py)."""
+import codecs
+import io
+
+import pandas as pd
+
+from analyzer import ReviewAnalyzer
+from ingest import analysis_columns, analyze_columns, read_csv_robust, sniff_encoding
+
+HEADER = "review_id,date,product,rating,review_text,internal_note,helpful_votes\n"
+
+
+class Upload:
+    """Stand-in for Streamlit's UploadedFile."""
+
+    def __init__(self, raw):
+        self._raw = raw
+
+    def getvalue(self):
+        return self._raw
+
+
+def _csv(rows=50, encoding="utf-8"):
+    lines = [f"R{i},2025-01-{i % 28 + 1:02d},Mug,{i % 5 + 1},"
+             f"Review number {i} about the mug,note {i},{i}\n" for i in range(rows)]
+    return (HEADER + "".join(lines)).encode(encoding)
+
+
+def test_sniff_encoding():
+    assert sniff_encoding("café".encode()) == "utf-8"
+    assert sniff_encoding(codecs.BOM_UTF8 + b"a,b\n") == "utf-8-sig"
+    late = b"x" * 5000 + "café".encode("latin-1")
+    assert sniff_encoding(late, block=1024) == "latin-1"
+    # A multi-byte character split across blocks is still UTF-8.
+    assert sniff_encoding("é".encode() * 1000, block=1023) == "utf-8"
+
+
+def test_reads_only_analysis_columns():
+    df, warns = read_csv_robust(Upload(_csv()))
+    assert warns == []
+    assert list(df.columns) == ["review_id", "date", "product", "rating",
+                                "review_text"]
+    assert len(df) == 50
+    full, _ = read_csv_robust(Upload(_csv()), prune_columns=False)
+    assert "internal_note" in full.columns
+    pd.testing.assert_frame_equal(df, full[df.columns])
+
+
+def test_latin1_file_is_read_with_a_warning():
+    raw = _csv().replace(b"mug,note 3", "mug café,note 3".encode("latin-1"))
+    df, warns = read_csv_robust(Upload(raw))
+    assert warns == ["File wasn't UTF-8 — read it as latin-1."]
+    assert df["review_text"].str.contains("café").any()
+
+
+def test_bom_is_not_a_warning():
+    df, warns = read_csv_robust(Upload(codecs.BOM_UTF8 + _csv()))
+    assert warns == [] and df.columns[0] == "review_id"
+
+
+def test_malformed_rows_are_skipped_with_a_warning():
+    raw = _csv(10) + b"R99,2025-02-01,Mug,1,too,many,fields,here,x\n" + \
+        _csv(5).split(b"\n", 1)[1]
+    df, warns = read_csv_robust(Upload(raw))
+    assert warns == ["Some malformed rows were skipped during import."]
+    assert len(df) == 15
+
+
+def test_unusable_files():
+    assert read_csv_robust(Upload(b""))[0] is None
+    df, warns = read_csv_robust(Upload(HEADER.encode() + b",,,,,,\n"))
+    assert df is None and warns == ["This file has no usable rows."]
+
+
+def test_column_detection():
+    df, _ = read_csv_robust(Upload(_csv()), prune_columns=False)
+    info = analyze_columns(df)
+    assert info["text_column"] == "review_text"
+    assert info["rating_column"] == "rating"
+    assert info["id_column"] == "review_id"
+    assert info["product_column"] == "product"
+    assert info["date_column"] == "date"
+    assert analysis_columns(df.drop(columns=["review_text"])) is None
+
+
+def test_missing_text_reads_as_nan():
+    raw = _csv(3) + b"R9,2025-01-09,Mug,3,,,\n"
+    for prune in (True, False):
+        df, _ = read_csv_robust(Upload(raw), prune_columns=prune)
+        assert df["review_text"].isna().sum() == 1
+        assert df["review_text"].astype(str).iloc[-1] == "nan"  # as pd.read_csv
+        assert df.isna().equals(pd.read_csv(io.BytesIO(raw))[df.columns].isna())
+
+
+def test_pruning_does_not_change_the_analysis():
+    raw = _csv(40) + b"R98,2025-02-01,Mug,1,,,\n" + \
+        b"R99,2025-02-02,Mug,1,Broke after a day - refund please,,\n"
+    analyzer = ReviewAnalyzer()
+    exports = []
+    for prune in (True, False):
+        df, _ = read_csv_robust(Upload(raw), prune_columns=prune)
+        info = analyze_columns(df)
+        results = analyzer.analyze_text(df, info["text_column"],
+                                        info["rating_column"])
+        exports.append(analyzer.export_analysis(df, results)
+                       .drop(columns="analysis_date"))
+    pruned, full = exports
+    assert "internal_note" in full.columns and "internal_note" not in pruned
+    pd.testing.assert_frame_equal(pruned, full[pruned.columns])
+
+
+def test_duplicate_and_blank_headers_are_renamed_like_pandas():
+    raw = (b"review_id,review_text,review_text,,rating\n"
+           b"R1,Broke after a day,Second copy,x,1\n"
+           b"R2,Love it so much,Another copy,y,5\n")
+    df, _ = read_csv_robust(Upload(raw), prune_columns=False)
+    expected = pd.read_csv(io.BytesIO(raw), engine="c")
+    assert list(df.columns) == list(expected.columns) == [
+        "review_id", "review_text", "review_text.1", "Unnamed: 3", "rating"]
+    info = analyze_columns(df)
+    assert info["text_column"] in ("review_text", "review_text.1")
+    assert info["rating_column"] == "rating"
@@ -0,0 +1,83 @@
+"""Tests for background analysis jobs (src/jobs.py)."""
+import threading
+
+import numpy as np
+import pytest
+
+from analyzer import ReviewAnalyzer
+from jobs import AnalysisJob
+from synthetic import synthetic_reviews
+
+TEXT_COL = "review_text"
+
+
+@pytest.fixture(scope="module")
+def data():
+    analyzer = ReviewAnalyzer()
+    df = synthetic_reviews(2500, seed=4)
+    df.loc[::10, TEXT_COL] = df.loc[0, TEXT_COL]  # duplicates across chunks
+    return analyzer, df
+
+
+def test_job_results_equal_a_single_analysis(data):
+    analyzer, df = data
+    job = AnalysisJob(analyzer, df, TEXT_COL, "rating", "product", "date",
+                      chunksize=600).start()
+    assert job.wait(60)
+    assert job.error is None and not job.cancelled
+    expected = analyzer.analyze_text(df, TEXT_COL, "rating")
+    for key, values in expected.columns.items():
+        np.testing.assert_array_equal(job.columns[key], values, err_msg=key)
+    assert job.columns["duplicates"][0] == 250
+    cube = analyzer.build_cube(df, expected, "product", "date")
+    assert job.cube.totals() == cube.totals()
+    progress = job.progress()
+    assert progress.rows == progress.total == len(df)
+    assert progress.eta == 0 and progress.rate > 0
+    assert {"sentiment", "aggregation"} <= {t["stage"] for t in job.timings}
+
+
+class _GatedAnalyzer(ReviewAnalyzer):
+    """Waits for the test's go-ahead before scoring each chunk."""
+
+    def __init__(self):
+        super().__init__()
+        self.gate = threading.Semaphore(0)
+
+    def analyze_text(self, df, text_column, rating_column=None):
+        self.gate.acquire()
+        return super().analyze_text(df, text_column, rating_column)
+
+
+def test_partial_results_are_published_per_chunk():
+    analyzer = _GatedAnalyzer()
+    df = synthetic_reviews(900, seed=5)
+    job = AnalysisJob(analyzer, df, TEXT_COL, chunksize=300).start()
+    assert job.progress().rows == 0 and job.cube is None
+    analyzer.gate.release()
+    while job.progress().rows < 300:
+        job.wait(0.01)
+    assert job.cube.totals()["total_reviews"] == 300
+    assert not job.done and job.progress().eta is not None
+    analyzer.gate.release(2)
+    assert job.wait(30) and job.cube.totals()["total_reviews"] == 900
+
+
+def test_cancelled_job_stops_without_results():
+    analyzer = _GatedAnalyzer()
+    df = synthetic_reviews(900, seed=5)
+    job = AnalysisJob(analyzer, df, TEXT_COL, chunksize=300).start()
+    analyzer.gate.release()
+    job.cancel()
+    analyzer.gate.release(2)
+    assert job.wait(30)
+    assert job.cancelled and job.columns is None
+    assert job.progress().rows <= 300
+
+
+def test_errors_are_kept_for_the_caller():
+    analyzer = ReviewAnalyzer()
+    df = synthetic_reviews(10, seed=5)
+    job = AnalysisJob(analyzer, df, "no_such_column").start()
+    assert job.wait(30)
+    assert job.error is not None and job.columns is None
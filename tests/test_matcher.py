@@ -0,0 +1,60 @@
+"""Tests for the compiled keyword matcher (src/matcher.py)."""
+import os
+import random
+
+import pandas as pd
+import pytest
+
+from analyzer import ReviewAnalyzer
+from matcher import PhraseMatcher
+
+SAMPLE_CSV = os.path.join(os.path.dirname(__file__), "..", "data", "sample",
+                          "sample_reviews.csv")
+
+
+def _naive(groups, text):
+    """The substring semantics the matcher must reproduce."""
+    text_lower = str(text).lower()
+    return [label for label, phrases in groups.items()
+            if any(p in text_lower for p in phrases)]
+
+
+def test_overlapping_and_nested_phrases():
+    groups = {"a": ["he", "hers"], "b": ["she"], "c": ["his"], "d": ["rs"]}
+    m = PhraseMatcher(groups)
+    for text in ["ushers", "his", "shis", "h", "", "HERS!", "xx she xx"]:
+        assert m.decode(m.scan(text)) == _naive(groups, text)
+
+
+def test_matches_substring_semantics_on_sample_data():
+    analyzer = ReviewAnalyzer()
+    groups = {k: v for k, (v, _) in analyzer.ISSUE_RULES.items()}
+    groups["urgent"] = analyzer.URGENT_KEYWORDS
+    m = PhraseMatcher(groups)
+    texts = pd.read_csv(SAMPLE_CSV)["review_text"].astype(str).tolist()
+    for text in texts:
+        assert m.decode(m.scan(text)) == _naive(groups, text)
+
+
+def test_matches_substring_semantics_on_random_text():
+    rng = random.Random(0)
+    phrases = ["".join(rng.choice("abc ") for _ in range(rng.randint(1, 5)))
+               for _ in range(40)]
+    groups = {f"g{i}": phrases[i::8] for i in range(8)}
+    m = PhraseMatcher(groups)
+    for _ in range(500):
+        text = "".join(rng.choice("abcAB d") for _ in range(rng.randint(0, 30)))
+        assert m.decode(m.scan(text)) == _naive(groups, text)
+
+
+def test_empty_phrase_rejected():
+    with pytest.raises(ValueError):
+        PhraseMatcher({"a": ["ok", ""]})
+
+
+def test_analyzer_detect_issues():
+    issues, urgent = ReviewAnalyzer().detect_issues(
+        "Dangerous heater, it broke and I want a REFUND.")
+    assert issues == ["Safety Concern", "Quality Issues"]
+    assert urgent
+    assert ReviewAnalyzer().detect_issues("Lovely.") == ([], False)
@@ -0,0 +1,40 @@
+"""Tests for per-stage timing (src/profiling.py)."""
+import tracemalloc
+
+from profiling import StageRecorder, stage
+
+
+def test_stage_records_time_rows_and_hooks():
+    recorder = StageRecorder()
+    with stage("parse", 10, hooks=[recorder]) as record:
+        record["rows"] = 12
+    assert recorder.records == [{"stage": "parse", "seconds": record["seconds"],
+                                 "rows": 12, "peak_kib": None}]
+    assert record["seconds"] >= 0
+
+
+def test_stage_reports_even_when_the_block_raises():
+    recorder = StageRecorder()
+    try:
+        with stage("boom", hooks=[recorder]):
+            raise RuntimeError
+    except RuntimeError:
+        pass
+    assert [r["stage"] for r in recorder.records] == ["boom"]
+
+
+def test_allocation_tracking_leaves_tracemalloc_as_it_was():
+    with stage("alloc", track_allocations=True) as record:
+        data = [0] * 100_000
+    assert record["peak_kib"] >= len(data) * 8 / 1024 * 0.9
+    assert not tracemalloc.is_tracing()
+
+
+def test_by_stage_sums_repeated_stages():
+    recorder = StageRecorder()
+    for rows in (3, 4):
+        with stage("chunk", rows, hooks=[recorder]):
+            pass
+    summary = recorder.by_stage()
+    assert summary["chunk"]["rows"] == 7 and summary["chunk"]["calls"] == 2
+    assert recorder.total_seconds() == summary["chunk"]["seconds"]
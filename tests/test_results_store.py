@@ -0,0 +1,63 @@
+"""Tests for the persistent results store (src/results_store.py)."""
+import os
+
+import pandas as pd
+
+from analyzer import ReviewAnalyzer
+from results_store import ResultsStore, dataset_fingerprint
+
+SAMPLE_CSV = os.path.join(os.path.dirname(__file__), "..", "data", "sample",
+                          "sample_reviews.csv")
+TEXT_COL = "review_text"
+
+
+def test_fingerprint_tracks_data_and_columns():
+    df = pd.read_csv(SAMPLE_CSV)
+    fp = dataset_fingerprint(df, TEXT_COL, "rating", "vader")
+    assert fp == dataset_fingerprint(df.copy(), TEXT_COL, "rating", "vader")
+    assert fp != dataset_fingerprint(df, TEXT_COL, None, "vader")
+    changed = df.copy()
+    changed.loc[0, TEXT_COL] = "Different text."
+    assert fp != dataset_fingerprint(changed, TEXT_COL, "rating", "vader")
+
+
+def test_round_trip_rebuilds_identical_results(tmp_path):
+    analyzer = ReviewAnalyzer()
+    df = pd.read_csv(SAMPLE_CSV)
+    results = analyzer.analyze_text(df, TEXT_COL)
+    results.pop("timings")                     # per-run, not part of the data
+    store = ResultsStore(str(tmp_path))
+    fp = dataset_fingerprint(df, TEXT_COL, None, analyzer.backend)
+    store.save(fp, df, analyzer.result_columns(df, results),
+               {"name": "sample", "text_column": TEXT_COL})
+
+    assert fp in store
+    assert store.recent()[0]["name"] == "sample"
+    assert store.recent()[0]["rows"] == len(df)
+
+    reopened = analyzer.results_from_columns(df, TEXT_COL, store.load_columns(fp))
+    assert reopened == results
+
+    frame, columns = store.load(fp)
+    pd.testing.assert_frame_equal(frame, df)
+    assert analyzer.results_from_columns(frame, TEXT_COL, columns) == results
+
+
+def test_store_keeps_only_recent_entries(tmp_path):
+    store = ResultsStore(str(tmp_path), max_entries=2)
+    df = pd.DataFrame({TEXT_COL: ["a", "b"]})
+    cols = {"priority": [1, 2]}
+    for fp in ("one", "two", "three"):
+        store.save(fp, df, cols, {"name": fp})
+    assert [e["name"] for e in store.recent()] == ["three", "two"]
+    assert "one" not in store
+
+
+def test_recent_can_be_limited_to_given_analyses(tmp_path):
+    store = ResultsStore(str(tmp_path))
+    df = pd.DataFrame({TEXT_COL: ["a", "b"]})
+    for fp in ("one", "two", "three"):
+        store.save(fp, df, {"priority": [1, 2]}, {"name": fp})
+    assert [e["name"] for e in store.recent(only=["one", "three"])] == [
+        "three", "one"]
+    assert store.recent(only=[]) == []
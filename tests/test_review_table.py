@@ -0,0 +1,89 @@
+"""Tests for the Analysis Details table (src/review_table.py)."""
+import pandas as pd
+import pytest
+
+from analyzer import ReviewAnalyzer
+from review_table import ReviewTable, page_count
+from synthetic import synthetic_reviews
+
+TEXT_COL = "review_text"
+
+
+@pytest.fixture(scope="module")
+def table_and_expected():
+    analyzer = ReviewAnalyzer()
+    df = synthetic_reviews(2000, seed=4)
+    results = analyzer.analyze_text(df, TEXT_COL)
+    table = ReviewTable(df, results.columns, analyzer.SENTIMENT_LABELS,
+                        analyzer.ISSUE_RULES, repeat_threshold=3)
+    # What the page used to build on every filter click.
+    expected = df.copy()
+    expected["Sentiment"] = results["sentiments"]
+    expected["Priority"] = results["priority_scores"]
+    expected["Issues"] = [", ".join(i) if i else "None"
+                          for i in results["issues_found"]]
+    expected["Copies"] = results.columns["duplicates"]
+    expected = expected.sort_values("Priority", ascending=False, kind="stable")
+    return analyzer, results, table, expected
+
+
+def test_all_rows_sorted_by_priority(table_and_expected):
+    _, _, table, expected = table_and_expected
+    got = table.view()
+    assert got.index.tolist() == expected.index.tolist()
+    assert got["Issues"].tolist() == expected["Issues"].tolist()
+    assert got["Sentiment"].astype(str).tolist() == expected["Sentiment"].tolist()
+    assert got["Copies"].tolist() == expected["Copies"].tolist()
+
+
+def test_every_filter_matches_a_row_scan(table_and_expected):
+    analyzer, results, table, expected = table_and_expected
+    checks = {
+        "Negative": expected["Sentiment"] == "Negative",
+        "With issues": expected["Issues"] != "None",
+        "Urgent": expected.index.isin(results["urgent_indices"]),
+        "Repeated": expected["Copies"] >= 3,
+        "Needs action": expected["Priority"] > 0,
+        "Shipping Problems": expected["Issues"].str.contains("Shipping Problems"),
+    }
+    for name, keep in checks.items():
+        assert table.view(name).index.tolist() == expected[keep].index.tolist(), name
+        assert table.count(name) == int(keep.sum())
+    assert set(analyzer.ISSUE_RULES) <= set(table.filters())
+
+
+def test_results_without_duplicate_counts():
+    analyzer = ReviewAnalyzer()
+    df = pd.DataFrame({TEXT_COL: ["Fine.", "Broke, want a refund"]})
+    columns = dict(analyzer.analyze_text(df, TEXT_COL).columns)
+    del columns["duplicates"]
+    table = ReviewTable(df, columns, analyzer.SENTIMENT_LABELS, analyzer.ISSUE_RULES)
+    assert "Repeated" not in table.masks and "Copies" not in table.frame
+    assert table.view("Urgent").index.tolist() == [1]
+
+
+def test_pages_cover_a_view_exactly_once(table_and_expected):
+    _, _, table, expected = table_and_expected
+    keep = expected["Sentiment"] == "Negative"
+    size = 40
+    pages = page_count(int(keep.sum()), size)
+    seen = []
+    for number in range(1, pages + 1):
+        rows, matching = table.page("Negative", number, size)
+        assert matching == keep.sum() and len(rows) <= size
+        seen += rows.index.tolist()
+    assert seen == expected[keep].index.tolist()
+    # Out-of-range page numbers are clamped.
+    assert table.page("Negative", pages + 5, size)[0].index.tolist() == \
+        table.page("Negative", pages, size)[0].index.tolist()
+    assert page_count(0, size) == 1
+
+
+def test_pages_can_be_resorted_and_masked(table_and_expected):
+    _, _, table, expected = table_and_expected
+    rows, matching = table.page(table.any_of(["Urgent", "Positive"]), 1, 50,
+                                sort_by="rating", ascending=True)
+    keep = table.masks["Urgent"] | table.masks["Positive"]
+    resorted = expected[keep].sort_values("rating", kind="stable")
+    assert matching == keep.sum()
+    assert rows.index.tolist() == resorted.index[:50].tolist()
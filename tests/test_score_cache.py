@@ -0,0 +1,58 @@
+"""Tests for the sentiment score cache (src/score_cache.py)."""
+import pandas as pd
+
+from analyzer import ReviewAnalyzer
+from score_cache import ScoreCache
+
+TEXT_COL = "review_text"
+
+
+def test_lru_evicts_least_recently_used():
+    cache = ScoreCache(maxsize=2)
+    a, b, c = (ScoreCache.key("vader", t) for t in "abc")
+    cache.put(a, 0.1)
+    cache.put(b, 0.2)
+    assert cache.get(a) == 0.1          # touch a -> b is now the oldest
+    cache.put(c, 0.3)
+    assert cache.get(b) is None
+    assert cache.get(a) == 0.1 and cache.get(c) == 0.3
+    assert len(cache) == 2
+
+
+def test_key_ignores_whitespace_but_not_case_or_backend():
+    key = ScoreCache.key
+    assert key("vader", "  Great   product! ") == key("vader", "Great product!")
+    assert key("vader", "GREAT product!") != key("vader", "Great product!")
+    assert key("vader", "Great") != key("textblob", "Great")
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    path = str(tmp_path / "scores.sqlite")
+    first = ScoreCache(maxsize=10, path=path)
+    first.put(ScoreCache.key("vader", "fine"), 0.2023)
+    first.close()
+
+    second = ScoreCache(maxsize=10, path=path)
+    assert second.get(ScoreCache.key("vader", "fine")) == 0.2023
+    assert second.stats()["hits"] == 1
+
+
+def test_repeat_analysis_is_served_from_cache():
+    analyzer = ReviewAnalyzer()
+    df = pd.DataFrame({TEXT_COL: ["Great product!"] * 3 + ["Broke in a day."]})
+    first = analyzer.analyze_text(df, TEXT_COL)
+    misses = analyzer.cache_stats()["misses"]
+    second = analyzer.analyze_text(df, TEXT_COL)
+    stats = analyzer.cache_stats()
+    assert stats["misses"] == misses          # nothing re-scored
+    assert stats["hits"] >= df[TEXT_COL].nunique()  # duplicates scored once
+    first.pop("timings"), second.pop("timings")
+    assert first == second
+
+
+def test_cached_scores_match_uncached():
+    cached, uncached = ReviewAnalyzer(), ReviewAnalyzer(cache_size=0)
+    assert uncached.cache_stats() is None
+    for text in ["Great product!", "great   product!", "GREAT product!!!",
+                 "Meh, it's fine I guess."]:
+        assert cached._raw_score(text) == uncached._raw_score(text)
@@ -0,0 +1,126 @@
+"""Tests for the scoring HTTP service (src/service.py)."""
+import asyncio
+import contextlib
+import http.client
+import json
+import socket
+import threading
+
+import pytest
+
+from service import MAX_BATCH, ScoringService, serve
+
+
+@pytest.fixture(scope="module")
+def service():
+    return ScoringService()
+
+
+def _post(service, path, payload):
+    status, body = service.handle("POST", path, json.dumps(payload).encode())
+    return status, body
+
+
+def test_single_review(service):
+    status, body = _post(service, "/score", {
+        "text": "Dangerous, it caught fire. I want a refund!", "rating": 1,
+        "product": "Heater", "name": "Sam"})
+    assert status == 200
+    assert body["sentiment"] == "Negative"
+    assert "Safety Concern" in body["issues"]
+    assert body["urgent"] is True
+    assert body["priority"] >= 90
+    assert body["draft_response"].startswith("Hi Sam")
+
+
+def test_batch_matches_single(service):
+    reviews = [{"text": "Love it, works perfectly!", "rating": 5},
+               {"text": "Too small, doesn't fit."}]
+    status, body = _post(service, "/score/batch", {"reviews": reviews})
+    assert status == 200
+    assert body["results"] == [_post(service, "/score", r)[1] for r in reviews]
+
+
+def test_bad_requests(service):
+    assert _post(service, "/score", {"rating": 5})[0] == 400
+    assert _post(service, "/score/batch", {"reviews": "nope"})[0] == 400
+    too_many = {"reviews": [{"text": "ok"}] * (MAX_BATCH + 1)}
+    assert _post(service, "/score/batch", too_many)[0] == 400
+    assert service.handle("GET", "/score", b"")[0] == 405
+    assert service.handle("GET", "/nope", b"")[0] == 404
+
+
+def test_stats_report_latency_percentiles(service):
+    _post(service, "/score", {"text": "Fine."})
+    status, body = service.handle("GET", "/stats", b"")
+    assert status == 200
+    score = body["endpoints"]["/score"]
+    assert score["requests"] >= 1
+    assert 0 <= score["p50_ms"] <= score["p99_ms"]
+
+
+@contextlib.contextmanager
+def _listening(service):
+    """Run `serve` in a thread on a free local port -> the port."""
+    sock = socket.create_server(("127.0.0.1", 0))
+    sock.setblocking(False)
+    port = sock.getsockname()[1]
+    loop = asyncio.new_event_loop()
+    task = loop.create_task(serve(sock, service))
+
+    def run():
+        try:
+            loop.run_until_complete(task)
+        except asyncio.CancelledError:
+            pass
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    try:
+        yield port
+    finally:
+        loop.call_soon_threadsafe(task.cancel)
+        thread.join(5)
+        loop.close()
+
+
+def test_serves_http_over_a_socket(service):
+    with _listening(service) as port:
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        for _ in range(2):  # keep-alive: two requests on one connection
+            conn.request("POST", "/score", json.dumps({"text": "Great!"}),
+                         {"Content-Type": "application/json"})
+            resp = conn.getresponse()
+            assert resp.status == 200
+            assert json.loads(resp.read())["sentiment"] == "Positive"
+        conn.request("GET", "/health")
+        assert json.loads(conn.getresponse().read()) == {"status": "ok"}
+        conn.close()
+
+
+@pytest.mark.parametrize("length_header", [b"Content-Length: ten\r\n",
+                                           b"Content-Length: -1\r\n", b""])
+def test_bad_content_length_gets_a_json_error(service, length_header):
+    with _listening(service) as port:
+        with socket.create_connection(("127.0.0.1", port), timeout=10) as conn:
+            conn.sendall(b"POST /score HTTP/1.1\r\nHost: x\r\n" + length_header
+                         + b"\r\n" + b'{"text": "Great!"}')
+            reply = conn.makefile("rb").read()
+    head, _, body = reply.partition(b"\r\n\r\n")
+    assert head.startswith(b"HTTP/1.1 400")
+    assert "Content-Length" in json.loads(body)["error"]
+
+
+def test_null_text_is_scored_as_empty(service, monkeypatch):
+    analyzer = service.analyzer
+    scored = []
+    score_values = analyzer._score_values
+
+    def spy(texts, ratings):
+        scored.extend(texts)
+        return score_values(texts, ratings)
+
+    monkeypatch.setattr(analyzer, "_score_values", spy)
+    status, body = _post(service, "/score", {"text": None, "name": "Sam"})
+    assert status == 200 and scored == [""]
+    assert body == _post(service, "/score", {"text": "", "name": "Sam"})[1]
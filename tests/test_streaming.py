@@ -0,0 +1,86 @@
+"""Tests for chunked analysis (src/streaming.py)."""
+import os
+
+import pandas as pd
+
+from analyzer import ReviewAnalyzer
+from streaming import AnalysisAggregate, iter_csv_chunks
+
+SAMPLE_CSV = os.path.join(os.path.dirname(__file__), "..", "data", "sample",
+                          "sample_reviews.csv")
+TEXT_COL = "review_text"
+
+
+def test_stream_totals_match_whole_frame_analysis():
+    analyzer = ReviewAnalyzer()
+    df = pd.read_csv(SAMPLE_CSV)
+    full = analyzer.analyze_text(df, TEXT_COL)
+    agg = analyzer.analyze_stream(iter_csv_chunks(SAMPLE_CSV, chunksize=37),
+                                  TEXT_COL)
+    res = agg.results()
+    for key in ("total_reviews", "positive_count", "negative_count",
+                "neutral_count", "urgent_indices", "issue_summary",
+                "empty_reviews", "shortest_review", "longest_review"):
+        assert res[key] == full[key], key
+    assert abs(res["avg_length"] - full["avg_length"]) < 1e-9
+    assert res["with_issues"] == sum(1 for i in full["issues_found"] if i)
+    assert agg.word_frequency(10) == analyzer.get_word_frequency(df, TEXT_COL)
+
+
+def test_stream_top_k_matches_full_priority_ranking():
+    analyzer = ReviewAnalyzer()
+    df = pd.read_csv(SAMPLE_CSV)
+    full = analyzer.analyze_text(df, TEXT_COL)
+    agg = analyzer.analyze_stream(iter_csv_chunks(SAMPLE_CSV, chunksize=50),
+                                  TEXT_COL, top_n=15)
+    top = agg.priority_reviews()
+    expected = (pd.Series(full["priority_scores"])
+                .sort_values(ascending=False, kind="stable").head(15))
+    assert top.index.tolist() == expected.index.tolist()
+    assert top["priority_score"].tolist() == expected.tolist()
+    assert {"priority_score", "sentiment", "issues"} <= set(top.columns)
+
+
+def test_merged_aggregates_equal_sequential_stream():
+    analyzer = ReviewAnalyzer()
+    chunks = list(iter_csv_chunks(SAMPLE_CSV, chunksize=60))
+    sequential = analyzer.analyze_stream(chunks, TEXT_COL, top_n=10)
+
+    merged = AnalysisAggregate(top_n=10, backend=analyzer.backend)
+    for chunk in reversed(chunks):             # any order, e.g. from workers
+        part = AnalysisAggregate(top_n=10)
+        part.update(chunk, analyzer.analyze_text(chunk, TEXT_COL),
+                    analyzer.word_counts(chunk[TEXT_COL]), TEXT_COL,
+                    offset=chunk.index[0])
+        merged.merge(part)
+    assert merged.results()["issue_summary"] == sequential.results()["issue_summary"]
+    assert sorted(merged.urgent_ids) == sequential.urgent_ids
+    assert merged.words == sequential.words
+    assert (merged.priority_reviews().index.tolist()
+            == sequential.priority_reviews().index.tolist())
+
+
+def test_bounded_word_counts_keep_the_top_words():
+    analyzer = ReviewAnalyzer()
+    exact = analyzer.analyze_stream(iter_csv_chunks(SAMPLE_CSV, chunksize=40),
+                                    TEXT_COL)
+    sketched = analyzer.analyze_stream(iter_csv_chunks(SAMPLE_CSV, chunksize=40),
+                                       TEXT_COL, max_words=60)
+    assert len(sketched.words) <= 60 < len(exact.words)
+    top = exact.word_frequency(5)
+    assert set(sketched.word_frequency(5)) == set(top)
+    for word, count in top.items():
+        assert count - sketched.words.error <= sketched.words[word] <= count
+
+
+def test_urgent_ids_use_id_column():
+    agg = ReviewAnalyzer().analyze_stream(
+        iter_csv_chunks(SAMPLE_CSV, chunksize=40), TEXT_COL, id_column="review_id")
+    df = pd.read_csv(SAMPLE_CSV)
+    assert set(agg.urgent_ids) <= set(df["review_id"])
+    assert agg.urgent_ids
+
+
+def test_missing_text_column_returns_none():
+    assert ReviewAnalyzer().analyze_stream(
+        iter_csv_chunks(SAMPLE_CSV), "nope") is None
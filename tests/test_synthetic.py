@@ -0,0 +1,21 @@
+"""Tests for the synthetic review generator (src/synthetic.py)."""
+from analyzer import ReviewAnalyzer
+from synthetic import synthetic_reviews
+
+
+def test_generator_is_seeded_and_shaped():
+    a, b = synthetic_reviews(500, seed=7), synthetic_reviews(500, seed=7)
+    assert a.equals(b)
+    assert not a.equals(synthetic_reviews(500, seed=8))
+    assert list(a.columns) == ["review_id", "date", "product", "rating",
+                               "review_text"]
+    assert a["review_id"].is_unique
+    assert set(a["rating"]) == {1, 2, 3, 4, 5}
+
+
+def test_generated_text_exercises_every_issue_category():
+    df = synthetic_reviews(3000)
+    res = ReviewAnalyzer().analyze_text(df, "review_text")
+    assert set(res["issue_summary"]) == set(ReviewAnalyzer.ISSUE_RULES)
+    assert res["urgent_indices"]
+    assert res["negative_count"] and res["positive_count"]
@@ -0,0 +1,64 @@
+"""Tests for top-k priority selection (src/topk.py)."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from analyzer import ReviewAnalyzer
+from synthetic import synthetic_reviews
+from topk import TopK, top_k
+
+
+def _stable_top(priority, k):
+    return np.argsort(-np.asarray(priority, dtype=np.int64), kind="stable")[:k]
+
+
+@pytest.mark.parametrize("k", [0, 1, 7, 25, 199, 200, 500])
+def test_top_k_matches_stable_descending_sort(k):
+    priority = np.random.default_rng(k).integers(0, 12, 200).astype(np.uint8)
+    assert top_k(priority, k).tolist() == _stable_top(priority, k).tolist()
+
+
+def test_top_k_of_empty_input():
+    assert top_k(np.array([], dtype=np.uint8), 5).tolist() == []
+
+
+@pytest.mark.parametrize("order", ["forward", "reversed"])
+def test_streaming_top_k_equals_whole_array(order):
+    priority = np.random.default_rng(1).integers(0, 5, 1000)
+    frame = pd.DataFrame({"value": np.arange(1000) * 10})
+    starts = list(range(0, 1000, 130))
+    if order == "reversed":
+        starts.reverse()
+    whole = TopK(20)
+    for start in starts:
+        part = TopK(20)
+        chunk = frame.iloc[start:start + 130]
+        part.update(priority[start:start + 130], start,
+                    lambda best, chunk=chunk: chunk.iloc[best].copy())
+        whole.merge(part)
+    expected = _stable_top(priority, 20)
+    assert whole.position.tolist() == expected.tolist()
+    assert whole.frame().index.tolist() == expected.tolist()
+    assert whole.frame()["value"].tolist() == (expected * 10).tolist()
+
+
+def test_only_the_chunk_top_k_is_materialised():
+    seen = []
+    TopK(3).update(np.arange(50), 0,
+                   lambda best: seen.append(len(best)) or pd.DataFrame(index=best))
+    assert seen == [3]
+
+
+def test_priority_reviews_match_a_full_stable_sort():
+    analyzer = ReviewAnalyzer()
+    df = synthetic_reviews(400, seed=3)
+    results = analyzer.analyze_text(df, "review_text", "rating")
+    top = analyzer.get_priority_reviews(df, results, "review_text", top_n=25)
+    expected = df.copy()
+    expected["priority_score"] = results["priority_scores"]
+    expected["sentiment"] = results["sentiments"]
+    expected["issues"] = [", ".join(i) if i else "None"
+                          for i in results["issues_found"]]
+    expected = expected.sort_values("priority_score", ascending=False,
+                                    kind="stable").head(25)
+    pd.testing.assert_frame_equal(top, expected, check_dtype=False)
@@ -0,0 +1,62 @@
+"""Tests for the batch VADER scorer (src/vader_batch.py)."""
+import os
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+vader = pytest.importorskip("vaderSentiment.vaderSentiment")
+
+from synthetic import synthetic_reviews  # noqa: E402
+from vader_batch import BatchVader, score_batch  # noqa: E402
+
+SAMPLE_CSV = os.path.join(os.path.dirname(__file__), "..", "data", "sample",
+                          "sample_reviews.csv")
+
+
+@pytest.fixture(scope="module")
+def reference():
+    return vader.SentimentIntensityAnalyzer()
+
+
+def _expected(reference, texts):
+    return np.array([reference.polarity_scores(t)["compound"] for t in texts])
+
+
+def test_matches_vader_on_sample_data(reference):
+    texts = pd.read_csv(SAMPLE_CSV)["review_text"].astype(str).tolist()
+    got = BatchVader(reference).score_batch(texts)
+    assert got.dtype == np.float64
+    np.testing.assert_array_equal(got, _expected(reference, texts))
+
+
+def test_matches_vader_on_synthetic_corpus(reference):
+    texts = synthetic_reviews(5000, seed=3)["review_text"].tolist()
+    np.testing.assert_array_equal(score_batch(texts), _expected(reference, texts))
+
+
+@pytest.mark.parametrize("text", [
+    "", "   ", "VADER is VERY SMART, handsome, and FUNNY!!!",
+    "The food here isn't really all that great", "kind of good",
+    "at least it works", "least good ever", "it was the bomb but I hated it",
+    "great great but great great", "yeah right, this was great",
+    "no problems no bad", "Never so happy", "without doubt good",
+    "😀 love it 😡", "I :) really :( like", "bad????", "good!!!!!!",
+])
+def test_matches_vader_on_rule_edge_cases(reference, text):
+    assert (BatchVader(reference).compound(text)
+            == reference.polarity_scores(text)["compound"])
+
+
+def test_matches_vader_on_random_rule_word_mixes(reference):
+    rng = random.Random(0)
+    vocab = (rng.sample(sorted(reference.lexicon), 200) + list(vader.BOOSTER_DICT)
+             + vader.NEGATE + "no nor but least at kind of the bomb never so "
+             "this without doubt to die for :) 😀 GOOD VERY".split())
+    texts = [" ".join(rng.choice(vocab) + rng.choice(["", "!", "?", ","])
+                      for _ in range(rng.randint(0, 12)))
+             for _ in range(3000)]
+    texts = [t.upper() if i % 7 == 0 else t for i, t in enumerate(texts)]
+    np.testing.assert_array_equal(BatchVader(reference).score_batch(texts),
+                                  _expected(reference, texts))